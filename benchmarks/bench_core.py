@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Benchmarks of every public _values and _value function in statio.core.
+
+Each function is timed over synthetic random walk series of several sizes
+with small, medium and large periods and the expanding period=None case.
+The best of --repeat runs is kept, and one more run under tracemalloc
+records the peak memory allocated.  Before each size the time of a
+function and period is projected from its growth over the previous two
+sizes, and once the projection or an actual run exceeds --budget seconds
+the larger sizes are skipped, so an O(n^2) regression shows up as a
+slow row instead of a hung run.
+
+Results are written as JSON and --compare reports the rows that got
+slower than a saved baseline by more than --threshold:
+
+    python benchmarks/bench_core.py --sizes 1000,100000 -o new.json
+    python benchmarks/bench_core.py -o new.json --compare old.json
+
+"""
+
+import sys
+import os
+import gc
+import json
+import math
+import time
+import random
+import inspect
+import platform
+import argparse
+import tracemalloc
+
+#Forced to manipulate path - have yet to find alternative built-in method.
+libpath = os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
+                                       'statio'))
+if not libpath in sys.path:
+    sys.path.insert(1, libpath)
+del libpath
+
+import core
+
+
+SIZES = (1000, 10000, 100000, 1000000, 10000000)
+PERIODS = (10, 200, 5000, None)
+PAIRED = ('xvalues', 'benchmark')
+
+
+def functions(pattern=None):
+    """Returns sorted list of (name, function) of the public core stats.
+
+    :param pattern: (optional) only names containing pattern.
+    """
+    results = []
+    for name, func in inspect.getmembers(core, inspect.isfunction):
+        if name.startswith('_') or func.__module__ != core.__name__:
+            continue
+
+        if not (name.endswith('_values') or name.endswith('_value')):
+            continue
+
+        if pattern and (pattern not in name):
+            continue
+
+        results.append((name, func))
+
+    return results
+
+
+def series(size, seed=0):
+    """Returns list of size random walk prices."""
+    rand = random.Random(seed)
+    lastval = 100.0
+    results = []
+    for bar in range(size):
+        lastval += rand.gauss(0.0, 1.0)
+        results.append(lastval)
+
+    return results
+
+
+def _arguments(func, values, others, period):
+    """Returns positional arguments to call func with."""
+    params = list(inspect.signature(func).parameters)
+    if params[0] in PAIRED or params[1] in PAIRED:
+        return (values, others, period)
+
+    return (values, period)
+
+
+def timeit(func, args, repeat):
+    """Returns best time in seconds of repeat calls of func(*args)."""
+    best = None
+    for run in range(repeat):
+        gc.collect()
+        beg = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - beg
+        if (best is None) or (elapsed < best):
+            best = elapsed
+
+    return best
+
+
+def peakmemory(func, args):
+    """Returns peak bytes allocated by one call of func(*args)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(*args)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def project(history, size):
+    """Returns projected seconds at size from earlier (size, seconds).
+
+    The growth exponent is taken from the last two sizes, and never
+    assumed below linear; a single earlier size is scaled linearly.
+
+    :param history: list of (size, seconds) in increasing size order.
+    :param size: series size to project.
+    :rtype: projected seconds, or None without history.
+
+    Examples:
+    >>> "%.1f" % project([(1000, 0.01), (10000, 1.0)], 100000)
+    '100.0'
+    >>> "%.1f" % project([(1000, 0.5)], 10000)
+    '5.0'
+    """
+    if not history:
+        return None
+
+    lastsize, lastsecs = history[-1]
+    exponent = 1.0
+    if len(history) > 1:
+        prevsize, prevsecs = history[-2]
+        if (prevsecs > 0.0) and (lastsecs > 0.0) and (lastsize > prevsize):
+            exponent = math.log(lastsecs / prevsecs) / \
+                math.log(float(lastsize) / prevsize)
+            exponent = max(1.0, exponent)
+
+    return lastsecs * (float(size) / lastsize) ** exponent
+
+
+def run(sizes=SIZES, periods=PERIODS, repeat=3, budget=30.0, pattern=None,
+        memory=True, stream=None):
+    """Returns list of result dicts, one per function, size and period.
+
+    :param sizes: series sizes, in increasing order.
+    :param periods: periods, None for the expanding case.
+    :param repeat: # of timed runs, the best is kept.
+    :param budget: seconds a size is projected or measured to take after
+        which it and the larger sizes are skipped.
+    :param pattern: (optional) only function names containing pattern.
+    :param memory: record peak memory with tracemalloc.
+    :param stream: (optional) file to print progress lines to.
+    """
+    results = []
+    over = set()
+    history = {}
+
+    for size in sizes:
+        values = series(size, 1)
+        others = series(size, 2)
+
+        for name, func in functions(pattern):
+            for period in periods:
+                row = {'function': name, 'size': size, 'period': period}
+
+                timings = history.setdefault((name, period), [])
+                projected = project(timings, size)
+                if (projected is not None) and (projected > budget):
+                    over.add((name, period))
+
+                if (name, period) in over:
+                    row['skipped'] = True
+                    if projected is not None:
+                        row['projected'] = projected
+                    results.append(row)
+                    continue
+
+                args = _arguments(func, values, others, period)
+                row['seconds'] = timeit(func, args, repeat)
+                if memory:
+                    row['peak_bytes'] = peakmemory(func, args)
+
+                timings.append((size, row['seconds']))
+                if row['seconds'] > budget:
+                    over.add((name, period))
+
+                results.append(row)
+
+                if stream is not None:
+                    stream.write("%-20s %10d %6s %12.6f\n" %
+                                 (name, size, period, row['seconds']))
+                    stream.flush()
+
+    return results
+
+
+def compare(results, baseline, threshold=1.25):
+    """Returns list of (row, old seconds, ratio) slower than baseline.
+
+    :param results: list of result dicts of this run.
+    :param baseline: list of result dicts of an earlier run.
+    :param threshold: ratio of new to old seconds counted as slower.
+    """
+    def key(row):
+        return (row['function'], row['size'], row['period'])
+
+    old = dict((key(row), row) for row in baseline if 'seconds' in row)
+
+    slower = []
+    for row in results:
+        if 'seconds' not in row or key(row) not in old:
+            continue
+
+        oldsecs = old[key(row)]['seconds']
+        if oldsecs <= 0.0:
+            continue
+
+        ratio = row['seconds'] / oldsecs
+        if ratio > threshold:
+            slower.append((row, oldsecs, ratio))
+
+    return slower
+
+
+def _ints(text):
+    return tuple(int(float(item)) for item in text.split(','))
+
+
+def _periods(text):
+    return tuple(None if item.lower() == 'none' else int(item)
+                 for item in text.split(','))
+
+
+def main(argv=None):
+    summary = __doc__.strip().split('\n')[0]
+    parser = argparse.ArgumentParser(description=summary)
+    parser.add_argument('--sizes', type=_ints, default=SIZES,
+                        help="comma separated series sizes")
+    parser.add_argument('--periods', type=_periods, default=PERIODS,
+                        help="comma separated periods, none for expanding")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--budget', type=float, default=30.0,
+                        help="seconds after which larger sizes are skipped")
+    parser.add_argument('--functions', default=None,
+                        help="only functions whose name contains this")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip the tracemalloc peak memory run")
+    parser.add_argument('-o', '--output', default=None,
+                        help="path of the JSON results")
+    parser.add_argument('--compare', default=None,
+                        help="path of baseline JSON results")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="slowdown ratio reported by --compare")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.periods, args.repeat, args.budget,
+                  args.functions, not args.no_memory, sys.stderr)
+
+    report = {'python': platform.python_version(),
+              'platform': platform.platform(),
+              'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+              'results': results}
+
+    if args.output:
+        with open(args.output, 'w') as outfile:
+            json.dump(report, outfile, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        sys.stdout.write('\n')
+
+    if args.compare:
+        with open(args.compare) as infile:
+            baseline = json.load(infile)['results']
+
+        slower = compare(results, baseline, args.threshold)
+        for row, oldsecs, ratio in slower:
+            sys.stderr.write("slower %-20s %10d %6s %.6f -> %.6f (%.2fx)\n" %
+                             (row['function'], row['size'], row['period'],
+                              oldsecs, row['seconds'], ratio))
+
+        if slower:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,4 +18,8 @@ __homepage__ = "http://github.com/taylortree/statio"
 __copyright__ = "Copyright 2012, Mike Taylor <mike@taylortree.com>"
 __license__ = "MIT"
 
-from core import *
\ No newline at end of file
+from core import *
+from rolling import *
+
+import profiling
+profiling.enable_from_environ()
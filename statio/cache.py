@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Opt-in memoization of the core _values functions.
+
+A StatCache keeps results keyed by a fingerprint of the series, the
+function and its parameters, evicting the least recently used entry once
+maxsize entries are held.  The variance functions also share a cached
+intermediate: the running sums of squared deviations of the series, from
+which varp, var, stdp and std are each derived in one cheap pass.
+
+The module level functions share the names and parameters of their core
+counterparts and go through default_cache.  Results are returned as new
+lists, so changing one does not change the cache.  A series changed in
+place gets a new fingerprint.
+
+"""
+
+import math
+import array
+import inspect
+import hashlib
+import collections
+
+import core
+
+
+DEFAULT_MAXSIZE = 128
+
+FUNCTIONS = ('sum_values', 'sma_values', 'ema_values', 'wwma_values',
+             'psa_values', 'varp_values', 'var_values', 'stdp_values',
+             'std_values', 'max_values', 'min_values', 'median_values')
+
+UNCACHED = ('output', 'state')
+
+VARIANCES = {'varp_values': (True, False), 'var_values': (False, False),
+             'stdp_values': (True, True), 'std_values': (False, True)}
+
+
+def fingerprint(values):
+    """Returns a hashable fingerprint of the exact contents of a series.
+
+    Buffers such as array('d') are keyed by their item format and a sha1
+    over their bytes.  Lists are packed the same way, as int64 when every
+    value is an int and as float64 otherwise, and keyed by that kind, so
+    [1, 2] is never confused with [1.0, 2.0].  Lists mixing ints and
+    floats also hash which positions hold floats, and lists of other
+    types or of ints past int64 fall back to hashing their repr.  The key
+    holds only the digest, not a copy of the series.
+
+    :param values: list or buffer of values.
+
+    Examples:
+    >>> fingerprint([-1]) == fingerprint([-2])
+    False
+    """
+    try:
+        view = memoryview(values)
+
+    except TypeError:
+        return _seqfingerprint(values)
+
+    try:
+        digest = hashlib.sha1(view.cast('B')).hexdigest()
+        itemformat = view.format
+
+    finally:
+        view.release()
+
+    return ('buf', itemformat, len(values), digest)
+
+
+def _seqfingerprint(values):
+    """Returns the fingerprint of a list of values, see fingerprint."""
+    kinds = set(map(type, values))
+    kind = 'repr'
+    data = None
+
+    try:
+        if kinds <= _INTS:
+            kind = 'int'
+            data = array.array('q', values).tobytes()
+
+        elif kinds == _FLOATS:
+            kind = 'float'
+            data = array.array('d', values).tobytes()
+
+        elif kinds == _MIXED:
+            kind = 'mixed'
+            data = b''.join((array.array('d', values).tobytes(),
+                             bytes([type(x) is float for x in values])))
+
+    except OverflowError:
+        kind = 'repr'
+
+    if kind == 'repr':
+        data = repr(tuple(values)).encode('utf-8')
+
+    return ('seq', kind, len(values), hashlib.sha1(data).hexdigest())
+
+
+_INTS = frozenset([int])
+_FLOATS = frozenset([float])
+_MIXED = frozenset([int, float])
+
+
+class StatCache(object):
+    """LRU cache of core _values results and intermediates.
+
+    :param maxsize: (optional) # of entries kept.
+
+    Examples:
+    >>> stats = StatCache(maxsize=16)
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> stats.values('sum_values', values, 3)
+    [34, 64, 93, 93, 101, 97, 98]
+    >>> results = stats.values('sum_values', values, 3)
+    >>> stats.hits, stats.misses
+    (1, 1)
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be 1 or greater")
+
+        self.maxsize = int(maxsize)
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Removes every entry and resets the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """Returns dict of hits, misses, size and maxsize."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._entries), 'maxsize': self.maxsize}
+
+    def values(self, func, values, period=None, *args, **kwargs):
+        """Returns list of func applied to values, from the cache if held.
+
+        Only lookups of results count as hits or misses; lookups of the
+        shared variance intermediate do not.
+
+        :param func: core _values function, or its name.
+        :param values: list or buffer of values.
+        :param period: (optional) # of values included in computation.
+            * None - includes all values in computation.
+        :param args: extra arguments of func, e.g. ema smoothing, also
+            accepted as keywords.  output= and state= are not supported.
+        :rtype: list of results.
+        """
+        name = getattr(func, '__name__', func)
+        if name not in FUNCTIONS:
+            raise ValueError(''.join(("unsupported function: ", str(name))))
+
+        args = _extras(name, values, period, args, kwargs)
+        seriesid = fingerprint(values)
+        key = (name, seriesid, period, args)
+
+        results = self._lookup(key)
+        if results is None:
+            if name in VARIANCES:
+                results = self._variances(name, values, seriesid, period)
+
+            else:
+                results = getattr(core, name)(values, period, *args)
+
+            self._store(key, results)
+
+        return list(results)
+
+    def _variances(self, name, values, seriesid, period):
+        key = ('_devsqs', seriesid, period, ())
+
+        devsqs = self._lookup(key, False)
+        if devsqs is None:
+            devsqs = core._devsqs(values, period)
+            self._store(key, devsqs)
+
+        population, root = VARIANCES[name]
+        results = core._devsqvars(devsqs, period, population)
+
+        if root:
+            _sqrt = math.sqrt
+            results = [_sqrt(x) for x in results]
+
+        return results
+
+    def _lookup(self, key, count=True):
+        entries = self._entries
+
+        if key in entries:
+            entries.move_to_end(key)
+            if count:
+                self.hits += 1
+            return entries[key]
+
+        if count:
+            self.misses += 1
+
+        return None
+
+    def _store(self, key, results):
+        entries = self._entries
+        entries[key] = results
+
+        while len(entries) > self.maxsize:
+            entries.popitem(last=False)
+
+
+def _extras(name, values, period, args, kwargs):
+    """Returns tuple of the extra arguments of core function name.
+
+    Defaults are filled in, so ema_values(v, 3) and ema_values(v, 3,
+    None) give the same tuple.  Raises ValueError for output= or state=,
+    whose results cannot be shared.
+    """
+    signature = inspect.signature(getattr(core, name))
+    bound = signature.bind(values, period, *args, **kwargs)
+    bound.apply_defaults()
+
+    extras = []
+    for param, value in list(bound.arguments.items())[2:]:
+        if param in UNCACHED:
+            if value is not None:
+                msg = "unsupported argument: "
+                msg = ''.join((msg, param))
+                raise ValueError(msg)
+
+        else:
+            extras.append(value)
+
+    return tuple(extras)
+
+
+default_cache = StatCache()
+
+
+def _cached(name):
+    def func(values, period=None, *args, **kwargs):
+        return default_cache.values(name, values, period, *args, **kwargs)
+
+    func.__name__ = name
+    func.__doc__ = ''.join(("Returns core.", name,
+                            " of values through default_cache."))
+
+    return func
+
+
+for _name in FUNCTIONS:
+    globals()[_name] = _cached(_name)
+
+del _name
+
+
+def _testit(verbose=None):
+    import doctest
+    doctest.testmod(verbose=verbose)
+
+if __name__ == "__main__":
+    _testit()
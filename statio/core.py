@@ -14,18 +14,144 @@ a list of computed stats.
 
 The _value functions return a single computed stat.
 
+The single series _values functions take an optional state, a Rolling
+object carrying on from a previous call, so only the new values are
+computed; see _resume.  bollinger_values and zscore_values take the
+RollingVar of their window.  The paired functions cov_values,
+covp_values, corr_values, beta_values and alpha_values, and
+describe_values, take no state: the Rolling objects push one value of
+one series per bar, which cannot carry the co-moments of two series or
+the several stats of describe_values.
+
 """
 
 import math
-import bisect
+import collections
+
+import rolling
+from window import sorted_windows, _quantiles, _quantile
+
+
+_BYTE_FORMATS = ('B', 'b', 'c')
+
+
+class _Output(object):
+    """Appends results into a preallocated buffer of doubles."""
+
+    def __init__(self, buffer, size):
+        view = memoryview(buffer)
+        if view.readonly:
+            raise TypeError("output buffer must be writable")
+
+        if view.format in _BYTE_FORMATS:
+            view = view.cast('B').cast('d')
+        elif view.format != 'd':
+            msg = "output buffer must hold doubles or raw bytes, not: "
+            msg = ''.join((msg, view.format))
+            raise TypeError(msg)
+
+        if len(view) < size:
+            msg = "output buffer too small: "
+            msg = ''.join((msg, str(len(view)), ' < ', str(size)))
+            raise ValueError(msg)
+
+        self.buffer = buffer
+        self._view = view
+        self._pos = 0
+
+    def append(self, value):
+        self._view[self._pos] = value
+        self._pos += 1
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def apply(self, func):
+        """Replaces every written value x with func(x)."""
+        _view = self._view
+        for idx in range(self._pos):
+            _view[idx] = func(_view[idx])
+
+
+def _results(values, output=None):
+    """Returns the container the _values functions append results to.
+
+    :param values: list of values to iterate.
+    :param output: (optional) writable buffer of doubles or raw bytes
+        to fill, e.g. array('d'), bytearray or mmap.
+        * None - results are collected in a new list.
+    """
+    if output is None:
+        return []
+
+    return _Output(output, len(values))
+
+
+def _returns(results):
+    """Returns the list, or the filled output buffer, of results."""
+    if isinstance(results, _Output):
+        return results.buffer
+
+    return results
+
+
+def _checkstate(state, reference):
+    """Raises ValueError unless state was built like reference."""
+    matches = type(state) is type(reference)
+    for name in ('period', 'population', 'smoothing', 'num', 'q'):
+        if getattr(state, name, None) != getattr(reference, name, None):
+            matches = False
+
+    if not matches:
+        msg = "state does not match call: "
+        msg = ''.join((msg, type(state).__name__, ' period=',
+                       str(getattr(state, 'period', None))))
+        raise ValueError(msg)
+
+
+def _resume(values, state, reference, output=None):
+    """Returns results of values pushed through a Rolling state.
+
+    Lets a _values function carry on from a previous call: state holds
+    the last value, the window tail and the bar count of the values
+    already seen, so only the new values are computed.  The results for
+    the new values are returned, to be appended to the earlier results.
+
+    :param values: list of the new values.
+    :param state: Rolling object of the earlier values, updated in place.
+    :param reference: new Rolling object built from the call parameters.
+        * state must be of the same class, period and options.
+    :param output: (optional) writable buffer to fill, see _results.
+
+    Examples:
+    >>> state = rolling.RollingSum(3)
+    >>> sum_values([34, 30, 29, 34], 3, state=state)
+    [34, 64, 93, 93]
+    >>> sum_values([38, 25, 35], 3, state=state)
+    [101, 97, 98]
+    """
+    _checkstate(state, reference)
+
+    results = _results(values, output)
+    _push = state.push
+    for newx in values:
+        results.append(_push(newx))
+
+    return _returns(results)
 
 
-def sum_values(values, period=None):
+def sum_values(values, period=None, output=None, state=None):
     """Returns list of running sums.
 
     :param values: list of values to iterate.
     :param period: (optional) # of values to include in computation.
         * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
     :rtype: list of summed values.
 
     Examples:
@@ -33,13 +159,17 @@ def sum_values(values, period=None):
     >>> sum_values(values, 3)  #using 3 period window.
     [34, 64, 93, 93, 101, 97, 98]
     """
+    if state is not None:
+        reference = rolling.RollingSum(period)
+        return _resume(values, state, reference, output)
+
     if period:
         if period < 1:
             raise ValueError("period must be 1 or greater")
 
         period = int(period)
 
-    results = []
+    results = _results(values, output)
     lastval = None
     for bar, newx in enumerate(values):
         if lastval == None:
@@ -54,7 +184,7 @@ def sum_values(values, period=None):
 
         results.append(lastval)
 
-    return results
+    return _returns(results)
 
 
 def sum_value(values, period=None):
@@ -88,12 +218,17 @@ def sum_value(values, period=None):
     return sum(values[beg:])
 
 
-def sma_values(values, period=None):
+def sma_values(values, period=None, output=None, state=None):
     """Returns list of running simple moving averages.
 
     :param values: list of values to iterate and compute stats.
     :param period: (optional) # of values included in computation.
         * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
     :rtype: list of simple moving averages.
 
     Examples:
@@ -102,6 +237,10 @@ def sma_values(values, period=None):
     >>> ["%.2f" % x for x in results]
     ['34.00', '32.00', '31.00', '31.00', '33.67', '32.33', '32.67']
     """
+    if state is not None:
+        reference = rolling.RollingSMA(period)
+        return _resume(values, state, reference, output)
+
     if period:
         if period < 1:
             raise ValueError("period must be 1 or greater")
@@ -109,7 +248,7 @@ def sma_values(values, period=None):
         period_n = float(period)
         period = int(period)
 
-    results = []
+    results = _results(values, output)
     lastval = None
     for bar, newx in enumerate(values):
         if lastval == None:
@@ -123,7 +262,7 @@ def sma_values(values, period=None):
 
         results.append(lastval)
 
-    return results
+    return _returns(results)
 
 
 def sma_value(values, period=None):
@@ -157,7 +296,7 @@ def sma_value(values, period=None):
     return sum(values[beg:]) / float(len(values[beg:]))
 
 
-def ema_values(values, period=None, smoothing=None):
+def ema_values(values, period=None, smoothing=None, output=None, state=None):
     """Returns list of running exponential moving averages.
 
     :param values: list of values to iterate and compute stat.
@@ -168,6 +307,11 @@ def ema_values(values, period=None, smoothing=None):
         * None - (default) use formula = 2.0 / (period + 1.0).
         * closer to 0 - greater weight to older values - more smooth.
         * closer to 1 - greater weight to recent values - less smooth.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
     :rtype: list of windowed exponential moving averages.
 
     Examples:
@@ -176,6 +320,10 @@ def ema_values(values, period=None, smoothing=None):
     >>> ["%.2f" % x for x in results]
     ['34.00', '32.00', '31.00', '32.50', '35.25', '30.13', '32.56']
     """
+    if state is not None:
+        reference = rolling.RollingEMA(period, smoothing)
+        return _resume(values, state, reference, output)
+
     if period:
         if period < 1:
             raise ValueError("period must be 1 or greater")
@@ -190,7 +338,7 @@ def ema_values(values, period=None, smoothing=None):
 
         period = int(period)
 
-    results = []
+    results = _results(values, output)
     lastval = None
     for bar, newx in enumerate(values):
         if lastval == None:
@@ -204,10 +352,10 @@ def ema_values(values, period=None, smoothing=None):
 
         results.append(lastval)
 
-    return results
+    return _returns(results)
 
 
-def wwma_values(values, period=None):
+def wwma_values(values, period=None, output=None, state=None):
     """Returns list of running Welles Wilder moving averages.
 
     Approximation of the ema.
@@ -215,6 +363,11 @@ def wwma_values(values, period=None):
     :param values: list of values to iterate and compute stat.
     :param period: (optional) # of values included in computation.
         * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
     :rtype: list of windowed Welles Wilder moving averages.
 
     Examples:
@@ -223,13 +376,17 @@ def wwma_values(values, period=None):
     >>> ["%.2f" % x for x in results]
     ['34.00', '32.00', '31.00', '32.00', '34.00', '31.00', '32.33']
     """
+    if state is not None:
+        reference = rolling.RollingWWMA(period)
+        return _resume(values, state, reference, output)
+
     if period:
         if period < 1:
             raise ValueError("period must be 1 or greater")
 
         period = int(period)
 
-    results = []
+    results = _results(values, output)
     lastval = None
     for bar, newx in enumerate(values):
         if lastval == None:
@@ -243,10 +400,10 @@ def wwma_values(values, period=None):
 
         results.append(lastval)
 
-    return results
+    return _returns(results)
 
 
-def psa_values(values, period=None):
+def psa_values(values, period=None, output=None, state=None):
     """Returns list of running Power Sum averages.
 
     Used to derive running variances.  Based on the blog post from
@@ -256,6 +413,11 @@ def psa_values(values, period=None):
     :param values: list of values to iterate and compute stat.
     :param period: (optional) # of values included in computation.
         * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
     :rtype: list of windowed Power Sum averages.
 
     Examples:
@@ -264,6 +426,10 @@ def psa_values(values, period=None):
     >>> ["%.2f" % x for x in results]
     ['1156.00', '1028.00', '965.67', '965.67', '1147.00', '1075.00', '1098.00']
     """
+    if state is not None:
+        reference = rolling.RollingPSA(period)
+        return _resume(values, state, reference, output)
+
     if period:
         if period < 1:
             raise ValueError("period must be 1 or greater")
@@ -271,7 +437,7 @@ def psa_values(values, period=None):
         period_n = float(period)
         period = int(period)
 
-    results = []
+    results = _results(values, output)
     lastval = None
     for bar, newx in enumerate(values):
         if lastval == None:
@@ -286,12 +452,16 @@ def psa_values(values, period=None):
 
         results.append(lastval)
 
-    return results
+    return _returns(results)
 
 
-def _varbases(values, period=None, population=False):
+def _varbases(values, period=None, population=False, output=None):
     """
-    Returns list of running variances or standard deviations.
+    Returns list of running variances.
+
+    Uses the windowed Welford update of rolling._moments, which is O(1)
+    per bar and avoids the cancellation of the psa * n - n * sma^2 form
+    on price-level data.
 
     :param values: list of values to iterate and compute stat.
     :param period: (optional) # of values included in computation.
@@ -299,6 +469,7 @@ def _varbases(values, period=None, population=False):
     :param population:
         * True - entire population, n.
         * False - sample set, n - 1 (default).
+    :param output: (optional) writable buffer to fill, see _results.
 
     Examples:
     >>> values = [32.47, 32.70, 32.77, 33.11, 33.25, 33.23, 33.23]
@@ -306,43 +477,77 @@ def _varbases(values, period=None, population=False):
     >>> ["%.2f" % x for x in results]
     ['0.00', '0.01', '0.02', '0.03', '0.04', '0.00', '0.00']
     """
+    return _devsqvars(_devsqs(values, period), period, population, output)
+
+
+def _devsqs(values, period=None):
+    """
+    Returns list of running sums of squared deviations from the mean.
+
+    The windowed Welford sums _varbases divides by n or n - 1, exposed so
+    every variance and standard deviation of a series can be derived from
+    one pass; see _devsqvars.
+
+    :param values: list of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = _devsqs(values, 3)
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '8.00', '14.00', '14.00', '40.67', '88.67', '92.67']
+    """
+    return rolling._moments(values, period)[1]
+
+
+def _devsqvars(devsqs, period=None, population=False, output=None):
+    """
+    Returns list of running variances from the sums of _devsqs.
+
+    :param devsqs: list of running sums of squared deviations.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param population:
+        * True - entire population, n.
+        * False - sample set, n - 1 (default).
+    :param output: (optional) writable buffer to fill, see _results.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = _devsqvars(_devsqs(values, 3), 3)
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '8.00', '7.00', '7.00', '20.33', '44.33', '46.33']
+    """
     if period:
         if period < 1:
             raise ValueError("period must be 1 or greater")
 
         period = int(period)
 
-    _smas = sma_values(values, period)
-    _psas = psa_values(values, period)
-
-    results = []
-    lastval = None
     sample_adjust = 0.0
     if not population:
         sample_adjust = 1.0
 
-    if period:
-        period_n = float(period)
-
-    for bar, row in enumerate(zip(_smas, _psas)):
-        if lastval == None:
-            lastval = 0.0
-            results.append(lastval)
-            continue
-
-        sma_x, psa_x = row
+    results = _results(devsqs, output)
 
-        if (not period) or (bar < period):
-            size = bar + 1.0
+    warmup = len(devsqs)
+    if period:
+        warmup = min(period, warmup)
 
-        else:
-            size = period_n
+    if warmup:
+        results.append(0.0)
 
-        n = size - sample_adjust
+    results.extend([devsq / (size - sample_adjust) if devsq > 0.0 else 0.0
+                    for size, devsq in enumerate(devsqs[1:warmup], 2)])
 
-        lastval = (psa_x * size - size * sma_x * sma_x) / n
+    n = float(period or 1) - sample_adjust
+    if n > 0.0:
+        results.extend([devsq / n if devsq > 0.0 else 0.0
+                        for devsq in devsqs[warmup:]])
 
-        results.append(lastval)
+    else:
+        results.extend([0.0] * (len(devsqs) - warmup))
 
     return results
 
@@ -400,12 +605,17 @@ def _varbase(values, period=None, population=False):
     return meandiffs / (itemcnt - sample_adjust)
 
 
-def varp_values(values, period=None):
+def varp_values(values, period=None, output=None, state=None):
     """Returns list of running population variances.
 
     :param values: list of values to iterate and compute stat.
     :param period: (optional) # of values included in computation.
         * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
     :rtype: list of windowed population variances.
 
     Examples:
@@ -414,7 +624,11 @@ def varp_values(values, period=None):
     >>> ["%.2f" % x for x in results]
     ['0.00', '4.00', '4.67', '4.67', '13.56', '29.56', '30.89']
     """
-    return _varbases(values, period, population=True)
+    if state is not None:
+        reference = rolling.RollingVar(period, True)
+        return _resume(values, state, reference, output)
+
+    return _returns(_varbases(values, period, True, output))
 
 
 def varp_value(values, period=None):
@@ -434,12 +648,17 @@ def varp_value(values, period=None):
     return _varbase(values, period, population=True)
 
 
-def var_values(values, period=None):
+def var_values(values, period=None, output=None, state=None):
     """Returns list of running sample variances.
 
     :param values: list of values to iterate and compute stat.
     :param period: (optional) # of values included in computation.
         * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
     :rtype: list of windowed sample variances.
 
     Examples:
@@ -448,7 +667,11 @@ def var_values(values, period=None):
     >>> ["%.2f" % x for x in results]
     ['0.00', '8.00', '7.00', '7.00', '20.33', '44.33', '46.33']
     """
-    return _varbases(values, period)
+    if state is not None:
+        reference = rolling.RollingVar(period, False)
+        return _resume(values, state, reference, output)
+
+    return _returns(_varbases(values, period, False, output))
 
 
 def var_value(values, period=None):
@@ -468,12 +691,17 @@ def var_value(values, period=None):
     return _varbase(values, period)
 
 
-def stdp_values(values, period=None):
+def stdp_values(values, period=None, output=None, state=None):
     """Returns list of running population standard deviations.
 
     :param values: list of values to iterate and compute stat.
     :param period: (optional) # of values included in computation.
         * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
     :rtype: list of windowed population standard deviations.
 
     Examples:
@@ -482,11 +710,20 @@ def stdp_values(values, period=None):
     >>> ["%.2f" % x for x in results]
     ['0.00', '2.00', '2.16', '2.16', '3.68', '5.44', '5.56']
     """
-    results = _varbases(values, period, population=True)
+    if state is not None:
+        reference = rolling.RollingStd(period, True)
+        return _resume(values, state, reference, output)
+
+    results = _varbases(values, period, True, output)
 
     _sqrt = math.sqrt
 
-    return [_sqrt(x) for x in results]
+    if output is None:
+        return [_sqrt(x) for x in results]
+
+    results.apply(_sqrt)
+
+    return _returns(results)
 
 
 def stdp_value(values, period=None):
@@ -511,12 +748,17 @@ def stdp_value(values, period=None):
     return result
 
 
-def std_values(values, period=None):
+def std_values(values, period=None, output=None, state=None):
     """Returns list of running sample standard deviations.
 
     :param values: list of values to iterate and compute stat.
     :param period: (optional) # of values included in computation.
         * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
     :rtype: list of windowed sample standard deviations.
 
     Examples:
@@ -525,11 +767,20 @@ def std_values(values, period=None):
     >>> ["%.2f" % x for x in results]
     ['0.00', '2.83', '2.65', '2.65', '4.51', '6.66', '6.81']
     """
-    results = _varbases(values, period)
+    if state is not None:
+        reference = rolling.RollingStd(period, False)
+        return _resume(values, state, reference, output)
+
+    results = _varbases(values, period, False, output)
 
     _sqrt = math.sqrt
 
-    return [_sqrt(x) for x in results]
+    if output is None:
+        return [_sqrt(x) for x in results]
+
+    results.apply(_sqrt)
+
+    return _returns(results)
 
 
 def std_value(values, period=None):
@@ -554,59 +805,152 @@ def std_value(values, period=None):
     return result
 
 
-def max_values(values, period=None):
-    """Returns list of running maximums.
+def _meanvars(values, period=None, population=False, state=None):
+    """
+    Returns lists of the running means and variances.
+
+    One pass of rolling._moments, or with a RollingVar state the new
+    values pushed through it, see _resume.
+
+    :param values: list of values to iterate.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param population:
+        * True - entire population, n.
+        * False - sample set, n - 1 (default).
+    :param state: (optional) RollingVar carrying on a previous call.
+    """
+    if state is None:
+        means, devsqs = rolling._moments(values, period)
+        return means, _devsqvars(devsqs, period, population)
+
+    _checkstate(state, rolling.RollingVar(period, population))
+
+    means = []
+    variances = []
+    _push = state.push
+    for newx in values:
+        variances.append(_push(newx))
+        means.append(state.mean)
+
+    return means, variances
+
+
+def bollinger_values(values, period=None, k=2, population=True,
+                     output=None, state=None):
+    """Returns upper, middle and lower Bollinger Bands.
+
+    The middle band is the moving average and the outer bands are k
+    standard deviations above and below it, all from one pass of the
+    windowed Welford update of rolling._moments instead of separate
+    sma_values and std_values calls.
 
     :param values: list of values to iterate and compute stat.
     :param period: (optional) # of values included in computation.
         * None - includes all values in computation.
-    :rtype: list of windowed maximums.
+    :param k: (optional) # of standard deviations from the middle band.
+    :param population:
+        * True - entire population standard deviation, n (default).
+        * False - sample standard deviation, n - 1.
+    :param output: (optional) tuple of 3 writable buffers to fill
+        instead of lists, for the upper, middle and lower bands.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; they are returned in place of the lists.
+    :param state: (optional) RollingVar carrying on a previous call.
+        * values then holds only the new values, see _resume.
+    :rtype: tuple of upper, middle and lower band lists.
 
     Examples:
     >>> values = [34, 30, 29, 34, 38, 25, 35]
-    >>> results = max_values(values, 3)  #using 3 period window.
-    >>> ["%.2f" % x for x in results]
-    ['34.00', '34.00', '34.00', '34.00', '38.00', '38.00', '38.00']
+    >>> upper, middle, lower = bollinger_values(values, 3)  #3 period window.
+    >>> ["%.2f" % x for x in upper]
+    ['34.00', '36.00', '35.32', '35.32', '41.03', '43.21', '43.78']
+    >>> ["%.2f" % x for x in lower]
+    ['34.00', '28.00', '26.68', '26.68', '26.30', '21.46', '21.55']
     """
-    if period:
-        if period < 1:
-            raise ValueError("period must be 1 or greater")
+    means, variances = _meanvars(values, period, population, state)
 
-        period = int(period)
+    if output is None:
+        output = (None, None, None)
 
-    results = []
-    recs = []
-    _additem = bisect.insort
-    _search = bisect.bisect_left
+    uppers = _results(values, output[0])
+    middles = _results(values, output[1])
+    lowers = _results(values, output[2])
+    _sqrt = math.sqrt
 
-    for bar, newx in enumerate(values):
-        if period and (bar >= period):
-            item = values[bar - period]
-            idx = _search(recs, item)
-            del recs[idx]
+    for mean, variance in zip(means, variances):
+        width = k * _sqrt(variance)
+
+        uppers.append(mean + width)
+        middles.append(mean)
+        lowers.append(mean - width)
+
+    return _returns(uppers), _returns(middles), _returns(lowers)
+
+
+def zscore_values(values, period=None, population=False, output=None,
+                  state=None):
+    """Returns list of running z-scores.
+
+    The # of standard deviations each value lies from the moving average
+    of its window, from one pass of the windowed Welford update of
+    rolling._moments; 0.0 where the window is flat.
+
+    :param values: list of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param population:
+        * True - entire population standard deviation, n.
+        * False - sample standard deviation, n - 1 (default).
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :param state: (optional) RollingVar carrying on a previous call.
+        * values then holds only the new values, see _resume.
+    :rtype: list of windowed z-scores.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = zscore_values(values, 3)  #using 3 period window.
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '-0.71', '-0.76', '1.13', '0.96', '-1.10', '0.34']
+    """
+    means, variances = _meanvars(values, period, population, state)
 
-        _additem(recs, newx)
+    results = _results(values, output)
+    _sqrt = math.sqrt
+
+    for newx, mean, variance in zip(values, means, variances):
+        if variance > 0.0:
+            lastval = (newx - mean) / _sqrt(variance)
 
-        lastval = recs[-1]
+        else:
+            lastval = 0.0
 
         results.append(lastval)
 
-    return results
+    return _returns(results)
 
 
-def top_values(values, period=None, num=1):
-    """Returns list of top num items.
+def _extremes(values, period=None, highest=True, output=None):
+    """
+    Returns list of running maximums or minimums.
+
+    Keeps a monotonic deque of window indexes so each bar costs amortized
+    O(1) regardless of the window size.
 
     :param values: list of values to iterate and compute stat.
     :param period: (optional) # of values included in computation.
         * None - includes all values in computation.
-    :param num: the num in the top num items.
-    :rtype: list of windowed top num items.
+    :param highest:
+        * True - running maximums (default).
+        * False - running minimums.
+    :param output: (optional) writable buffer to fill, see _results.
 
     Examples:
     >>> values = [34, 30, 29, 34, 38, 25, 35]
-    >>> top_values(values, 3, 2)  #3 period window and top 2 items.
-    [[34], [30, 34], [30, 34], [30, 34], [34, 38], [34, 38], [35, 38]]
+    >>> _extremes(values, 3, highest=False)
+    [34, 30, 29, 29, 29, 25, 25]
     """
     if period:
         if period < 1:
@@ -614,45 +958,98 @@ def top_values(values, period=None, num=1):
 
         period = int(period)
 
-    if num:
-        num = int(num)
+    results = _results(values, output)
+    lastval = None
 
-    results = []
-    recs = []
-    _additem = bisect.insort
-    _search = bisect.bisect_left
+    if not period:
+        for newx in values:
+            if lastval == None:
+                lastval = newx
+
+            elif highest and (newx > lastval):
+                lastval = newx
+
+            elif (not highest) and (newx < lastval):
+                lastval = newx
+
+            results.append(lastval)
+
+        return results
+
+    window = collections.deque()
+    _push = window.append
+    _pop = window.pop
+    _popleft = window.popleft
 
     for bar, newx in enumerate(values):
-        if period and (bar >= period):
-            item = values[bar - period]
-            idx = _search(recs, item)
-            del recs[idx]
+        if highest:
+            while window and values[window[-1]] <= newx:
+                _pop()
+
+        else:
+            while window and values[window[-1]] >= newx:
+                _pop()
 
-        _additem(recs, newx)
+        _push(bar)
 
-        begidx = num
-        if bar < num - 1:
-            begidx = bar + 1
+        if window[0] <= bar - period:
+            _popleft()
 
-        lastval = recs[-begidx:]
+        lastval = values[window[0]]
 
         results.append(lastval)
 
     return results
 
 
-def min_values(values, period=None):
-    """Returns list of minimum items.
+def max_values(values, period=None, output=None, state=None):
+    """Returns list of running maximums.
 
     :param values: list of values to iterate and compute stat.
     :param period: (optional) # of values included in computation.
         * None - includes all values in computation.
-    :rtype: list of windowed minimum items.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
+    :rtype: list of windowed maximums.
 
     Examples:
     >>> values = [34, 30, 29, 34, 38, 25, 35]
-    >>> min_values(values, 3)  #using 3 period window.
-    [34, 30, 29, 29, 29, 25, 25]
+    >>> results = max_values(values, 3)  #using 3 period window.
+    >>> ["%.2f" % x for x in results]
+    ['34.00', '34.00', '34.00', '34.00', '38.00', '38.00', '38.00']
+    """
+    if state is not None:
+        reference = rolling.RollingMax(period)
+        return _resume(values, state, reference, output)
+
+    return _returns(_extremes(values, period, True, output))
+
+
+def _recents(values, period=None, highest=True, since=False, output=None):
+    """
+    Returns list of indexes of, or bars since, the running extremes.
+
+    Keeps the same monotonic deque of window indexes as _extremes, so each
+    bar costs amortized O(1).  Ties resolve to the most recent index.
+
+    :param values: list of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param highest:
+        * True - running maximums (default).
+        * False - running minimums.
+    :param since:
+        * False - index of the extreme in values (default).
+        * True - # of bars since the extreme.
+    :param output: (optional) writable buffer to fill, see _results.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> _recents(values, 3, highest=False)
+    [0, 1, 2, 2, 2, 5, 5]
     """
     if period:
         if period < 1:
@@ -660,40 +1057,134 @@ def min_values(values, period=None):
 
         period = int(period)
 
-    results = []
-    recs = []
-    _additem = bisect.insort
-    _search = bisect.bisect_left
+    results = _results(values, output)
+
+    if not period:
+        idx = 0
+        lastval = None
+        for bar, newx in enumerate(values):
+            if lastval == None:
+                lastval = newx
+
+            if highest and (newx >= lastval):
+                idx, lastval = bar, newx
+
+            elif (not highest) and (newx <= lastval):
+                idx, lastval = bar, newx
+
+            if since:
+                results.append(bar - idx)
+
+            else:
+                results.append(idx)
+
+        return results
+
+    window = collections.deque()
+    _push = window.append
+    _pop = window.pop
+    _popleft = window.popleft
 
     for bar, newx in enumerate(values):
-        if period and (bar >= period):
-            item = values[bar - period]
-            idx = _search(recs, item)
-            del recs[idx]
+        if highest:
+            while window and values[window[-1]] <= newx:
+                _pop()
+
+        else:
+            while window and values[window[-1]] >= newx:
+                _pop()
 
-        _additem(recs, newx)
+        _push(bar)
 
-        lastval = recs[0]
+        if window[0] <= bar - period:
+            _popleft()
 
-        results.append(lastval)
+        if since:
+            results.append(bar - window[0])
+
+        else:
+            results.append(window[0])
 
     return results
 
 
-def bottom_values(values, period=None, num=1):
-    """Returns list of bottom num items.
+def recentmax_values(values, period=None, output=None, state=None):
+    """Returns list of indexes of the most recent maximum.
 
     :param values: list of values to iterate and compute stat.
     :param period: (optional) # of values included in computation.
         * None - includes all values in computation.
-    :param num: the num in the bottom num items.
-    :rtype: list of windowed bottom num items.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
+    :rtype: list of indexes into values of the windowed maximums.
 
     Examples:
     >>> values = [34, 30, 29, 34, 38, 25, 35]
-    >>> bottom_values(values, 3, 2)  #3 period window and top 2 items.
-    [[34], [30, 34], [29, 30], [29, 30], [29, 34], [25, 34], [25, 35]]
+    >>> recentmax_values(values, 3)  #using 3 period window.
+    [0, 0, 0, 3, 4, 4, 4]
+    """
+    if state is not None:
+        reference = rolling.RollingRecentMax(period)
+        return _resume(values, state, reference, output)
+
+    return _returns(_recents(values, period, True, False, output))
+
+
+def sincemax_values(values, period=None, output=None, state=None):
+    """Returns list of # of bars since the most recent maximum.
+
+    :param values: list of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
+    :rtype: list of # of bars since the windowed maximums.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> sincemax_values(values, 3)  #using 3 period window.
+    [0, 1, 2, 0, 0, 1, 2]
     """
+    if state is not None:
+        reference = rolling.RollingSinceMax(period)
+        return _resume(values, state, reference, output)
+
+    return _returns(_recents(values, period, True, True, output))
+
+
+def top_values(values, period=None, num=1, state=None):
+    """Returns list of top num items.
+
+    Windows of up to window.DEFAULT_FLAT values, e.g. 5000 bars, keep one
+    plain sorted list with O(w) insort and del updates; their memmove
+    still beats the O(log w) blocked list of larger windows, which was
+    measured 2.5 to 3 times slower at 5000 bars.
+
+    Raises ValueError if values holds a NaN, which cannot be ordered.
+
+    :param values: list of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param num: the num in the top num items.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
+    :rtype: list of windowed top num items.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> top_values(values, 3, 2)  #3 period window and top 2 items.
+    [[34], [30, 34], [30, 34], [30, 34], [34, 38], [34, 38], [35, 38]]
+    """
+    if state is not None:
+        reference = rolling.RollingTopN(period, num)
+        return _resume(values, state, reference)
+
     if period:
         if period < 1:
             raise ValueError("period must be 1 or greater")
@@ -704,29 +1195,1054 @@ def bottom_values(values, period=None, num=1):
         num = int(num)
 
     results = []
-    recs = []
-    _additem = bisect.insort
-    _search = bisect.bisect_left
-
-    for bar, newx in enumerate(values):
-        if period and (bar >= period):
-            item = values[bar - period]
-            idx = _search(recs, item)
-            del recs[idx]
-
-        _additem(recs, newx)
 
-        endidx = num
-        if bar < num - 1:
-            endidx = bar + 1
+    for window in sorted_windows(values, period):
+        if num:
+            lastval = window[-num:]
 
-        lastval = recs[0:endidx]
+        else:
+            lastval = list(window)
 
         results.append(lastval)
 
     return results
 
 
+def min_values(values, period=None, output=None, state=None):
+    """Returns list of minimum items.
+
+    :param values: list of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
+    :rtype: list of windowed minimum items.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> min_values(values, 3)  #using 3 period window.
+    [34, 30, 29, 29, 29, 25, 25]
+    """
+    if state is not None:
+        reference = rolling.RollingMin(period)
+        return _resume(values, state, reference, output)
+
+    return _returns(_extremes(values, period, False, output))
+
+
+def recentmin_values(values, period=None, output=None, state=None):
+    """Returns list of indexes of the most recent minimum.
+
+    :param values: list of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
+    :rtype: list of indexes into values of the windowed minimums.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> recentmin_values(values, 3)  #using 3 period window.
+    [0, 1, 2, 2, 2, 5, 5]
+    """
+    if state is not None:
+        reference = rolling.RollingRecentMin(period)
+        return _resume(values, state, reference, output)
+
+    return _returns(_recents(values, period, False, False, output))
+
+
+def sincemin_values(values, period=None, output=None, state=None):
+    """Returns list of # of bars since the most recent minimum.
+
+    :param values: list of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
+    :rtype: list of # of bars since the windowed minimums.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> sincemin_values(values, 3)  #using 3 period window.
+    [0, 0, 0, 1, 2, 0, 1]
+    """
+    if state is not None:
+        reference = rolling.RollingSinceMin(period)
+        return _resume(values, state, reference, output)
+
+    return _returns(_recents(values, period, False, True, output))
+
+
+def bottom_values(values, period=None, num=1, state=None):
+    """Returns list of bottom num items.
+
+    Windows of up to window.DEFAULT_FLAT values, e.g. 5000 bars, keep one
+    plain sorted list with O(w) insort and del updates; their memmove
+    still beats the O(log w) blocked list of larger windows, which was
+    measured 2.5 to 3 times slower at 5000 bars.
+
+    Raises ValueError if values holds a NaN, which cannot be ordered.
+
+    :param values: list of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param num: the num in the bottom num items.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
+    :rtype: list of windowed bottom num items.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> bottom_values(values, 3, 2)  #3 period window and top 2 items.
+    [[34], [30, 34], [29, 30], [29, 30], [29, 34], [25, 34], [25, 35]]
+    """
+    if state is not None:
+        reference = rolling.RollingBottomN(period, num)
+        return _resume(values, state, reference)
+
+    if period:
+        if period < 1:
+            raise ValueError("period must be 1 or greater")
+
+        period = int(period)
+
+    if num:
+        num = int(num)
+
+    results = []
+
+    for window in sorted_windows(values, period):
+        lastval = window[:num]
+
+        results.append(lastval)
+
+    return results
+
+
+COVARIANCE_STATS = ('cov', 'covp', 'corr', 'beta', 'alpha')
+
+
+def _covbases(xvalues, yvalues, period=None, stat='cov', output=None):
+    """
+    Returns list of running co-moment statistics of two series.
+
+    Uses the windowed Welford update of rolling._moments extended to
+    the co-moment: the sum of products of deviations is adjusted for the
+    pair entering and the pair leaving the window, so each bar is O(1)
+    regardless of the window size, and recomputed from the window on the
+    same schedule as the means and squared deviations.
+
+    :param xvalues: list of values to iterate and compute stat.
+    :param yvalues: list of values paired with xvalues.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param stat: statistic to compute.
+        * cov - sample covariance, n - 1 (default).
+        * covp - population covariance, n.
+        * corr - correlation.
+        * beta - slope of yvalues regressed on xvalues.
+        * alpha - intercept of yvalues regressed on xvalues.
+    :param output: (optional) writable buffer to fill, see _results.
+
+    A zero variance gives a correlation, beta and alpha of 0.0.
+
+    Examples:
+    >>> xvalues = [34, 30, 29, 34, 38, 25, 35]
+    >>> yvalues = [21, 25, 32, 55, 22, 31, 30]
+    >>> results = _covbases(xvalues, yvalues, 3, 'covp')
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '-4.00', '-8.67', '25.33', '-11.89', '-3.67', '-16.78']
+    """
+    if len(xvalues) != len(yvalues):
+        raise ValueError("xvalues and yvalues must be the same length")
+
+    if stat not in COVARIANCE_STATS:
+        msg = "unknown stat: "
+        msg = ''.join((msg, str(stat)))
+        raise ValueError(msg)
+
+    period = rolling._checkperiod(period)
+
+    sample_adjust = 0.0
+    if stat == 'cov':
+        sample_adjust = 1.0
+
+    meansx, devsqsx = rolling._moments(xvalues, period)
+    meansy, devsqsy = rolling._moments(yvalues, period)
+
+    results = _results(xvalues, output)
+    span = (period or 1) * rolling.REANCHOR
+    meanx = 0.0
+    codev = 0.0
+
+    for bar, newx in enumerate(xvalues):
+        newy = yvalues[bar]
+        meany = meansy[bar]
+
+        if (not period) or (bar < period):
+            size = bar + 1.0
+            codev += (newx - meanx) * (newy - meany)
+
+        else:
+            size = float(period)
+            oldx = xvalues[bar - period]
+            oldy = yvalues[bar - period]
+            codev += ((newx - meanx) * (newy - meany) -
+                      (oldx - meanx) * (oldy - meany))
+
+        meanx = meansx[bar]
+        devsqx = devsqsx[bar]
+        devsqy = devsqsy[bar]
+
+        if period and (bar >= period) and not (bar % span):
+            beg = bar - period + 1
+            codev = math.fsum([(x - meanx) * (y - meany) for x, y in
+                               zip(xvalues[beg:bar + 1],
+                                   yvalues[beg:bar + 1])])
+
+        if stat == 'cov' or stat == 'covp':
+            n = size - sample_adjust
+            if bar and (n > 0.0):
+                lastval = codev / n
+
+            else:
+                lastval = 0.0
+
+        elif stat == 'corr':
+            if bar and (devsqx > 0.0) and (devsqy > 0.0):
+                lastval = codev / math.sqrt(devsqx * devsqy)
+                lastval = max(-1.0, min(1.0, lastval))
+
+            else:
+                lastval = 0.0
+
+        else:
+            if bar and (devsqx > 0.0):
+                lastval = codev / devsqx
+
+            else:
+                lastval = 0.0
+
+            if stat == 'alpha':
+                lastval = meany - lastval * meanx
+
+        results.append(lastval)
+
+    return results
+
+
+def _covbase(xvalues, yvalues, period=None, stat='cov'):
+    """
+    Returns final co-moment statistic of two series.
+
+    :param xvalues: list of values to compute stat.
+    :param yvalues: list of values paired with xvalues.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param stat: statistic to compute, see _covbases.
+
+    Examples:
+    >>> xvalues = [34, 30, 29, 34, 38, 25, 35]
+    >>> yvalues = [21, 25, 32, 55, 22, 31, 30]
+    >>> "%.2f" % _covbase(xvalues, yvalues, 3, 'covp')
+    '-16.78'
+    """
+    if len(xvalues) != len(yvalues):
+        raise ValueError("xvalues and yvalues must be the same length")
+
+    if not xvalues:
+        return None
+
+    maxbar = len(xvalues)
+
+    beg = 0
+    if period:
+        if period < 1:
+            raise ValueError("period must be 1 or greater")
+
+        beg = maxbar - int(period)
+        if beg < 0:
+            beg = 0
+
+    return _covbases(xvalues[beg:], yvalues[beg:], None, stat)[-1]
+
+
+def cov_values(xvalues, yvalues, period=None, output=None):
+    """Returns list of running sample covariances.
+
+    :param xvalues: list of values to iterate and compute stat.
+    :param yvalues: list of values paired with xvalues.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :rtype: list of windowed sample covariances.
+
+    Examples:
+    >>> xvalues = [34, 30, 29, 34, 38, 25, 35]
+    >>> yvalues = [21, 25, 32, 55, 22, 31, 30]
+    >>> results = cov_values(xvalues, yvalues, 3)  #using 3 period window.
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '-8.00', '-13.00', '38.00', '-17.83', '-5.50', '-25.17']
+    """
+    return _returns(_covbases(xvalues, yvalues, period, 'cov', output))
+
+
+def cov_value(xvalues, yvalues, period=None):
+    """Returns the final sample covariance.
+
+    :param xvalues: list of values to compute stat.
+    :param yvalues: list of values paired with xvalues.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: the final sample covariance.
+
+    Examples:
+    >>> xvalues = [34, 30, 29, 34, 38, 25, 35]
+    >>> yvalues = [21, 25, 32, 55, 22, 31, 30]
+    >>> "%.2f" % cov_value(xvalues, yvalues, 3)  #using 3 period window.
+    '-25.17'
+    """
+    return _covbase(xvalues, yvalues, period, 'cov')
+
+
+def covp_values(xvalues, yvalues, period=None, output=None):
+    """Returns list of running population covariances.
+
+    :param xvalues: list of values to iterate and compute stat.
+    :param yvalues: list of values paired with xvalues.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :rtype: list of windowed population covariances.
+
+    Examples:
+    >>> xvalues = [34, 30, 29, 34, 38, 25, 35]
+    >>> yvalues = [21, 25, 32, 55, 22, 31, 30]
+    >>> results = covp_values(xvalues, yvalues, 3)  #using 3 period window.
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '-4.00', '-8.67', '25.33', '-11.89', '-3.67', '-16.78']
+    """
+    return _returns(_covbases(xvalues, yvalues, period, 'covp', output))
+
+
+def covp_value(xvalues, yvalues, period=None):
+    """Returns the final population covariance.
+
+    :param xvalues: list of values to compute stat.
+    :param yvalues: list of values paired with xvalues.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: the final population covariance.
+
+    Examples:
+    >>> xvalues = [34, 30, 29, 34, 38, 25, 35]
+    >>> yvalues = [21, 25, 32, 55, 22, 31, 30]
+    >>> "%.2f" % covp_value(xvalues, yvalues, 3)  #using 3 period window.
+    '-16.78'
+    """
+    return _covbase(xvalues, yvalues, period, 'covp')
+
+
+def corr_values(xvalues, yvalues, period=None, output=None):
+    """Returns list of running correlations.
+
+    :param xvalues: list of values to iterate and compute stat.
+    :param yvalues: list of values paired with xvalues.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :rtype: list of windowed correlations, 0.0 where either series is flat.
+
+    Examples:
+    >>> xvalues = [34, 30, 29, 34, 38, 25, 35]
+    >>> yvalues = [21, 25, 32, 55, 22, 31, 30]
+    >>> results = corr_values(xvalues, yvalues, 3)  #using 3 period window.
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '-1.00', '-0.88', '0.92', '-0.23', '-0.05', '-0.75']
+    """
+    return _returns(_covbases(xvalues, yvalues, period, 'corr', output))
+
+
+def corr_value(xvalues, yvalues, period=None):
+    """Returns the final correlation.
+
+    :param xvalues: list of values to compute stat.
+    :param yvalues: list of values paired with xvalues.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: the final correlation.
+
+    Examples:
+    >>> xvalues = [34, 30, 29, 34, 38, 25, 35]
+    >>> yvalues = [21, 25, 32, 55, 22, 31, 30]
+    >>> "%.2f" % corr_value(xvalues, yvalues, 3)  #using 3 period window.
+    '-0.75'
+    """
+    return _covbase(xvalues, yvalues, period, 'corr')
+
+
+def beta_values(values, benchmark, period=None, output=None):
+    """Returns list of running betas of values against a benchmark.
+
+    :param values: list of values to iterate and compute stat.
+    :param benchmark: list of benchmark values paired with values.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :rtype: list of windowed betas, 0.0 where the benchmark is flat.
+
+    Examples:
+    >>> values = [21, 25, 32, 55, 22, 31, 30]
+    >>> benchmark = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = beta_values(values, benchmark, 3)  #using 3 period window.
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '-1.00', '-1.86', '5.43', '-0.88', '-0.12', '-0.54']
+    """
+    return _returns(_covbases(benchmark, values, period, 'beta', output))
+
+
+def beta_value(values, benchmark, period=None):
+    """Returns the final beta of values against a benchmark.
+
+    :param values: list of values to compute stat.
+    :param benchmark: list of benchmark values paired with values.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: the final beta.
+
+    Examples:
+    >>> values = [21, 25, 32, 55, 22, 31, 30]
+    >>> benchmark = [34, 30, 29, 34, 38, 25, 35]
+    >>> "%.2f" % beta_value(values, benchmark, 3)  #using 3 period window.
+    '-0.54'
+    """
+    return _covbase(benchmark, values, period, 'beta')
+
+
+def alpha_values(values, benchmark, period=None, output=None):
+    """Returns list of running alphas of values against a benchmark.
+
+    The alpha is the intercept of values regressed on the benchmark:
+    mean(values) - beta * mean(benchmark).
+
+    :param values: list of values to iterate and compute stat.
+    :param benchmark: list of benchmark values paired with values.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :rtype: list of windowed alphas.
+
+    Examples:
+    >>> values = [21, 25, 32, 55, 22, 31, 30]
+    >>> benchmark = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = alpha_values(values, benchmark, 3)  #using 3 period window.
+    >>> ["%.2f" % x for x in results]
+    ['21.00', '55.00', '83.57', '-130.95', '65.86', '40.01', '45.41']
+    """
+    return _returns(_covbases(benchmark, values, period, 'alpha', output))
+
+
+def alpha_value(values, benchmark, period=None):
+    """Returns the final alpha of values against a benchmark.
+
+    :param values: list of values to compute stat.
+    :param benchmark: list of benchmark values paired with values.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: the final alpha.
+
+    Examples:
+    >>> values = [21, 25, 32, 55, 22, 31, 30]
+    >>> benchmark = [34, 30, 29, 34, 38, 25, 35]
+    >>> "%.2f" % alpha_value(values, benchmark, 3)  #using 3 period window.
+    '45.41'
+    """
+    return _covbase(benchmark, values, period, 'alpha')
+
+
+def median_values(values, period=None, output=None, state=None):
+    """Returns list of running medians.
+
+    Keeps the window in order with sorted_windows so each bar costs an
+    insert and a delete instead of a sort of the window.  Windows holding
+    an even number of values average the two middle values.  Raises
+    ValueError if values holds a NaN, which cannot be ordered.
+
+    :param values: list of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param output: (optional) writable buffer to fill instead of a list.
+        * array.array('d') or any writable buffer of doubles holding at
+          least len(values) items; it is returned in place of the list.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
+    :rtype: list of windowed medians.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> median_values(values, 3)  #using 3 period window.
+    [34, 32.0, 30, 30, 34, 34, 35]
+    """
+    if state is not None:
+        reference = rolling.RollingMedian(period)
+        return _resume(values, state, reference, output)
+
+    if period:
+        if period < 1:
+            raise ValueError("period must be 1 or greater")
+
+        period = int(period)
+
+    results = _results(values, output)
+
+    for window in sorted_windows(values, period):
+        mid = len(window) >> 1
+        if len(window) & 1:
+            lastval = window[mid]
+
+        else:
+            lastval = (window[mid - 1] + window[mid]) / 2.0
+
+        results.append(lastval)
+
+    return _returns(results)
+
+
+def median_value(values, period=None):
+    """Returns the final median.
+
+    :param values: list of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: the final median.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> median_value(values, 3)  #using 3 period window.
+    35
+    """
+    if not values:
+        return None
+
+    maxbar = len(values)
+
+    beg = 0
+    if period:
+        if period < 1:
+            raise ValueError("period must be 1 or greater")
+
+        beg = maxbar - int(period)
+        if beg < 0:
+            beg = 0
+
+    window = sorted(values[beg:])
+    mid = len(window) >> 1
+    if len(window) & 1:
+        return window[mid]
+
+    return (window[mid - 1] + window[mid]) / 2.0
+
+
+def quantile_values(values, period=None, q=0.5, state=None):
+    """Returns list of running quantiles.
+
+    Keeps the window in order with sorted_windows so each bar costs an
+    insert and a delete instead of a sort of the window.  Quantiles
+    falling between two values are linearly interpolated.  Raises
+    ValueError if values holds a NaN, which cannot be ordered.
+
+    :param values: list of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param q: quantile or list of quantiles.
+        * valid values: between 0 - 1.
+        * list - each result is a list with one item per quantile.
+    :param state: (optional) Rolling object carrying on a previous call.
+        * values then holds only the new values, see _resume.
+    :rtype: list of windowed quantiles.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> quantile_values(values, 3, 0.25)  #3 period window and 25% quantile.
+    [34, 31.0, 29.5, 29.5, 31.5, 29.5, 30.0]
+    >>> quantile_values(values, 3, [0.0, 1.0])
+    [[34, 34], [30, 34], [29, 34], [29, 34], [29, 38], [25, 38], [25, 38]]
+    """
+    if state is not None:
+        reference = rolling.RollingQuantile(period, q)
+        return _resume(values, state, reference)
+
+    if period:
+        if period < 1:
+            raise ValueError("period must be 1 or greater")
+
+        period = int(period)
+
+    qs = _quantiles(q)
+    single = not isinstance(q, (list, tuple))
+
+    results = []
+
+    for window in sorted_windows(values, period):
+        if single:
+            lastval = _quantile(window, qs[0])
+
+        else:
+            lastval = [_quantile(window, x) for x in qs]
+
+        results.append(lastval)
+
+    return results
+
+
+def quantile_value(values, period=None, q=0.5):
+    """Returns the final quantile.
+
+    :param values: list of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param q: quantile or list of quantiles, see quantile_values.
+    :rtype: the final quantile, or list of final quantiles.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> quantile_value(values, 3, 0.25)  #3 period window and 25% quantile.
+    30.0
+    """
+    qs = _quantiles(q)
+
+    if not values:
+        return None
+
+    maxbar = len(values)
+
+    beg = 0
+    if period:
+        if period < 1:
+            raise ValueError("period must be 1 or greater")
+
+        beg = maxbar - int(period)
+        if beg < 0:
+            beg = 0
+
+    window = sorted(values[beg:])
+
+    if not isinstance(q, (list, tuple)):
+        return _quantile(window, qs[0])
+
+    return [_quantile(window, x) for x in qs]
+
+
+DESCRIBE_STATS = ('sum', 'sma', 'ema', 'wwma', 'psa',
+                  'varp', 'var', 'stdp', 'std', 'max', 'min')
+
+
+def describe_values(values, period=None, stats=None, smoothing=None):
+    """Returns dict of several running stats of the same values.
+
+    Every requested stat is updated in one pass over values: the windowed
+    Welford step of rolling._moments gives sma and, per bar, the
+    variances and standard deviations, two monotonic deques give max and
+    min, and sum, ema, wwma and psa run their own recurrences in the same
+    loop.  Each stat matches the _values function of the same name,
+    except that sma is re-anchored with the variances, so on long
+    windowed series it can differ from sma_values by rounding.
+
+    :param values: list of values to iterate and compute stats.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param stats: (optional) names of the stats to compute.
+        * None - computes every stat in DESCRIBE_STATS.
+    :param smoothing: (optional) ema smoothing factor, see ema_values.
+    :rtype: dict of stat name to list of windowed stats.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = describe_values(values, 3, ['sma', 'max'])
+    >>> ["%.2f" % x for x in results['sma']]
+    ['34.00', '32.00', '31.00', '31.00', '33.67', '32.33', '32.67']
+    >>> results['max']
+    [34, 34, 34, 34, 38, 38, 38]
+    """
+    if stats is None:
+        stats = DESCRIBE_STATS
+
+    for name in stats:
+        if name not in DESCRIBE_STATS:
+            raise ValueError(''.join(("unknown stat: ", str(name))))
+
+    if period:
+        if period < 1:
+            raise ValueError("period must be 1 or greater")
+
+        if smoothing == None:
+            smoothing = 2.0 / (period + 1.0)
+
+        elif (smoothing < 0) or (smoothing > 1):
+            msg = "smoothing outside of 0 to 1 range: "
+            msg = ''.join((msg, str(smoothing)))
+            raise ValueError(msg)
+
+        period_n = float(period)
+        period = int(period)
+
+    results = dict((name, []) for name in stats)
+    _sumappend = getattr(results.get('sum'), 'append', None)
+    _smaappend = getattr(results.get('sma'), 'append', None)
+    _emaappend = getattr(results.get('ema'), 'append', None)
+    _wwmaappend = getattr(results.get('wwma'), 'append', None)
+    _psaappend = getattr(results.get('psa'), 'append', None)
+    _varpappend = getattr(results.get('varp'), 'append', None)
+    _varappend = getattr(results.get('var'), 'append', None)
+    _stdpappend = getattr(results.get('stdp'), 'append', None)
+    _stdappend = getattr(results.get('std'), 'append', None)
+    _maxappend = getattr(results.get('max'), 'append', None)
+    _minappend = getattr(results.get('min'), 'append', None)
+
+    moments = _smaappend or _varpappend or _varappend or \
+        _stdpappend or _stdappend
+    extremes = _maxappend or _minappend
+
+    _sqrt = math.sqrt
+    _anchor = rolling._anchor
+    span = (period or 1) * rolling.REANCHOR
+
+    total = ema = wwma = psa = None
+    high = low = None
+    mean = 0.0
+    devsq = 0.0
+    highs = collections.deque()
+    lows = collections.deque()
+
+    for bar, newx in enumerate(values):
+        warm = (not period) or (bar < period)
+        if warm:
+            size = bar + 1.0
+        else:
+            size = period_n
+            oldx = values[bar - period]
+
+        if _sumappend:
+            if not bar:
+                total = newx
+            elif warm:
+                total += newx
+            else:
+                total += (newx - oldx)
+
+            _sumappend(total)
+
+        if _emaappend:
+            if not bar:
+                ema = float(newx)
+            elif warm:
+                ema = ema + ((newx - ema) / size)
+            else:
+                ema = ema + smoothing * (newx - ema)
+
+            _emaappend(ema)
+
+        if _wwmaappend:
+            if not bar:
+                wwma = float(newx)
+            elif warm:
+                wwma = wwma + ((newx - wwma) / size)
+            else:
+                wwma = (newx + wwma * (period - 1.0)) / period
+
+            _wwmaappend(wwma)
+
+        if _psaappend:
+            if not bar:
+                psa = (newx * newx) / size
+            elif warm:
+                psa += ((newx * newx - psa) / size)
+            else:
+                psa += (((newx * newx) - (oldx * oldx)) / period_n)
+
+            _psaappend(psa)
+
+        if moments:
+            if warm:
+                delta = newx - mean
+                mean += delta / size
+                devsq += delta * (newx - mean)
+
+            else:
+                oldmean = mean
+                delta = newx - oldx
+                mean += delta / size
+                devsq += delta * ((newx - mean) + (oldx - oldmean))
+
+                if not (bar % span):
+                    mean, devsq = _anchor(values[bar - period + 1:bar + 1])
+
+            if _smaappend:
+                _smaappend(mean)
+
+            varp = var = 0.0
+            if bar and (devsq > 0.0):
+                varp = devsq / size
+                if size > 1.0:
+                    var = devsq / (size - 1.0)
+
+            if _varpappend:
+                _varpappend(varp)
+            if _varappend:
+                _varappend(var)
+            if _stdpappend:
+                _stdpappend(_sqrt(varp))
+            if _stdappend:
+                _stdappend(_sqrt(var))
+
+        if extremes:
+            if not period:
+                if (high == None) or (newx > high):
+                    high = newx
+                if (low == None) or (newx < low):
+                    low = newx
+
+            else:
+                while highs and values[highs[-1]] <= newx:
+                    highs.pop()
+                while lows and values[lows[-1]] >= newx:
+                    lows.pop()
+
+                highs.append(bar)
+                lows.append(bar)
+
+                if highs[0] <= bar - period:
+                    highs.popleft()
+                if lows[0] <= bar - period:
+                    lows.popleft()
+
+                high = values[highs[0]]
+                low = values[lows[0]]
+
+            if _maxappend:
+                _maxappend(high)
+            if _minappend:
+                _minappend(low)
+
+    return results
+
+
+def _sweepperiods(periods):
+    """Returns list of validated int periods, None for all values."""
+    results = []
+    for period in periods:
+        if period:
+            if period < 1:
+                raise ValueError("period must be 1 or greater")
+
+            period = int(period)
+
+        else:
+            period = None
+
+        results.append(period)
+
+    return results
+
+
+def _prefixsums(values):
+    """Returns (prefix sums of values less values[0], values[0]).
+
+    Offsetting by the first value keeps the prefix sums small on
+    price-level data; integer values stay exact.
+    """
+    prefix = [0]
+    if not values:
+        return prefix, 0
+
+    shift = values[0]
+    lastval = 0
+    _append = prefix.append
+    for newx in values:
+        lastval += (newx - shift)
+        _append(lastval)
+
+    return prefix, shift
+
+
+def sum_sweep(values, periods):
+    """Returns list of running sums for each period.
+
+    Every window sum is the difference of two prefix sums computed in a
+    single pass over values.
+
+    :param values: list of values to iterate.
+    :param periods: iterable of periods, see sum_values.
+    :rtype: list with one list of summed values per period.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> sum_sweep(values, [2, 3])
+    [[34, 64, 59, 63, 72, 63, 60], [34, 64, 93, 93, 101, 97, 98]]
+    """
+    prefix, shift = _prefixsums(values)
+    maxbar = len(prefix) - 1
+
+    results = []
+    for period in _sweepperiods(periods):
+        if (not period) or (period > maxbar):
+            period = maxbar
+
+        row = [hi + (bar + 1) * shift
+               for bar, hi in enumerate(prefix[1:period + 1])]
+        row.extend([(hi - lo) + period * shift
+                    for hi, lo in zip(prefix[period + 1:], prefix[1:])])
+
+        results.append(row)
+
+    return results
+
+
+def sma_sweep(values, periods):
+    """Returns list of running simple moving averages for each period.
+
+    Every window average comes from the difference of two prefix sums
+    computed in a single pass over values.  Results match sma_values to
+    within floating point rounding.
+
+    :param values: list of values to iterate and compute stats.
+    :param periods: iterable of periods, see sma_values.
+    :rtype: list with one list of simple moving averages per period.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = sma_sweep(values, [2, 3])
+    >>> ["%.2f" % x for x in results[1]]
+    ['34.00', '32.00', '31.00', '31.00', '33.67', '32.33', '32.67']
+    """
+    prefix, shift = _prefixsums(values)
+    maxbar = len(prefix) - 1
+
+    results = []
+    for period in _sweepperiods(periods):
+        if (not period) or (period > maxbar):
+            period = maxbar
+
+        period_n = float(period)
+
+        row = [hi / (bar + 1.0) + shift
+               for bar, hi in enumerate(prefix[1:period + 1])]
+        row.extend([(hi - lo) / period_n + shift
+                    for hi, lo in zip(prefix[period + 1:], prefix[1:])])
+
+        results.append(row)
+
+    return results
+
+
+def _emasweep(values, periods, smoothings):
+    """Returns list of exponentially smoothed averages for each period.
+
+    All periods advance together, one bar at a time, and share the
+    cumulative average used while a window fills.
+    """
+    states = []
+    for period, smoothing in zip(periods, smoothings):
+        states.append([period, smoothing, []])
+
+    lastval = None
+    for bar, newx in enumerate(values):
+        if lastval == None:
+            lastval = float(newx)
+
+        else:
+            lastval = lastval + ((newx - lastval) / (bar + 1.0))
+
+        for state in states:
+            period, smoothing, row = state
+            if (not period) or (bar < period):
+                row.append(lastval)
+
+            elif smoothing == None:
+                row.append((newx + row[-1] * (period - 1.0)) / period)
+
+            else:
+                row.append(row[-1] + smoothing * (newx - row[-1]))
+
+    return [state[2] for state in states]
+
+
+def ema_sweep(values, periods, smoothing=None):
+    """Returns list of running exponential moving averages for each period.
+
+    Results equal ema_values for each period.
+
+    :param values: list of values to iterate and compute stat.
+    :param periods: iterable of periods, see ema_values.
+    :param smoothing: (optional) smoothing factor used for every period.
+        * None - (default) use formula = 2.0 / (period + 1.0).
+    :rtype: list with one list of exponential moving averages per period.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = ema_sweep(values, [2, 3])
+    >>> ["%.3f" % x for x in results[1]]
+    ['34.000', '32.000', '31.000', '32.500', '35.250', '30.125', '32.562']
+    """
+    if smoothing != None:
+        if (smoothing < 0) or (smoothing > 1):
+            msg = "smoothing outside of 0 to 1 range: "
+            msg = ''.join((msg, str(smoothing)))
+            raise ValueError(msg)
+
+    periods = _sweepperiods(periods)
+
+    smoothings = []
+    for period in periods:
+        if period and (smoothing == None):
+            smoothings.append(2.0 / (period + 1.0))
+
+        else:
+            smoothings.append(smoothing)
+
+    return _emasweep(values, periods, smoothings)
+
+
+def wwma_sweep(values, periods):
+    """Returns list of running Welles Wilder moving averages for each period.
+
+    Results equal wwma_values for each period.
+
+    :param values: list of values to iterate and compute stat.
+    :param periods: iterable of periods, see wwma_values.
+    :rtype: list with one list of Welles Wilder moving averages per period.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = wwma_sweep(values, [2, 3])
+    >>> ["%.2f" % x for x in results[1]]
+    ['34.00', '32.00', '31.00', '32.00', '34.00', '31.00', '32.33']
+    """
+    periods = _sweepperiods(periods)
+
+    return _emasweep(values, periods, [None] * len(periods))
+
+
 def _testit(verbose=None):
     import doctest
     doctest.testmod(verbose=verbose)
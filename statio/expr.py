@@ -0,0 +1,393 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Lazy expressions of composed running statistics.
+
+series() names an input and the methods of Expr (sma, std, max, ...) and
+the arithmetic operators build an expression graph without computing
+anything.  evaluate() and stream() first merge identical subexpressions,
+so sma(x, 20) written twice is computed once, and the sma, var, varp, std
+and stdp of the same input and period share a single window of running
+moments.  Every bar then flows through the whole graph in one pass using
+the Rolling objects, keeping only the windows in memory; intermediate
+results are only kept when asked for as outputs.
+
+Division by zero gives 0.0, as with a flat window in corr_values.
+
+"""
+
+import math
+import operator
+import itertools
+
+from rolling import rolling_stat, RollingVar, _checkperiod
+
+
+MOMENTS = ('sma', 'var', 'varp', 'std', 'stdp')
+STATS = ('sum', 'ema', 'wwma', 'psa', 'max', 'min')
+
+
+def _div(left, right):
+    if not right:
+        return 0.0
+
+    return left / right
+
+
+_OPERATORS = {'add': operator.add, 'sub': operator.sub,
+              'mul': operator.mul, 'div': _div}
+
+
+def _asexpr(value):
+    if isinstance(value, Expr):
+        return value
+
+    return Expr('const', (value,))
+
+
+class Expr(object):
+    """Node of a lazy expression.
+
+    Built with series(), the stat methods and the operators +, -, * and
+    /; never computed until passed to evaluate() or stream().
+
+    Examples:
+    >>> x = series('x')
+    >>> zscore = (x - x.sma(3)) / x.std(3)
+    >>> results = evaluate(zscore, x=[34, 30, 29, 34, 38, 25, 35])
+    >>> ["%.2f" % z for z in results]
+    ['0.00', '-0.71', '-0.76', '1.13', '0.96', '-1.10', '0.34']
+    """
+
+    def __init__(self, kind, args):
+        self.kind = kind
+        self.args = args
+
+        keys = []
+        for arg in args:
+            if isinstance(arg, Expr):
+                keys.append(arg.key)
+            else:
+                keys.append(arg)
+
+        self.key = (kind,) + tuple(keys)
+
+    def __repr__(self):
+        return "Expr%r" % (self.key,)
+
+    def _stat(self, name, period=None, smoothing=None):
+        period = _checkperiod(period)
+
+        if name in MOMENTS:
+            moments = Expr('moments', (self, period))
+            return Expr('moment', (name, moments))
+
+        rolling_stat(name, period, smoothing)
+
+        return Expr('stat', (name, self, period, smoothing))
+
+    def sum(self, period=None):
+        """Returns expression of the running sums."""
+        return self._stat('sum', period)
+
+    def sma(self, period=None):
+        """Returns expression of the running simple moving averages."""
+        return self._stat('sma', period)
+
+    def ema(self, period=None, smoothing=None):
+        """Returns expression of the running exponential moving averages."""
+        return self._stat('ema', period, smoothing)
+
+    def wwma(self, period=None):
+        """Returns expression of the running Welles Wilder averages."""
+        return self._stat('wwma', period)
+
+    def psa(self, period=None):
+        """Returns expression of the running power sum averages."""
+        return self._stat('psa', period)
+
+    def var(self, period=None):
+        """Returns expression of the running sample variances."""
+        return self._stat('var', period)
+
+    def varp(self, period=None):
+        """Returns expression of the running population variances."""
+        return self._stat('varp', period)
+
+    def std(self, period=None):
+        """Returns expression of the running sample standard deviations."""
+        return self._stat('std', period)
+
+    def stdp(self, period=None):
+        """Returns expression of the running population std deviations."""
+        return self._stat('stdp', period)
+
+    def max(self, period=None):
+        """Returns expression of the running maximums."""
+        return self._stat('max', period)
+
+    def min(self, period=None):
+        """Returns expression of the running minimums."""
+        return self._stat('min', period)
+
+    def _op(self, name, left, right):
+        return Expr('op', (name, _asexpr(left), _asexpr(right)))
+
+    def __add__(self, other):
+        return self._op('add', self, other)
+
+    def __radd__(self, other):
+        return self._op('add', other, self)
+
+    def __sub__(self, other):
+        return self._op('sub', self, other)
+
+    def __rsub__(self, other):
+        return self._op('sub', other, self)
+
+    def __mul__(self, other):
+        return self._op('mul', self, other)
+
+    def __rmul__(self, other):
+        return self._op('mul', other, self)
+
+    def __truediv__(self, other):
+        return self._op('div', self, other)
+
+    def __rtruediv__(self, other):
+        return self._op('div', other, self)
+
+    __div__ = __truediv__
+    __rdiv__ = __rtruediv__
+
+    def __neg__(self):
+        return self._op('sub', 0.0, self)
+
+
+def series(name):
+    """Returns expression of the input series name.
+
+    :param name: keyword the values are passed under to evaluate().
+    """
+    return Expr('series', (name,))
+
+
+def _moment(name, stat):
+    """Returns the moment name of a RollingVar after a push."""
+    if name == 'sma':
+        return stat.mean
+
+    if name == 'var':
+        return stat.value
+
+    if name == 'std':
+        return math.sqrt(stat.value)
+
+    size = float(stat.count)
+    if stat.period and (stat.count > stat.period):
+        size = float(stat.period)
+
+    lastval = 0.0
+    if (stat.count > 1) and (stat.devsq > 0.0):
+        lastval = stat.devsq / size
+
+    if name == 'stdp':
+        return math.sqrt(lastval)
+
+    return lastval
+
+
+class _Plan(object):
+    """Deduplicated, topologically ordered steps of expressions."""
+
+    def __init__(self, exprs, names):
+        self.names = names
+        self.slots = {}
+        self.steps = []
+        self.outputs = [self._add(expr) for expr in exprs]
+
+    def _add(self, expr):
+        slot = self.slots.get(expr.key)
+        if slot is not None:
+            return slot
+
+        kind = expr.kind
+        args = expr.args
+
+        if kind == 'series':
+            if args[0] not in self.names:
+                msg = "missing input series: "
+                msg = ''.join((msg, str(args[0])))
+                raise ValueError(msg)
+
+            step = (kind, self.names.index(args[0]))
+
+        elif kind == 'const':
+            step = (kind, args[0])
+
+        elif kind == 'stat':
+            name, child, period, smoothing = args
+            step = (kind, self._add(child), (name, period, smoothing))
+
+        elif kind == 'moments':
+            child, period = args
+            step = (kind, self._add(child), period)
+
+        elif kind == 'moment':
+            name, moments = args
+            step = (kind, self._add(moments), name)
+
+        else:
+            name, left, right = args
+            step = (kind, self._add(left), self._add(right), name)
+
+        slot = len(self.steps)
+        self.steps.append(step)
+        self.slots[expr.key] = slot
+
+        return slot
+
+    def run(self, rows):
+        """Yields list of the output values of each row of inputs."""
+        compiled = []
+        for step in self.steps:
+            kind = step[0]
+            if kind == 'stat':
+                name, period, smoothing = step[2]
+                stat = rolling_stat(name, period, smoothing)
+                compiled.append((kind, step[1], stat.push))
+
+            elif kind == 'moments':
+                stat = RollingVar(step[2])
+                compiled.append((kind, step[1], stat))
+
+            elif kind == 'op':
+                compiled.append((kind, step[1], step[2],
+                                 _OPERATORS[step[3]]))
+
+            else:
+                compiled.append(step)
+
+        current = [None] * len(compiled)
+        outputs = self.outputs
+
+        for row in rows:
+            for slot, step in enumerate(compiled):
+                kind = step[0]
+                if kind == 'series':
+                    current[slot] = row[step[1]]
+
+                elif kind == 'const':
+                    current[slot] = step[1]
+
+                elif kind == 'stat':
+                    current[slot] = step[2](current[step[1]])
+
+                elif kind == 'moments':
+                    step[2].push(current[step[1]])
+                    current[slot] = step[2]
+
+                elif kind == 'moment':
+                    current[slot] = _moment(step[2], current[step[1]])
+
+                else:
+                    current[slot] = step[3](current[step[1]],
+                                            current[step[2]])
+
+            yield [current[slot] for slot in outputs]
+
+
+def _prepare(exprs, inputs):
+    single = isinstance(exprs, Expr)
+    if single:
+        exprs = [exprs]
+
+    names = sorted(inputs)
+    plan = _Plan([_asexpr(expr) for expr in exprs], names)
+    columns = [inputs[name] for name in names]
+
+    sizes = set()
+    for column in columns:
+        if hasattr(column, '__len__'):
+            sizes.add(len(column))
+
+    if len(sizes) > 1:
+        raise ValueError("inputs must be the same length")
+
+    return single, plan, _rows(columns)
+
+
+def _rows(columns):
+    """Yields the rows of columns, raising ValueError if one runs out
+    before the others."""
+    missing = object()
+    for row in itertools.zip_longest(*columns, fillvalue=missing):
+        if missing in row:
+            raise ValueError("inputs must be the same length")
+
+        yield row
+
+
+def stream(exprs, **inputs):
+    """Yields the values of expressions bar by bar in one fused pass.
+
+    :param exprs: expression, or list of expressions.
+    :param inputs: iterable of values for each series name, all of the
+        same length.
+    :rtype: generator of values, or of lists of values for a list of
+        expressions.
+
+    Examples:
+    >>> x = series('x')
+    >>> list(stream([x.max(3), x.max(3) - x.min(3)], x=[34, 30, 29, 34]))
+    [[34, 0], [34, 4], [34, 5], [34, 5]]
+    """
+    single, plan, rows = _prepare(exprs, inputs)
+
+    for values in plan.run(rows):
+        if single:
+            yield values[0]
+        else:
+            yield values
+
+
+def evaluate(exprs, **inputs):
+    """Returns the values of expressions computed in one fused pass.
+
+    :param exprs: expression, or list of expressions.
+    :param inputs: list of values for each series name, all of the same
+        length.
+    :rtype: list of values, or list of lists of values, one per
+        expression, for a list of expressions.
+
+    Examples:
+    >>> x = series('x')
+    >>> evaluate([x.sum(2), 2 * x], x=[34, 30, 29])
+    [[34, 64, 59], [68, 60, 58]]
+    """
+    single, plan, rows = _prepare(exprs, inputs)
+
+    results = [[] for slot in plan.outputs]
+    appends = [result.append for result in results]
+    for values in plan.run(rows):
+        for append, value in zip(appends, values):
+            append(value)
+
+    if single:
+        return results[0]
+
+    return results
+
+
+def _testit(verbose=None):
+    import doctest
+    doctest.testmod(verbose=verbose)
+
+if __name__ == "__main__":
+    _testit()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Rolling covariance and correlation matrices of a universe of series.
+
+RollingCorrMatrix keeps the window means and the matrix of co-moments,
+the sums of products of deviations from the means, of N series.  Each
+bar adjusts them for the row of values entering and the row leaving the
+window with the same Welford co-moment update as corr_values, a rank-2
+change costing O(N^2) instead of O(N^2 * w) for rescanning every pair.
+Every REANCHOR * period rows both are recomputed from the window, as
+corr_values does, so rounding error does not build up on long series.
+
+NumPy is used when installed; otherwise the matrices are lists of lists
+updated in pure Python.
+
+"""
+
+import array
+import collections
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from rolling import _Rolling, REANCHOR
+
+
+HAS_NUMPY = np is not None
+
+
+class RollingCorrMatrix(_Rolling):
+    """Running correlation matrix of size series.
+
+    push() takes one row holding the next value of every series and
+    returns the updated correlation matrix, an ndarray when NumPy is
+    installed or else a list of lists.  Entries of a flat series are 0.0,
+    as from corr_values.
+
+    :param size: # of series.
+    :param period: (optional) # of rows included in computation.
+        * None - includes all rows in computation.
+
+    Examples:
+    >>> stat = RollingCorrMatrix(2, 3)
+    >>> rows = zip([34, 30, 29, 34, 38], [21, 25, 32, 55, 22])
+    >>> matrix = stat.extend(rows)[-1]
+    >>> ["%.2f" % x for x in matrix[0]]
+    ['1.00', '-0.23']
+    """
+
+    def __init__(self, size, period=None):
+        _Rolling.__init__(self, period)
+
+        if size < 1:
+            raise ValueError("size must be 1 or greater")
+
+        self.size = int(size)
+        self._window = collections.deque(maxlen=self.period)
+
+        if HAS_NUMPY:
+            self._mean = np.zeros(self.size)
+            self._codev = np.zeros((self.size, self.size))
+        else:
+            self._mean = [0.0] * self.size
+            self._codev = [[0.0] * self.size for idx in range(self.size)]
+
+    def push(self, row):
+        if len(row) != self.size:
+            msg = "row must hold a value for each of the %d series"
+            raise ValueError(msg % self.size)
+
+        if HAS_NUMPY:
+            row = np.array(row, dtype=np.float64)
+        else:
+            row = [float(newx) for newx in row]
+
+        bar = self.count
+        period = self.period
+
+        if (not period) or (bar < period):
+            self._grow(row, bar + 1.0)
+        else:
+            self._slide(row, self._window[0], float(period))
+
+        if period:
+            self._window.append(row)
+
+            if (bar >= period) and not (bar % (period * REANCHOR)):
+                self._anchor()
+
+        self.count = bar + 1
+        self.value = self._corr()
+
+        return self.value
+
+    def covariance(self, population=False):
+        """Returns the covariance matrix of the current window.
+
+        :param population:
+            * True - entire population, n.
+            * False - sample set, n - 1 (default).
+        """
+        n = float(self.count)
+        if self.period:
+            n = float(min(self.count, self.period))
+
+        if not population:
+            n -= 1.0
+
+        if HAS_NUMPY:
+            if n <= 0.0:
+                return np.zeros((self.size, self.size))
+
+            return self._codev / n
+
+        if n <= 0.0:
+            return [[0.0] * self.size for idx in range(self.size)]
+
+        return [[codev / n for codev in line] for line in self._codev]
+
+    def stream(self, rows, path):
+        """Pushes every row and writes each matrix to a float64 file.
+
+        The matrices are written one after another in row-major order,
+        size * size values each, and can be read back with
+        mmapio.read_series.
+
+        :param rows: iterable of rows.
+        :param path: path of the output series.
+        :rtype: # of matrices written.
+        """
+        _push = self.push
+        count = 0
+
+        outfile = open(path, 'wb')
+        try:
+            for row in rows:
+                matrix = _push(row)
+
+                if HAS_NUMPY:
+                    matrix.tofile(outfile)
+                else:
+                    for line in matrix:
+                        array.array('d', line).tofile(outfile)
+
+                count += 1
+        finally:
+            outfile.close()
+
+        return count
+
+    def _grow(self, row, size):
+        mean = self._mean
+        codev = self._codev
+
+        if HAS_NUMPY:
+            delta = row - mean
+            mean += delta / size
+            codev += np.outer(delta, row - mean)
+            return
+
+        delta = [newx - oldmean for newx, oldmean in zip(row, mean)]
+        for idx in range(self.size):
+            mean[idx] += delta[idx] / size
+
+        after = [newx - newmean for newx, newmean in zip(row, mean)]
+        for idx, line in enumerate(codev):
+            deltax = delta[idx]
+            for jdx in range(self.size):
+                line[jdx] += deltax * after[jdx]
+
+    def _slide(self, row, oldrow, size):
+        mean = self._mean
+        codev = self._codev
+
+        if HAS_NUMPY:
+            newdev = row - mean
+            olddev = oldrow - mean
+            mean += (row - oldrow) / size
+            codev += np.outer(newdev, row - mean)
+            codev -= np.outer(olddev, oldrow - mean)
+            return
+
+        newdev = [newx - oldmean for newx, oldmean in zip(row, mean)]
+        olddev = [oldx - oldmean for oldx, oldmean in zip(oldrow, mean)]
+        for idx in range(self.size):
+            mean[idx] += (row[idx] - oldrow[idx]) / size
+
+        newafter = [newx - newmean for newx, newmean in zip(row, mean)]
+        oldafter = [oldx - newmean for oldx, newmean in zip(oldrow, mean)]
+        for idx, line in enumerate(codev):
+            newx = newdev[idx]
+            oldx = olddev[idx]
+            for jdx in range(self.size):
+                line[jdx] += newx * newafter[jdx] - oldx * oldafter[jdx]
+
+    def _anchor(self):
+        size = len(self._window)
+        columns = [list(column) for column in zip(*self._window)]
+        mean = [math.fsum(column) / size for column in columns]
+        devs = [[x - colmean for x in column]
+                for column, colmean in zip(columns, mean)]
+
+        codev = [[0.0] * self.size for idx in range(self.size)]
+        for idx in range(self.size):
+            for jdx in range(idx, self.size):
+                value = math.fsum([devx * devy for devx, devy in
+                                   zip(devs[idx], devs[jdx])])
+                codev[idx][jdx] = value
+                codev[jdx][idx] = value
+
+        self._mean[:] = mean
+        if HAS_NUMPY:
+            self._codev[:] = codev
+        else:
+            self._codev = codev
+
+    def _corr(self):
+        codev = self._codev
+
+        if HAS_NUMPY:
+            devsq = np.diagonal(codev).copy()
+            devsq[devsq < 0.0] = 0.0
+            scale = np.sqrt(np.outer(devsq, devsq))
+            matrix = np.zeros((self.size, self.size))
+            np.divide(codev, scale, out=matrix, where=scale > 0.0)
+            np.clip(matrix, -1.0, 1.0, out=matrix)
+            if self.count < 2:
+                matrix[:] = 0.0
+
+            return matrix
+
+        devsq = [max(codev[idx][idx], 0.0) for idx in range(self.size)]
+        matrix = []
+        for idx, line in enumerate(codev):
+            results = []
+            for jdx, value in enumerate(line):
+                scale = math.sqrt(devsq[idx] * devsq[jdx])
+                if (self.count < 2) or (scale <= 0.0):
+                    results.append(0.0)
+                else:
+                    results.append(max(-1.0, min(1.0, value / scale)))
+
+            matrix.append(results)
+
+        return matrix
+
+
+def corr_matrix_values(universe, period=None):
+    """Returns list of running correlation matrices of a universe.
+
+    :param universe: list of series, each a list of values of the same
+        length.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: list of correlation matrices, see RollingCorrMatrix.
+
+    Examples:
+    >>> universe = [[34, 30, 29, 34, 38], [21, 25, 32, 55, 22]]
+    >>> results = corr_matrix_values(universe, 3)
+    >>> ["%.2f" % x for x in results[-1][1]]
+    ['-0.23', '1.00']
+    """
+    if len(set(len(series) for series in universe)) > 1:
+        raise ValueError("series must be the same length")
+
+    stat = RollingCorrMatrix(len(universe), period)
+
+    return stat.extend(zip(*universe))
+
+
+def _testit(verbose=None):
+    import doctest
+    doctest.testmod(verbose=verbose)
+
+if __name__ == "__main__":
+    _testit()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Out-of-core computation over memory-mapped binary series files.
+
+Series files are flat arrays of native byte order float64 values.  The
+input is memory-mapped and read a chunk at a time; each stat keeps its
+window in a Rolling object between chunks and writes to its own
+memory-mapped output file, so memory use is bounded by the chunk size
+and the period rather than the length of the series.
+
+"""
+
+import os
+import mmap
+import array
+
+from rolling import rolling_stat
+
+
+ITEMSIZE = 8
+DEFAULT_CHUNKSIZE = 1 << 20
+
+
+def compute_file(inpath, outputs, period=None, smoothing=None,
+                 chunksize=DEFAULT_CHUNKSIZE):
+    """Computes running stats of a series file into series files.
+
+    :param inpath: path of the float64 input series.
+    :param outputs: dict of stat name to output path.
+        * stat names are those of describe_values: sum, sma, ema, wwma,
+          psa, varp, var, stdp, std, max and min.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param smoothing: (optional) ema smoothing factor.
+    :param chunksize: (optional) # of values read per chunk.
+    :rtype: # of values processed.
+
+    Examples:
+    >>> import tempfile
+    >>> tmpdir = tempfile.mkdtemp()
+    >>> inpath = os.path.join(tmpdir, 'closes.f8')
+    >>> outpath = os.path.join(tmpdir, 'sums.f8')
+    >>> write_series(inpath, [34, 30, 29, 34, 38, 25, 35])
+    7
+    >>> compute_file(inpath, {'sum': outpath}, 3)
+    7
+    >>> read_series(outpath).tolist()
+    [34.0, 64.0, 93.0, 93.0, 101.0, 97.0, 98.0]
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be 1 or greater")
+
+    stats = [(rolling_stat(name, period, smoothing), path)
+             for name, path in outputs.items()]
+
+    insize = os.path.getsize(inpath)
+    if insize % ITEMSIZE:
+        raise ValueError("input size is not a multiple of 8 bytes")
+
+    maxbar = insize // ITEMSIZE
+
+    if not maxbar:
+        for stat, path in stats:
+            open(path, 'wb').close()
+
+        return 0
+
+    with open(inpath, 'rb') as infile:
+        inmap = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            _compute_maps(inmap, stats, insize, chunksize)
+
+        finally:
+            inmap.close()
+
+    return maxbar
+
+
+def _compute_maps(inmap, stats, insize, chunksize):
+    """Opens and maps every output file, then fills them from inmap."""
+    outfiles = []
+    outmaps = []
+
+    try:
+        for stat, path in stats:
+            outfile = open(path, 'w+b')
+            outfiles.append(outfile)
+            outfile.truncate(insize)
+            outmaps.append(mmap.mmap(outfile.fileno(), insize))
+
+        _fill(inmap, [stat.push for stat, path in stats], outmaps,
+              chunksize)
+
+    finally:
+        try:
+            for outmap in outmaps:
+                outmap.flush()
+                outmap.close()
+
+        finally:
+            for outfile in outfiles:
+                outfile.close()
+
+
+def _fill(inmap, pushes, outmaps, chunksize):
+    """Writes each push applied to the values of inmap to its outmap.
+
+    Every memoryview is released before returning, even on error, so
+    the maps can be closed without a BufferError hiding the exception.
+    """
+    views = []
+
+    try:
+        inview = memoryview(inmap).cast('d')
+        views.append(inview)
+
+        writers = []
+        for _push, outmap in zip(pushes, outmaps):
+            outview = memoryview(outmap).cast('d')
+            views.append(outview)
+            writers.append((_push, outview))
+
+        maxbar = len(inview)
+        for beg in range(0, maxbar, chunksize):
+            end = min(beg + chunksize, maxbar)
+
+            with inview[beg:end] as chunk:
+                for _push, outview in writers:
+                    outview[beg:end] = array.array('d', map(_push, chunk))
+
+    finally:
+        for view in views:
+            view.release()
+
+
+def write_series(path, values):
+    """Writes values to path as a float64 series file.
+
+    :param path: path of the output series.
+    :param values: iterable of values.
+    :rtype: # of values written.
+    """
+    data = array.array('d', values)
+
+    outfile = open(path, 'wb')
+    try:
+        data.tofile(outfile)
+    finally:
+        outfile.close()
+
+    return len(data)
+
+
+def read_series(path):
+    """Returns array('d') of the values in a float64 series file.
+
+    :param path: path of the input series.
+    :rtype: array('d') of values.
+    """
+    data = array.array('d')
+
+    infile = open(path, 'rb')
+    try:
+        data.frombytes(infile.read())
+    finally:
+        infile.close()
+
+    return data
+
+
+def _testit(verbose=None):
+    import doctest
+    doctest.testmod(verbose=verbose)
+
+if __name__ == "__main__":
+    _testit()
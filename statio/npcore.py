@@ -0,0 +1,861 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+NumPy backed versions of the core _values functions.
+
+The functions share the names, parameters and results of their core
+counterparts but accept array-likes and return float64 ndarrays.  Windows
+are built from cumulative sums, variances and maximums and minimums use
+block prefix and suffix scans, and the ema/wwma recurrences are solved a
+block at a time.
+
+The _sweep functions compute one stat for many periods of the same
+series from shared cumulative sums.  The _batch functions run one of them
+over many series at once, one series per column, instead of once per
+series.
+
+When NumPy is not installed every function falls back to the pure Python
+version in core and returns a list.
+
+"""
+
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import core
+
+
+HAS_NUMPY = np is not None
+
+
+def _period(period):
+    """Returns validated int period or None."""
+    if period:
+        if period < 1:
+            raise ValueError("period must be 1 or greater")
+
+        return int(period)
+
+    return None
+
+
+def _asarray(values):
+    """Returns values as a float64 array with time on axis 0."""
+    if values is None:
+        raise TypeError("values must be an array-like, not None")
+
+    return np.asarray(values, dtype=np.float64)
+
+
+def _counts(x, period):
+    """Returns # of values in each window shaped to broadcast against x."""
+    counts = np.arange(1, x.shape[0] + 1, dtype=np.float64)
+    if period:
+        np.minimum(counts, period, out=counts)
+
+    return counts.reshape((-1,) + (1,) * (x.ndim - 1))
+
+
+def _window_sums(x, period):
+    """Returns running sums of x over windows of period rows."""
+    totals = np.cumsum(x, axis=0)
+    if (not period) or (x.shape[0] <= period):
+        return totals
+
+    sums = totals.copy()
+    sums[period:] -= totals[:-period]
+
+    return sums
+
+
+def _shifted(x):
+    """Returns x less its first row and the first row.
+
+    Centering first keeps the cumulative sums small on price-level data.
+    The first row is used rather than the mean so the shift of a column
+    only depends on its own leading values, never on the padding after a
+    short series in a batch.
+    """
+    if not x.shape[0]:
+        return x, np.zeros(x.shape[1:])
+
+    shift = x[0].copy()
+
+    return x - shift, shift
+
+
+def _smooth(x, out, lastval, alpha):
+    """Writes y[t] = lastval + alpha * (x[t] - lastval) for every row of x.
+
+    The recurrence is solved in closed form one block at a time, sizing the
+    blocks so the decay powers stay well inside the float64 range.
+    """
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[:] = x
+        return
+
+    if decay >= 1.0:
+        out[:] = lastval
+        return
+
+    block = max(1, int(100.0 * math.log(10.0) / -math.log(decay)))
+    block = min(block, x.shape[0])
+
+    shape = (-1,) + (1,) * (x.ndim - 1)
+    steps = np.arange(block, dtype=np.float64)
+    growth = (decay ** -steps).reshape(shape)
+    damping = (decay ** steps).reshape(shape)
+
+    for beg in range(0, x.shape[0], block):
+        end = min(beg + block, x.shape[0])
+        size = end - beg
+
+        sums = np.cumsum(x[beg:end] * growth[:size], axis=0)
+        out[beg:end] = damping[:size] * (decay * lastval + alpha * sums)
+
+        lastval = out[end - 1]
+
+
+def sum_values(values, period=None):
+    """Returns array of running sums.
+
+    :param values: array-like of values to iterate.
+    :param period: (optional) # of values to include in computation.
+        * None - includes all values in computation.
+    :rtype: ndarray of summed values.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> sum_values(values, 3).tolist()  #using 3 period window.
+    [34.0, 64.0, 93.0, 93.0, 101.0, 97.0, 98.0]
+    """
+    if np is None:
+        return core.sum_values(values, period)
+
+    period = _period(period)
+    x, shift = _shifted(_asarray(values))
+
+    return _window_sums(x, period) + _counts(x, period) * shift
+
+
+def sma_values(values, period=None):
+    """Returns array of running simple moving averages.
+
+    :param values: array-like of values to iterate and compute stats.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: ndarray of simple moving averages.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = sma_values(values, 3)  #using 3 period window.
+    >>> ["%.2f" % x for x in results]
+    ['34.00', '32.00', '31.00', '31.00', '33.67', '32.33', '32.67']
+    """
+    if np is None:
+        return core.sma_values(values, period)
+
+    period = _period(period)
+    x, shift = _shifted(_asarray(values))
+
+    return _window_sums(x, period) / _counts(x, period) + shift
+
+
+def psa_values(values, period=None):
+    """Returns array of running Power Sum averages.
+
+    :param values: array-like of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: ndarray of windowed Power Sum averages.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = psa_values(values, 3)  #using 3 period window.
+    >>> ["%.2f" % x for x in results]
+    ['1156.00', '1028.00', '965.67', '965.67', '1147.00', '1075.00', '1098.00']
+    """
+    if np is None:
+        return core.psa_values(values, period)
+
+    period = _period(period)
+    x = _asarray(values)
+
+    return _window_sums(x * x, period) / _counts(x, period)
+
+
+def ema_values(values, period=None, smoothing=None):
+    """Returns array of running exponential moving averages.
+
+    :param values: array-like of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param smoothing: (optional) smoothing factor.
+        * valid values: between 0 - 1.
+        * None - (default) use formula = 2.0 / (period + 1.0).
+    :rtype: ndarray of windowed exponential moving averages.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = ema_values(values, 3)  #using 3 period window.
+    >>> ["%.3f" % x for x in results]
+    ['34.000', '32.000', '31.000', '32.500', '35.250', '30.125', '32.562']
+    """
+    if np is None:
+        return core.ema_values(values, period, smoothing)
+
+    if period:
+        if period < 1:
+            raise ValueError("period must be 1 or greater")
+
+        if smoothing == None:
+            smoothing = 2.0 / (period + 1.0)
+
+        elif (smoothing < 0) or (smoothing > 1):
+            msg = "smoothing outside of 0 to 1 range: "
+            msg = ''.join((msg, str(smoothing)))
+            raise ValueError(msg)
+
+    return _emabases(values, _period(period), smoothing)
+
+
+def wwma_values(values, period=None):
+    """Returns array of running Welles Wilder moving averages.
+
+    :param values: array-like of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: ndarray of windowed Welles Wilder moving averages.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = wwma_values(values, 3)  #using 3 period window.
+    >>> ["%.2f" % x for x in results]
+    ['34.00', '32.00', '31.00', '32.00', '34.00', '31.00', '32.33']
+    """
+    if np is None:
+        return core.wwma_values(values, period)
+
+    period = _period(period)
+    smoothing = None
+    if period:
+        smoothing = 1.0 / period
+
+    return _emabases(values, period, smoothing)
+
+
+def _emabases(values, period, smoothing):
+    """Returns array of exponentially smoothed averages.
+
+    The first period values are a cumulative average, the rest follow the
+    recurrence y[t] = y[t-1] + smoothing * (x[t] - y[t-1]).
+    """
+    x = _asarray(values)
+    results = np.empty_like(x)
+
+    warmup = x.shape[0]
+    if period:
+        warmup = min(period, warmup)
+
+    head, shift = _shifted(x[:warmup])
+    results[:warmup] = np.cumsum(head, axis=0) / _counts(head, None) + shift
+
+    if warmup < x.shape[0]:
+        _smooth(x[warmup:], results[warmup:], results[warmup - 1], smoothing)
+
+    return results
+
+
+def _blockdevsqs(x, period):
+    """Returns (sizes, devsqs) of the windows of period rows of x.
+
+    x is cut into blocks of period rows, each less its own first row, so
+    no sum runs past one block and the sums stay small whatever the
+    length of the series.  The window ending in row r of block k is the
+    head of block k, rows 0 to r, from a prefix scan, and the tail of
+    block k - 1, rows r + 1 to period - 1, from a suffix scan; the squared
+    deviations of both parts are merged with the pairwise update of Chan
+    et al.  sizes broadcasts against devsqs, both shaped (blocks, period,
+    ...), except for the first block which has no tail.
+    """
+    maxbar = x.shape[0]
+    nblocks = -(-maxbar // period)
+
+    blocks = np.zeros((nblocks * period,) + x.shape[1:])
+    blocks[:maxbar] = x
+    blocks = blocks.reshape((nblocks, period) + x.shape[1:])
+
+    shifts = blocks[:, :1].copy()
+    blocks -= shifts
+
+    shape = (1, period) + (1,) * (x.ndim - 1)
+    headsize = np.arange(1, period + 1, dtype=np.float64).reshape(shape)
+    tailsize = period - headsize
+
+    headsum = np.cumsum(blocks, axis=1)
+    tailsum = np.zeros(blocks.shape)
+    tailsum[1:, :-1] = np.cumsum(blocks[:-1, :0:-1], axis=1)[:, ::-1]
+
+    blocks *= blocks
+    headsq = np.cumsum(blocks, axis=1)
+    tailsq = np.zeros(blocks.shape)
+    tailsq[1:, :-1] = np.cumsum(blocks[:-1, :0:-1], axis=1)[:, ::-1]
+    del blocks
+
+    headsum /= headsize
+    headsq -= headsum * headsum * headsize
+
+    tailsum /= np.maximum(tailsize, 1.0)
+    tailsq -= tailsum * tailsum * tailsize
+
+    # means of the tails relative to the shift of their own block
+    tailsum[1:] += shifts[:-1] - shifts[1:]
+    tailsum -= headsum
+    tailsum *= tailsum
+    tailsum *= headsize * tailsize / period
+
+    devsqs = headsq
+    devsqs[1:] += tailsq[1:] + tailsum[1:]
+    np.maximum(devsqs, 0.0, out=devsqs)
+
+    return headsize, devsqs
+
+
+def _varbases(values, period=None, population=False):
+    """
+    Returns array of running variances.
+
+    The squared deviations of each window are taken over at most two
+    blocks of period rows, each re-centered on its own first value, so
+    the precision does not degrade with the length of the series, see
+    _blockdevsqs.
+
+    :param values: array-like of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param population:
+        * True - entire population, n.
+        * False - sample set, n - 1 (default).
+
+    Examples:
+    >>> values = [32.47, 32.70, 32.77, 33.11, 33.25, 33.23, 33.23]
+    >>> results = _varbases(values, 3, population=True)
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '0.01', '0.02', '0.03', '0.04', '0.00', '0.00']
+    """
+    period = _period(period)
+    x = _asarray(values)
+
+    maxbar = x.shape[0]
+    if not maxbar:
+        return np.zeros(x.shape)
+
+    if (not period) or (period > maxbar):
+        period = maxbar
+
+    headsize, devsqs = _blockdevsqs(x, period)
+
+    sample_adjust = 0.0
+    if not population:
+        sample_adjust = 1.0
+
+    first = np.maximum(headsize[0] - sample_adjust, 1.0)
+    devsqs[0] /= first
+    devsqs[1:] /= max(period - sample_adjust, 1.0)
+
+    results = devsqs.reshape((-1,) + x.shape[1:])[:maxbar]
+    results[:1] = 0.0
+
+    return results
+
+
+def varp_values(values, period=None):
+    """Returns array of running population variances.
+
+    :param values: array-like of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: ndarray of windowed population variances.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = varp_values(values, 3)  #using 3 period window.
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '4.00', '4.67', '4.67', '13.56', '29.56', '30.89']
+    """
+    if np is None:
+        return core.varp_values(values, period)
+
+    return _varbases(values, period, population=True)
+
+
+def var_values(values, period=None):
+    """Returns array of running sample variances.
+
+    :param values: array-like of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: ndarray of windowed sample variances.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = var_values(values, 3)  #using 3 period window.
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '8.00', '7.00', '7.00', '20.33', '44.33', '46.33']
+    """
+    if np is None:
+        return core.var_values(values, period)
+
+    return _varbases(values, period)
+
+
+def stdp_values(values, period=None):
+    """Returns array of running population standard deviations.
+
+    :param values: array-like of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: ndarray of windowed population standard deviations.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = stdp_values(values, 3)  #using 3 period window.
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '2.00', '2.16', '2.16', '3.68', '5.44', '5.56']
+    """
+    if np is None:
+        return core.stdp_values(values, period)
+
+    return np.sqrt(_varbases(values, period, population=True))
+
+
+def std_values(values, period=None):
+    """Returns array of running sample standard deviations.
+
+    :param values: array-like of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: ndarray of windowed sample standard deviations.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = std_values(values, 3)  #using 3 period window.
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '2.83', '2.65', '2.65', '4.51', '6.66', '6.81']
+    """
+    if np is None:
+        return core.std_values(values, period)
+
+    return np.sqrt(_varbases(values, period))
+
+
+def _extremes(values, period=None, highest=True):
+    """
+    Returns array of running maximums or minimums.
+
+    Windows are answered with the van Herk/Gil-Werman scheme: prefix and
+    suffix scans over blocks of period rows, so the cost does not depend
+    on the window size.
+
+    :param values: array-like of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param highest:
+        * True - running maximums (default).
+        * False - running minimums.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> _extremes(values, 3, highest=False).tolist()
+    [34.0, 30.0, 29.0, 29.0, 29.0, 25.0, 25.0]
+    """
+    period = _period(period)
+    x = _asarray(values)
+
+    if highest:
+        _extreme = np.maximum
+        fill = -np.inf
+    else:
+        _extreme = np.minimum
+        fill = np.inf
+
+    maxbar = x.shape[0]
+    if (not period) or (period >= maxbar):
+        return _extreme.accumulate(x, axis=0)
+
+    if period == 1:
+        return x.copy()
+
+    nblocks = -(-maxbar // period)
+    padded = np.full((nblocks * period,) + x.shape[1:], fill)
+    padded[:maxbar] = x
+
+    blocks = padded.reshape((nblocks, period) + x.shape[1:])
+    prefix = _extreme.accumulate(blocks, axis=1).reshape(padded.shape)
+    suffix = _extreme.accumulate(blocks[:, ::-1], axis=1)[:, ::-1]
+    suffix = suffix.reshape(padded.shape)
+
+    results = np.empty_like(x)
+    results[:period - 1] = _extreme.accumulate(x[:period - 1], axis=0)
+    _extreme(suffix[:maxbar - period + 1], prefix[period - 1:maxbar],
+             out=results[period - 1:])
+
+    return results
+
+
+def max_values(values, period=None):
+    """Returns array of running maximums.
+
+    :param values: array-like of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: ndarray of windowed maximums.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> max_values(values, 3).tolist()  #using 3 period window.
+    [34.0, 34.0, 34.0, 34.0, 38.0, 38.0, 38.0]
+    """
+    if np is None:
+        return core.max_values(values, period)
+
+    return _extremes(values, period, highest=True)
+
+
+def min_values(values, period=None):
+    """Returns array of running minimums.
+
+    :param values: array-like of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: ndarray of windowed minimums.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> min_values(values, 3).tolist()  #using 3 period window.
+    [34.0, 30.0, 29.0, 29.0, 29.0, 25.0, 25.0]
+    """
+    if np is None:
+        return core.min_values(values, period)
+
+    return _extremes(values, period, highest=False)
+
+
+def top_values(values, period=None, num=1):
+    """Returns list of top num items.
+
+    The per bar results are ragged lists, so this always runs the core
+    version; arrays are converted to lists first.
+    """
+    if np is not None:
+        values = _asarray(values).tolist()
+
+    return core.top_values(values, period, num)
+
+
+def bottom_values(values, period=None, num=1):
+    """Returns list of bottom num items.
+
+    The per bar results are ragged lists, so this always runs the core
+    version; arrays are converted to lists first.
+    """
+    if np is not None:
+        values = _asarray(values).tolist()
+
+    return core.bottom_values(values, period, num)
+
+
+def _sweep(values, periods):
+    """Returns (x, periods, totals, shift) for the sweep functions.
+
+    x is values less their first value, totals are its cumulative sums and
+    shift is the first value to add back.
+    """
+    periods = core._sweepperiods(periods)
+    x, shift = _shifted(_asarray(values))
+
+    return x, periods, np.cumsum(x, axis=0), shift
+
+
+def sum_sweep(values, periods):
+    """Returns 2D array of running sums, one row per period.
+
+    :param values: array-like of values to iterate.
+    :param periods: iterable of periods, see sum_values.
+    :rtype: ndarray of shape (len(periods), len(values)).
+
+    Examples:
+    >>> results = sum_sweep([34, 30, 29, 34, 38, 25, 35], [2, 3])
+    >>> for row in results:
+    ...     print(row.tolist())
+    [34.0, 64.0, 59.0, 63.0, 72.0, 63.0, 60.0]
+    [34.0, 64.0, 93.0, 93.0, 101.0, 97.0, 98.0]
+    """
+    if np is None:
+        return core.sum_sweep(values, periods)
+
+    x, periods, totals, shift = _sweep(values, periods)
+
+    results = np.empty((len(periods),) + x.shape)
+    for row, period in zip(results, periods):
+        row[:] = totals
+        if period and (x.shape[0] > period):
+            row[period:] -= totals[:-period]
+
+        row += _counts(x, period) * shift
+
+    return results
+
+
+def sma_sweep(values, periods):
+    """Returns 2D array of running simple moving averages, one row per period.
+
+    :param values: array-like of values to iterate and compute stats.
+    :param periods: iterable of periods, see sma_values.
+    :rtype: ndarray of shape (len(periods), len(values)).
+
+    Examples:
+    >>> results = sma_sweep([34, 30, 29, 34, 38, 25, 35], [2, 3])
+    >>> ["%.2f" % x for x in results[1]]
+    ['34.00', '32.00', '31.00', '31.00', '33.67', '32.33', '32.67']
+    """
+    if np is None:
+        return core.sma_sweep(values, periods)
+
+    x, periods, totals, shift = _sweep(values, periods)
+
+    results = np.empty((len(periods),) + x.shape)
+    for row, period in zip(results, periods):
+        row[:] = totals
+        if period and (x.shape[0] > period):
+            row[period:] -= totals[:-period]
+
+        row /= _counts(x, period)
+        row += shift
+
+    return results
+
+
+def _emasweep(values, periods, smoothings):
+    """Returns 2D array of exponentially smoothed averages per period.
+
+    The cumulative average used while a window fills is computed once and
+    shared by every period.
+    """
+    x = _asarray(values)
+    maxbar = x.shape[0]
+
+    head, shift = _shifted(x)
+    means = np.cumsum(head, axis=0) / _counts(head, None) + shift
+
+    results = np.empty((len(periods),) + x.shape)
+    for row, period, smoothing in zip(results, periods, smoothings):
+        warmup = maxbar
+        if period:
+            warmup = min(period, maxbar)
+
+        row[:warmup] = means[:warmup]
+        if warmup < maxbar:
+            _smooth(x[warmup:], row[warmup:], row[warmup - 1], smoothing)
+
+    return results
+
+
+def ema_sweep(values, periods, smoothing=None):
+    """Returns 2D array of running exponential moving averages per period.
+
+    :param values: array-like of values to iterate and compute stat.
+    :param periods: iterable of periods, see ema_values.
+    :param smoothing: (optional) smoothing factor used for every period.
+        * None - (default) use formula = 2.0 / (period + 1.0).
+    :rtype: ndarray of shape (len(periods), len(values)).
+
+    Examples:
+    >>> results = ema_sweep([34, 30, 29, 34, 38, 25, 35], [2, 3])
+    >>> ["%.3f" % x for x in results[1]]
+    ['34.000', '32.000', '31.000', '32.500', '35.250', '30.125', '32.562']
+    """
+    if np is None:
+        return core.ema_sweep(values, periods, smoothing)
+
+    if smoothing != None:
+        if (smoothing < 0) or (smoothing > 1):
+            msg = "smoothing outside of 0 to 1 range: "
+            msg = ''.join((msg, str(smoothing)))
+            raise ValueError(msg)
+
+    periods = core._sweepperiods(periods)
+
+    smoothings = []
+    for period in periods:
+        if period and (smoothing == None):
+            smoothings.append(2.0 / (period + 1.0))
+
+        else:
+            smoothings.append(smoothing)
+
+    return _emasweep(values, periods, smoothings)
+
+
+def wwma_sweep(values, periods):
+    """Returns 2D array of running Welles Wilder moving averages per period.
+
+    :param values: array-like of values to iterate and compute stat.
+    :param periods: iterable of periods, see wwma_values.
+    :rtype: ndarray of shape (len(periods), len(values)).
+
+    Examples:
+    >>> results = wwma_sweep([34, 30, 29, 34, 38, 25, 35], [2, 3])
+    >>> ["%.2f" % x for x in results[1]]
+    ['34.00', '32.00', '31.00', '32.00', '34.00', '31.00', '32.33']
+    """
+    if np is None:
+        return core.wwma_sweep(values, periods)
+
+    periods = core._sweepperiods(periods)
+
+    smoothings = []
+    for period in periods:
+        smoothings.append(period and (1.0 / period))
+
+    return _emasweep(values, periods, smoothings)
+
+
+def _pack(series):
+    """Returns (matrix, lengths) with one series per column of matrix.
+
+    Ragged series are zero padded at the end.  Every stat only looks back
+    and centers each column on its own first value, so the padding never
+    reaches the results inside a series.
+    """
+    if isinstance(series, np.ndarray):
+        matrix = np.asarray(series, dtype=np.float64)
+        if matrix.ndim != 2:
+            raise ValueError("series array must be 2 dimensional")
+
+        return matrix.T, None
+
+    rows = [_asarray(row) for row in series]
+    lengths = [len(row) for row in rows]
+
+    maxbar = 0
+    if lengths:
+        maxbar = max(lengths)
+
+    matrix = np.zeros((maxbar, len(rows)))
+    for col, row in enumerate(rows):
+        matrix[:len(row), col] = row
+
+    return matrix, lengths
+
+
+def batch_values(func, series, *args):
+    """Returns func applied to every series in a single vectorized sweep.
+
+    :param func: npcore _values function, e.g. npcore.sma_values.
+    :param series: 2D array with one series per row, or list of series.
+        * lists may hold series of different lengths.
+    :param args: remaining arguments of func, e.g. period.
+    :rtype: 2D ndarray for 2D input, otherwise list of ndarrays.
+
+    Examples:
+    >>> results = batch_values(sma_values, [[34, 30, 29, 34], [21, 25]], 3)
+    >>> [["%.2f" % x for x in row] for row in results]
+    [['34.00', '32.00', '31.00', '31.00'], ['21.00', '23.00']]
+    """
+    if np is None:
+        return [func(row, *args) for row in series]
+
+    matrix, lengths = _pack(series)
+    results = func(matrix, *args)
+
+    if lengths is None:
+        return results.T
+
+    return [results[:size, col] for col, size in enumerate(lengths)]
+
+
+def sum_batch(series, period=None):
+    """Returns running sums of every series, see batch_values."""
+    return batch_values(sum_values, series, period)
+
+
+def sma_batch(series, period=None):
+    """Returns running simple moving averages of every series,
+    see batch_values.
+    """
+    return batch_values(sma_values, series, period)
+
+
+def ema_batch(series, period=None, smoothing=None):
+    """Returns running exponential moving averages of every series,
+    see batch_values.
+    """
+    return batch_values(ema_values, series, period, smoothing)
+
+
+def wwma_batch(series, period=None):
+    """Returns running Welles Wilder moving averages of every series,
+    see batch_values.
+    """
+    return batch_values(wwma_values, series, period)
+
+
+def psa_batch(series, period=None):
+    """Returns running Power Sum averages of every series, see batch_values."""
+    return batch_values(psa_values, series, period)
+
+
+def varp_batch(series, period=None):
+    """Returns running population variances of every series,
+    see batch_values.
+    """
+    return batch_values(varp_values, series, period)
+
+
+def var_batch(series, period=None):
+    """Returns running sample variances of every series, see batch_values."""
+    return batch_values(var_values, series, period)
+
+
+def stdp_batch(series, period=None):
+    """Returns running population standard deviations of every series,
+    see batch_values.
+    """
+    return batch_values(stdp_values, series, period)
+
+
+def std_batch(series, period=None):
+    """Returns running sample standard deviations of every series,
+    see batch_values.
+    """
+    return batch_values(std_values, series, period)
+
+
+def max_batch(series, period=None):
+    """Returns running maximums of every series, see batch_values."""
+    return batch_values(max_values, series, period)
+
+
+def min_batch(series, period=None):
+    """Returns running minimums of every series, see batch_values."""
+    return batch_values(min_values, series, period)
+
+
+def _testit(verbose=None):
+    import doctest
+    doctest.testmod(verbose=verbose)
+
+if __name__ == "__main__":
+    _testit()
@@ -0,0 +1,403 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Process pool execution of the core _values functions.
+
+The series of a universe are packed once into a shared memory block of
+float64 values and every worker writes its results straight into a second
+shared block, so no series is pickled on the way in or out.  Workers run
+the core function on memoryview slices of the blocks using its output=
+option.
+
+chunk_values splits one long series into chunks instead.  Windowed stats
+give each chunk a halo of the period - 1 preceding values; ema and wwma
+are linear recurrences, so each chunk first reduces its bars to a single
+affine map, the maps are scanned in order to find every chunk's starting
+average, and the chunks then finish in parallel.
+
+Requires multiprocessing.shared_memory (Python 3.8 or later).
+
+"""
+
+import array
+import multiprocessing
+from multiprocessing import shared_memory, resource_tracker, util
+
+import core
+from rolling import RollingEMA, RollingWWMA
+
+
+ITEMSIZE = 8
+
+FUNCTIONS = ('sum_values', 'sma_values', 'ema_values', 'wwma_values',
+             'psa_values', 'varp_values', 'var_values', 'stdp_values',
+             'std_values', 'max_values', 'min_values')
+
+RECURRENCES = {'ema_values': RollingEMA, 'wwma_values': RollingWWMA}
+
+_attached = {}
+_finalizer = None
+
+
+def _open(name):
+    """Returns the shared memory block name, not resource tracked.
+
+    The calling process creates and unlinks the blocks.  A worker that
+    registered them would either leave them in its resource tracker, to
+    be reported as leaked at exit, or, sharing the tracker of the calling
+    process, drop its registration when unregistering them.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    except TypeError:
+        pass
+
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+
+    finally:
+        resource_tracker.register = register
+
+
+def _attach(name):
+    """Returns float64 view of the shared memory block name.
+
+    Blocks stay attached for the life of the worker so a pool can serve
+    many tasks; the previous block is released when a new call starts,
+    and the last one when the worker exits.
+    """
+    if name in _attached:
+        return _attached[name][1]
+
+    global _finalizer
+    if _finalizer is None:
+        _finalizer = util.Finalize(None, _release, exitpriority=10)
+
+    block = _open(name)
+    _attached[name] = (block, block.buf.cast('d'))
+
+    return _attached[name][1]
+
+
+def _release(keep=()):
+    """Releases the attached blocks not named in keep."""
+    for name in list(_attached):
+        if name not in keep:
+            block, view = _attached.pop(name)
+            view.release()
+            block.close()
+
+
+def _run(task):
+    """Runs one (funcname, inname, outname, beg, end, period, args) task."""
+    funcname, inname, outname, beg, end, period, args = task
+
+    _release((inname, outname))
+    inview = _attach(inname)
+    outview = _attach(outname)
+
+    func = getattr(core, funcname)
+    func(inview[beg:end], period, *args, output=outview[beg:end])
+
+    return beg
+
+
+def _run_halo(task):
+    """Runs one chunk of a windowed function over its halo and chunk.
+
+    (funcname, inname, outname, halo, beg, end, period, args) task; the
+    results for the halo values are dropped.
+    """
+    funcname, inname, outname, halo, beg, end, period, args = task
+
+    _release((inname, outname))
+    inview = _attach(inname)
+    outview = _attach(outname)
+
+    results = array.array('d', bytes(ITEMSIZE * (end - halo)))
+    func = getattr(core, funcname)
+    func(inview[halo:end], period, *args, output=results)
+
+    outview[beg:end] = results[beg - halo:]
+
+    return beg
+
+
+def _stat(funcname, period, args, beg, lastval):
+    """Returns Rolling stat of funcname resumed at bar beg from lastval."""
+    stat = RECURRENCES[funcname](period, *args)
+    if beg:
+        stat.count = beg
+        stat.value = lastval
+
+    return stat
+
+
+def _scale(stat, beg, end):
+    """Returns the factor of the average before bar beg in the average at
+    bar end - 1 of the recurrence stat.
+
+    Warm-up bars scale the average by bar / (bar + 1), which telescopes
+    to beg / (last warm-up bar + 1); later bars by 1 - smoothing for ema
+    and (period - 1) / period for wwma.  The seed bar 0 drops it.
+    """
+    if not beg:
+        return 0.0
+
+    period = stat.period
+    warmend = end
+    if period:
+        warmend = min(end, period)
+
+    scale = 1.0
+    if beg < warmend:
+        scale = beg / float(warmend)
+
+    if period and (end > period):
+        if isinstance(stat, RollingEMA):
+            factor = 1.0 - stat.smoothing
+        else:
+            factor = (period - 1.0) / period
+
+        scale *= factor ** (end - max(beg, period))
+
+    return scale
+
+
+def _run_reduce(task):
+    """Returns (beg, scale, offset) of a recurrence chunk.
+
+    (funcname, inname, beg, end, period, args) task; scale and offset map
+    the average before the chunk to the average at its last bar.  The
+    offset is the chunk run from an average of 0.0 and the scale follows
+    from the recurrence, so each chunk is read once here.
+    """
+    funcname, inname, beg, end, period, args = task
+
+    _release((inname,))
+    inview = _attach(inname)
+
+    stat = _stat(funcname, period, args, beg, 0.0)
+    _push = stat.push
+    for newx in inview[beg:end]:
+        _push(newx)
+
+    return beg, _scale(stat, beg, end), stat.value
+
+
+def _run_resume(task):
+    """Runs one recurrence chunk from its starting average.
+
+    (funcname, inname, outname, beg, end, period, args, lastval) task.
+    """
+    funcname, inname, outname, beg, end, period, args, lastval = task
+
+    _release((inname, outname))
+    inview = _attach(inname)
+    outview = _attach(outname)
+
+    stat = _stat(funcname, period, args, beg, lastval)
+    outview[beg:end] = array.array('d', map(stat.push, inview[beg:end]))
+
+    return beg
+
+
+def _funcname(func):
+    """Returns the name of a core _values function taking output=."""
+    name = getattr(func, '__name__', func)
+    if name not in FUNCTIONS:
+        raise ValueError(''.join(("unsupported function: ", str(name))))
+
+    return name
+
+
+class _Blocks(object):
+    """Input and output shared memory blocks of size float64 values."""
+
+    def __init__(self, size):
+        nbytes = max(size, 1) * ITEMSIZE
+        self.inblock = shared_memory.SharedMemory(create=True, size=nbytes)
+        self.outblock = shared_memory.SharedMemory(create=True, size=nbytes)
+        self.inview = self.inblock.buf.cast('d')
+        self.outview = self.outblock.buf.cast('d')
+
+    def close(self):
+        self.inview.release()
+        self.outview.release()
+
+        for block in (self.inblock, self.outblock):
+            block.close()
+            block.unlink()
+
+
+def _execute(tasks, processes=None, pool=None, runner=_run):
+    """Returns list of runner results of tasks, in completion order.
+
+    Runs on pool, or on a new pool of processes workers.
+    """
+    if pool is not None:
+        return list(pool.imap_unordered(runner, tasks))
+
+    workers = multiprocessing.Pool(processes)
+    try:
+        return list(workers.imap_unordered(runner, tasks))
+
+    finally:
+        workers.close()
+        workers.join()
+
+
+def map_values(func, universe, period=None, args=(), processes=None,
+               pool=None):
+    """Returns func applied to every series of universe on a process pool.
+
+    :param func: core _values function taking output=, or its name.
+        * sum, sma, ema, wwma, psa, varp, var, stdp, std, max or min.
+    :param universe: list of series, each a list or buffer of values.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param args: (optional) tuple of extra arguments, e.g. ema smoothing.
+    :param processes: (optional) # of worker processes.
+        * None - one per CPU.
+    :param pool: (optional) multiprocessing.Pool to run on instead.
+    :rtype: list of array('d') results, one per series.
+
+    Examples:
+    >>> universe = [[34, 30, 29, 34, 38, 25, 35], [21, 25, 32, 55, 22]]
+    >>> results = map_values('max_values', universe, 3, processes=2)
+    >>> for row in results:
+    ...     print(row.tolist())
+    [34.0, 34.0, 34.0, 34.0, 38.0, 38.0, 38.0]
+    [21.0, 25.0, 32.0, 55.0, 55.0]
+    """
+    funcname = _funcname(func)
+
+    bounds = []
+    size = 0
+    for series in universe:
+        bounds.append((size, size + len(series)))
+        size += len(series)
+
+    blocks = _Blocks(size)
+    try:
+        for series, (beg, end) in zip(universe, bounds):
+            blocks.inview[beg:end] = array.array('d', series)
+
+        tasks = [(funcname, blocks.inblock.name, blocks.outblock.name,
+                  beg, end, period, tuple(args)) for beg, end in bounds]
+
+        _execute(tasks, processes, pool)
+
+        results = [array.array('d', blocks.outview[beg:end])
+                   for beg, end in bounds]
+
+    finally:
+        blocks.close()
+
+    return results
+
+
+def chunk_values(func, values, period=None, args=(), chunks=None,
+                 processes=None, pool=None):
+    """Returns func applied to one series split into chunks on a process pool.
+
+    :param func: core _values function taking output=, or its name.
+        * sum, sma, ema, wwma, psa, varp, var, stdp, std, max or min.
+    :param values: list or buffer of values.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation; windowed stats other
+          than ema and wwma then run as a single chunk.
+    :param args: (optional) tuple of extra arguments, e.g. ema smoothing.
+    :param chunks: (optional) # of chunks.
+        * None - one per worker process.
+    :param processes: (optional) # of worker processes.
+        * None - one per CPU.
+    :param pool: (optional) multiprocessing.Pool to run on instead.
+    :rtype: array('d') of results.
+
+    Results match func to within floating point rounding: chunks start
+    from their halo or from a scanned average instead of the running
+    values of a single pass.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> chunk_values('max_values', values, 3, chunks=3, processes=2).tolist()
+    [34.0, 34.0, 34.0, 34.0, 38.0, 38.0, 38.0]
+    """
+    funcname = _funcname(func)
+
+    if period:
+        if period < 1:
+            raise ValueError("period must be 1 or greater")
+
+        period = int(period)
+
+    if funcname in RECURRENCES:
+        RECURRENCES[funcname](period, *args)
+
+    maxbar = len(values)
+    if not maxbar:
+        return array.array('d')
+
+    if not chunks:
+        chunks = processes or multiprocessing.cpu_count()
+
+    if (not period) and (funcname not in RECURRENCES):
+        chunks = 1
+
+    chunks = max(1, min(int(chunks), maxbar))
+    size = -(-maxbar // chunks)
+    bounds = [(beg, min(beg + size, maxbar))
+              for beg in range(0, maxbar, size)]
+
+    blocks = _Blocks(maxbar)
+    try:
+        blocks.inview[:maxbar] = array.array('d', values)
+        inname = blocks.inblock.name
+        outname = blocks.outblock.name
+        args = tuple(args)
+
+        if funcname in RECURRENCES:
+            tasks = [(funcname, inname, beg, end, period, args)
+                     for beg, end in bounds]
+            maps = sorted(_execute(tasks, processes, pool, _run_reduce))
+
+            lastval = 0.0
+            tasks = []
+            for (beg, end), (mapbeg, scale, offset) in zip(bounds, maps):
+                tasks.append((funcname, inname, outname, beg, end, period,
+                              args, lastval))
+                lastval = scale * lastval + offset
+
+            _execute(tasks, processes, pool, _run_resume)
+
+        else:
+            halo = (period or 1) - 1
+            tasks = [(funcname, inname, outname, max(0, beg - halo), beg,
+                      end, period, args) for beg, end in bounds]
+
+            _execute(tasks, processes, pool, _run_halo)
+
+        results = array.array('d', blocks.outview[:maxbar])
+
+    finally:
+        blocks.close()
+
+    return results
+
+
+def _testit(verbose=None):
+    import doctest
+    doctest.testmod(verbose=verbose)
+
+if __name__ == "__main__":
+    _testit()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Opt-in instrumentation of the public core functions.
+
+enable() swaps every public function of core, and its copies in the
+statio package namespace, for a wrapper recording the calls, input sizes,
+periods and wall time of each function, and with memory=True the peak
+bytes allocated under tracemalloc.  disable() puts the original functions
+back, so nothing is paid while profiling is off.  Calls made by one core
+function to another are recorded too, and the peak of a call includes
+the peaks of the calls it makes.  tracemalloc is only imported when
+memory is traced, which needs Python 3.9 or later.
+
+Profiling is switched on for the whole process when the STATIO_PROFILE
+environment variable is set to anything but 0 or an empty string, with
+STATIO_PROFILE=memory also tracing allocations, or for a block with the
+profiled() context manager.  snapshot() returns the records as a dict and
+add_hook() registers callbacks run after each call.
+
+"""
+
+import os
+import sys
+import time
+import inspect
+import functools
+import contextlib
+
+import core
+
+
+ENVIRON = 'STATIO_PROFILE'
+
+_records = {}
+_hooks = []
+_originals = {}
+_tracer = [None]
+_started = [None]
+_peaks = []
+
+
+def _record(name):
+    record = _records.get(name)
+    if record is None:
+        record = {'calls': 0, 'values': 0, 'seconds': 0.0, 'bytes': 0,
+                  'periods': {}}
+        _records[name] = record
+
+    return record
+
+
+def _tracemalloc():
+    """Returns the tracemalloc module.
+
+    Raises RuntimeError if it is missing or cannot reset its peak.
+    """
+    try:
+        import tracemalloc
+    except ImportError:
+        tracemalloc = None
+
+    if getattr(tracemalloc, 'reset_peak', None) is None:
+        raise RuntimeError("memory profiling needs tracemalloc.reset_peak, "
+                           "Python 3.9 or later")
+
+    return tracemalloc
+
+
+def _wrap(name, func):
+    """Returns func wrapped to record each call under name."""
+    try:
+        params = list(inspect.signature(func).parameters)
+    except AttributeError:
+        params = inspect.getargspec(func).args
+
+    if 'period' in params:
+        position = params.index('period')
+    else:
+        position = None
+
+    _clock = getattr(time, 'perf_counter', time.time)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        tracer = _tracer[0]
+        if tracer is not None:
+            # resetting wipes the peak of the enclosing call, so fold it
+            # into that call's entry of _peaks first
+            before, peak = tracer.get_traced_memory()
+            if _peaks:
+                _peaks[-1] = max(_peaks[-1], peak)
+
+            tracer.reset_peak()
+            _peaks.append(before)
+
+        beg = _clock()
+        try:
+            result = func(*args, **kwargs)
+
+        finally:
+            elapsed = _clock() - beg
+
+            if tracer is not None:
+                peak = max(_peaks.pop(), tracer.get_traced_memory()[1])
+                if _peaks:
+                    _peaks[-1] = max(_peaks[-1], peak)
+
+        nbytes = 0
+        if tracer is not None:
+            nbytes = max(0, peak - before)
+
+        try:
+            size = len(args[0])
+        except (IndexError, TypeError):
+            size = 0
+
+        period = kwargs.get('period')
+        if (position is not None) and (len(args) > position):
+            period = args[position]
+
+        record = _record(name)
+        record['calls'] += 1
+        record['values'] += size
+        record['seconds'] += elapsed
+        record['bytes'] += nbytes
+        record['periods'][period] = record['periods'].get(period, 0) + 1
+
+        for hook in _hooks:
+            hook(name, size, period, elapsed, nbytes)
+
+        return result
+
+    wrapper._profiled = func
+
+    return wrapper
+
+
+def _modules():
+    """Returns list of the loaded modules holding core functions."""
+    modules = [core]
+    for name, module in list(sys.modules.items()):
+        if (module is not None) and (module is not core) and \
+                (name == 'statio' or name.startswith('statio.')):
+            modules.append(module)
+
+    return modules
+
+
+def is_enabled():
+    """Returns True while the core functions are instrumented."""
+    return bool(_originals)
+
+
+def enable(memory=False):
+    """Instruments every public core function.
+
+    :param memory: (optional) also record peak bytes allocated per call.
+        * True - starts tracemalloc, which slows every allocation.
+          Raises RuntimeError before Python 3.9.
+    """
+    tracer = None
+    if memory:
+        tracer = _tracemalloc()
+        if not tracer.is_tracing():
+            tracer.start()
+            _started[0] = tracer
+
+    _tracer[0] = tracer
+
+    if _originals:
+        return
+
+    for name, func in inspect.getmembers(core, inspect.isfunction):
+        if name.startswith('_') or func.__module__ != core.__name__:
+            continue
+
+        wrapper = _wrap(name, func)
+        for module in _modules():
+            if getattr(module, name, None) is func:
+                _originals[(module, name)] = func
+                setattr(module, name, wrapper)
+
+
+def disable():
+    """Restores the original core functions."""
+    for (module, name), func in _originals.items():
+        setattr(module, name, func)
+
+    _originals.clear()
+
+    if _started[0] is not None:
+        _started[0].stop()
+        _started[0] = None
+
+    _tracer[0] = None
+
+
+def enable_from_environ():
+    """Enables profiling if the STATIO_PROFILE variable asks for it.
+
+    :rtype: True if profiling was enabled.
+    """
+    setting = os.environ.get(ENVIRON, '').strip().lower()
+    if setting in ('', '0'):
+        return False
+
+    enable(memory=(setting == 'memory'))
+
+    return True
+
+
+def snapshot():
+    """Returns dict of function name to a copy of its record.
+
+    Each record holds calls, values (total input size), seconds (wall
+    time), bytes (peak allocated, 0 unless memory is traced) and periods
+    (dict of period to # of calls).
+    """
+    results = {}
+    for name, record in _records.items():
+        record = dict(record)
+        record['periods'] = dict(record['periods'])
+        results[name] = record
+
+    return results
+
+
+def reset():
+    """Clears the records."""
+    _records.clear()
+
+
+def add_hook(hook):
+    """Registers hook(name, size, period, seconds, nbytes) run per call."""
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    """Unregisters hook."""
+    _hooks.remove(hook)
+
+
+@contextlib.contextmanager
+def profiled(memory=False):
+    """Context manager instrumenting the core functions for a block.
+
+    Yields the snapshot function.  Profiling enabled before the block
+    stays enabled after it.
+
+    :param memory: (optional) also record peak bytes allocated per call.
+
+    Examples:
+    >>> reset()
+    >>> with profiled() as stats:
+    ...     results = core.sma_values([34, 30, 29, 34, 38, 25, 35], 3)
+    >>> record = stats()['sma_values']
+    >>> record['calls'], record['values'], record['periods']
+    (1, 7, {3: 1})
+    """
+    active = is_enabled()
+    enable(memory or (_tracer[0] is not None))
+    try:
+        yield snapshot
+
+    finally:
+        if not active:
+            disable()
+
+
+def _testit(verbose=None):
+    import doctest
+    doctest.testmod(verbose=verbose)
+
+if __name__ == "__main__":
+    _testit()
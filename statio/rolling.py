@@ -0,0 +1,1310 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Streaming versions of the core _values functions.
+
+Each Rolling class keeps the state of one sliding window and push()
+takes the next value and returns the updated stat.  The updates are the
+same formulas, in the same order, as the matching _values function, so
+pushing a series one value at a time reproduces its results exactly.
+
+The i-prefixed _values functions wrap the Rolling classes as generators
+that accept any iterable and keep only the current window in memory.
+
+dump_state and load_state checkpoint a Rolling object as a few bytes of
+header followed by its window as packed float64 or int64 values, so a
+restarted process resumes from the checkpoint instead of replaying
+history.
+
+"""
+
+import sys
+import math
+import array
+import struct
+import collections
+
+from window import SortedWindow, _quantiles, _quantile
+
+
+def _checkperiod(period):
+    """Returns validated int period or None."""
+    if period:
+        if period < 1:
+            raise ValueError("period must be 1 or greater")
+
+        return int(period)
+
+    return None
+
+
+REANCHOR = 64
+
+
+def _anchor(window):
+    """Returns (mean, devsq) of the values of window, in two exact passes."""
+    size = len(window)
+    mean = math.fsum(window) / size
+    devsq = math.fsum([(x - mean) * (x - mean) for x in window])
+
+    return mean, devsq
+
+
+def _moments(values, period=None):
+    """Returns lists of the running means and sums of squared deviations.
+
+    The windowed Welford update shared by the variance functions: the
+    mean and the sum of squared deviations from it are adjusted for the
+    value entering and the value leaving the window, O(1) per bar.  The
+    rounding error of that update grows with the # of slides, so every
+    REANCHOR * period bars both are recomputed from the window, which
+    keeps the cost O(1) amortized.  RollingVar follows the same schedule.
+
+    :param values: list of values to iterate.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+
+    Examples:
+    >>> means, devsqs = _moments([34, 30, 29, 34, 38, 25, 35], 3)
+    >>> ["%.2f" % x for x in devsqs]
+    ['0.00', '8.00', '14.00', '14.00', '40.67', '88.67', '92.67']
+    """
+    period = _checkperiod(period)
+
+    means = []
+    devsqs = []
+    _meanappend = means.append
+    _devsqappend = devsqs.append
+    mean = 0.0
+    devsq = 0.0
+
+    maxbar = len(values)
+    warmup = maxbar
+    if period:
+        warmup = min(period, maxbar)
+
+    size = 0.0
+    for newx in values[:warmup]:
+        size += 1.0
+        delta = newx - mean
+        mean += delta / size
+        devsq += delta * (newx - mean)
+        _meanappend(mean)
+        _devsqappend(devsq)
+
+    span = (period or 1) * REANCHOR
+    anchorbar = span
+    beg = warmup
+
+    while beg < maxbar:
+        end = min(anchorbar + 1, maxbar)
+
+        for newx, oldx in zip(values[beg:end],
+                              values[beg - period:end - period]):
+            oldmean = mean
+            delta = newx - oldx
+            mean += delta / size
+            devsq += delta * ((newx - mean) + (oldx - oldmean))
+            _meanappend(mean)
+            _devsqappend(devsq)
+
+        if end > anchorbar:
+            mean, devsq = _anchor(values[end - period:end])
+            means[-1] = mean
+            devsqs[-1] = devsq
+
+        beg = end
+        anchorbar += span
+
+    return means, devsqs
+
+
+class _Rolling(object):
+    """Base class of the streaming stats.
+
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    """
+
+    def __init__(self, period=None):
+        self.period = _checkperiod(period)
+        self.count = 0
+        self.value = None
+
+    def push(self, newx):
+        """Adds newx to the window and returns the updated stat."""
+        raise NotImplementedError
+
+    def extend(self, values):
+        """Pushes every item of values and returns list of the stats."""
+        _push = self.push
+        return [_push(newx) for newx in values]
+
+
+class RollingSum(_Rolling):
+    """Running sum, as computed by sum_values.
+
+    Examples:
+    >>> stat = RollingSum(3)
+    >>> stat.extend([34, 30, 29, 34, 38, 25, 35])
+    [34, 64, 93, 93, 101, 97, 98]
+    """
+
+    def __init__(self, period=None):
+        _Rolling.__init__(self, period)
+        self._window = collections.deque(maxlen=self.period)
+
+    def push(self, newx):
+        bar = self.count
+        period = self.period
+        lastval = self.value
+
+        if lastval == None:
+            lastval = newx
+
+        elif (not period) or (bar < period):
+            lastval += newx
+
+        else:
+            lastval += (newx - self._window[0])
+
+        if period:
+            self._window.append(newx)
+
+        self.count = bar + 1
+        self.value = lastval
+
+        return lastval
+
+
+class RollingSMA(_Rolling):
+    """Running simple moving average, as computed by sma_values.
+
+    Examples:
+    >>> stat = RollingSMA(3)
+    >>> results = stat.extend([34, 30, 29, 34, 38, 25, 35])
+    >>> ["%.2f" % x for x in results]
+    ['34.00', '32.00', '31.00', '31.00', '33.67', '32.33', '32.67']
+    """
+
+    def __init__(self, period=None):
+        _Rolling.__init__(self, period)
+        self._window = collections.deque(maxlen=self.period)
+        if period:
+            self._period_n = float(period)
+
+    def push(self, newx):
+        bar = self.count
+        period = self.period
+        lastval = self.value
+
+        if lastval == None:
+            lastval = float(newx)
+
+        elif (not period) or (bar < period):
+            lastval += ((newx - lastval) / (bar + 1.0))
+
+        else:
+            lastval += ((newx - self._window[0]) / self._period_n)
+
+        if period:
+            self._window.append(newx)
+
+        self.count = bar + 1
+        self.value = lastval
+
+        return lastval
+
+
+class RollingEMA(_Rolling):
+    """Running exponential moving average, as computed by ema_values.
+
+    :param smoothing: (optional) smoothing factor.
+        * valid values: between 0 - 1.
+        * None - (default) use formula = 2.0 / (period + 1.0).
+
+    Examples:
+    >>> stat = RollingEMA(3)
+    >>> results = stat.extend([34, 30, 29, 34, 38, 25, 35])
+    >>> ["%.3f" % x for x in results]
+    ['34.000', '32.000', '31.000', '32.500', '35.250', '30.125', '32.562']
+    """
+
+    def __init__(self, period=None, smoothing=None):
+        _Rolling.__init__(self, period)
+
+        if self.period:
+            if smoothing == None:
+                smoothing = 2.0 / (period + 1.0)
+
+            elif (smoothing < 0) or (smoothing > 1):
+                msg = "smoothing outside of 0 to 1 range: "
+                msg = ''.join((msg, str(smoothing)))
+                raise ValueError(msg)
+
+        self.smoothing = smoothing
+
+    def push(self, newx):
+        bar = self.count
+        period = self.period
+        lastval = self.value
+
+        if lastval == None:
+            lastval = float(newx)
+
+        elif (not period) or (bar < period):
+            lastval = lastval + ((newx - lastval) / (bar + 1.0))
+
+        else:
+            lastval = lastval + self.smoothing * (newx - lastval)
+
+        self.count = bar + 1
+        self.value = lastval
+
+        return lastval
+
+
+class RollingWWMA(_Rolling):
+    """Running Welles Wilder moving average, as computed by wwma_values.
+
+    Examples:
+    >>> stat = RollingWWMA(3)
+    >>> results = stat.extend([34, 30, 29, 34, 38, 25, 35])
+    >>> ["%.2f" % x for x in results]
+    ['34.00', '32.00', '31.00', '32.00', '34.00', '31.00', '32.33']
+    """
+
+    def push(self, newx):
+        bar = self.count
+        period = self.period
+        lastval = self.value
+
+        if lastval == None:
+            lastval = float(newx)
+
+        elif (not period) or (bar < period):
+            lastval = lastval + ((newx - lastval) / (bar + 1.0))
+
+        else:
+            lastval = (newx + lastval * (period - 1.0)) / period
+
+        self.count = bar + 1
+        self.value = lastval
+
+        return lastval
+
+
+class RollingPSA(_Rolling):
+    """Running Power Sum average, as computed by psa_values.
+
+    Examples:
+    >>> stat = RollingPSA(3)
+    >>> results = stat.extend([34, 30, 29, 34, 38, 25, 35])
+    >>> ["%.2f" % x for x in results]
+    ['1156.00', '1028.00', '965.67', '965.67', '1147.00', '1075.00', '1098.00']
+    """
+
+    def __init__(self, period=None):
+        _Rolling.__init__(self, period)
+        self._window = collections.deque(maxlen=self.period)
+        if period:
+            self._period_n = float(period)
+
+    def push(self, newx):
+        bar = self.count
+        period = self.period
+        lastval = self.value
+
+        if lastval == None:
+            lastval = (newx * newx) / (bar + 1.0)
+
+        elif (not period) or (bar < period):
+            lastval += ((newx * newx - lastval) / (bar + 1.0))
+
+        else:
+            oldx = self._window[0]
+            lastval += (((newx * newx) - (oldx * oldx)) / self._period_n)
+
+        if period:
+            self._window.append(newx)
+
+        self.count = bar + 1
+        self.value = lastval
+
+        return lastval
+
+
+class RollingVar(_Rolling):
+    """Running variance, as computed by var_values and varp_values.
+
+    :param population:
+        * True - entire population, n.
+        * False - sample set, n - 1 (default).
+
+    Examples:
+    >>> stat = RollingVar(3)
+    >>> results = stat.extend([34, 30, 29, 34, 38, 25, 35])
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '8.00', '7.00', '7.00', '20.33', '44.33', '46.33']
+    """
+
+    def __init__(self, period=None, population=False):
+        _Rolling.__init__(self, period)
+        self.population = population
+        self.mean = 0.0
+        self.devsq = 0.0
+        self._window = collections.deque(maxlen=self.period)
+
+    def push(self, newx):
+        bar = self.count
+        period = self.period
+        mean = self.mean
+
+        if (not period) or (bar < period):
+            size = bar + 1.0
+            delta = newx - mean
+            mean += delta / size
+            self.devsq += delta * (newx - mean)
+
+        else:
+            size = float(period)
+            oldx = self._window[0]
+            oldmean = mean
+            delta = newx - oldx
+            mean += delta / size
+            self.devsq += delta * ((newx - mean) + (oldx - oldmean))
+
+        if period:
+            self._window.append(newx)
+
+            if (bar >= period) and not (bar % (period * REANCHOR)):
+                mean, self.devsq = _anchor(self._window)
+
+        n = size
+        if not self.population:
+            n = size - 1.0
+
+        if bar and (n > 0.0) and (self.devsq > 0.0):
+            lastval = self.devsq / n
+
+        else:
+            lastval = 0.0
+
+        self.mean = mean
+        self.count = bar + 1
+        self.value = lastval
+
+        return lastval
+
+
+class RollingStd(RollingVar):
+    """Running standard deviation, as computed by std_values and stdp_values.
+
+    :param population:
+        * True - entire population, n.
+        * False - sample set, n - 1 (default).
+
+    Examples:
+    >>> stat = RollingStd(3, population=True)
+    >>> results = stat.extend([34, 30, 29, 34, 38, 25, 35])
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '2.00', '2.16', '2.16', '3.68', '5.44', '5.56']
+    """
+
+    def __init__(self, period=None, population=False):
+        RollingVar.__init__(self, period, population)
+        self.variance = None
+
+    def push(self, newx):
+        self.variance = RollingVar.push(self, newx)
+        self.value = math.sqrt(self.variance)
+
+        return self.value
+
+
+class _RollingExtreme(_Rolling):
+    """Running maximum or minimum over a monotonic deque of (bar, value)."""
+
+    highest = True
+
+    def __init__(self, period=None):
+        _Rolling.__init__(self, period)
+        self._window = collections.deque()
+
+    def push(self, newx):
+        bar = self.count
+        period = self.period
+        lastval = self.value
+        window = self._window
+
+        if not period:
+            if (lastval == None) or \
+                    (self.highest and (newx > lastval)) or \
+                    ((not self.highest) and (newx < lastval)):
+                lastval = newx
+
+        else:
+            if self.highest:
+                while window and window[-1][1] <= newx:
+                    window.pop()
+
+            else:
+                while window and window[-1][1] >= newx:
+                    window.pop()
+
+            window.append((bar, newx))
+
+            if window[0][0] <= bar - period:
+                window.popleft()
+
+            lastval = window[0][1]
+
+        self.count = bar + 1
+        self.value = lastval
+
+        return lastval
+
+
+class RollingMax(_RollingExtreme):
+    """Running maximum, as computed by max_values.
+
+    Examples:
+    >>> stat = RollingMax(3)
+    >>> stat.extend([34, 30, 29, 34, 38, 25, 35])
+    [34, 34, 34, 34, 38, 38, 38]
+    """
+
+    highest = True
+
+
+class RollingMin(_RollingExtreme):
+    """Running minimum, as computed by min_values.
+
+    Examples:
+    >>> stat = RollingMin(3)
+    >>> stat.extend([34, 30, 29, 34, 38, 25, 35])
+    [34, 30, 29, 29, 29, 25, 25]
+    """
+
+    highest = False
+
+
+class _RecentExtreme(_Rolling):
+    """Running index of, or bars since, the most recent extreme.
+
+    Subclasses set highest, for maximums rather than minimums, and since,
+    for the # of bars since the extreme rather than its index among all
+    the values pushed.  Ties resolve to the most recent bar.
+    """
+
+    highest = True
+    since = False
+
+    def __init__(self, period=None):
+        _Rolling.__init__(self, period)
+        self._index = 0
+        self._extreme = None
+        self._window = collections.deque()
+
+    def push(self, newx):
+        bar = self.count
+        period = self.period
+        highest = self.highest
+
+        if not period:
+            if self._extreme == None:
+                self._extreme = newx
+
+            if (highest and (newx >= self._extreme)) or \
+                    ((not highest) and (newx <= self._extreme)):
+                self._index, self._extreme = bar, newx
+
+            idx = self._index
+
+        else:
+            window = self._window
+            if highest:
+                while window and window[-1][1] <= newx:
+                    window.pop()
+
+            else:
+                while window and window[-1][1] >= newx:
+                    window.pop()
+
+            window.append((bar, newx))
+
+            if window[0][0] <= bar - period:
+                window.popleft()
+
+            idx = window[0][0]
+
+        lastval = idx
+        if self.since:
+            lastval = bar - idx
+
+        self.count = bar + 1
+        self.value = lastval
+
+        return lastval
+
+
+class RollingRecentMax(_RecentExtreme):
+    """Running index of the most recent maximum, as recentmax_values.
+
+    Examples:
+    >>> stat = RollingRecentMax(3)
+    >>> stat.extend([34, 30, 29, 34, 38, 25, 35])
+    [0, 0, 0, 3, 4, 4, 4]
+    """
+
+    highest = True
+    since = False
+
+
+class RollingSinceMax(_RecentExtreme):
+    """Running # of bars since the maximum, as sincemax_values.
+
+    Examples:
+    >>> stat = RollingSinceMax(3)
+    >>> stat.extend([34, 30, 29, 34, 38, 25, 35])
+    [0, 1, 2, 0, 0, 1, 2]
+    """
+
+    highest = True
+    since = True
+
+
+class RollingRecentMin(_RecentExtreme):
+    """Running index of the most recent minimum, as recentmin_values.
+
+    Examples:
+    >>> stat = RollingRecentMin(3)
+    >>> stat.extend([34, 30, 29, 34, 38, 25, 35])
+    [0, 1, 2, 2, 2, 5, 5]
+    """
+
+    highest = False
+    since = False
+
+
+class RollingSinceMin(_RecentExtreme):
+    """Running # of bars since the minimum, as sincemin_values.
+
+    Examples:
+    >>> stat = RollingSinceMin(3)
+    >>> stat.extend([34, 30, 29, 34, 38, 25, 35])
+    [0, 0, 0, 1, 2, 0, 1]
+    """
+
+    highest = False
+    since = True
+
+
+class _RollingSorted(_Rolling):
+    """Base class of the stats read from the sorted window.
+
+    Raises ValueError on pushing a NaN, which cannot be ordered.
+    """
+
+    def __init__(self, period=None):
+        _Rolling.__init__(self, period)
+        self._values = collections.deque()
+        self._sorted = SortedWindow()
+
+    def push(self, newx):
+        period = self.period
+
+        if period and (self.count >= period):
+            self._sorted.remove(self._values.popleft())
+
+        if period:
+            self._values.append(newx)
+
+        self._sorted.add(newx)
+        self.count += 1
+        self.value = self._select()
+
+        return self.value
+
+    def _select(self):
+        """Returns the stat of the sorted window."""
+        raise NotImplementedError
+
+
+class RollingTopN(_RollingSorted):
+    """Running top num items, as computed by top_values.
+
+    :param num: the num in the top num items.
+
+    Examples:
+    >>> stat = RollingTopN(3, 2)
+    >>> stat.extend([34, 30, 29, 34, 38, 25, 35])
+    [[34], [30, 34], [30, 34], [30, 34], [34, 38], [34, 38], [35, 38]]
+    """
+
+    def __init__(self, period=None, num=1):
+        _RollingSorted.__init__(self, period)
+
+        if num:
+            num = int(num)
+
+        self.num = num
+
+    def _select(self):
+        if self.num:
+            return self._sorted.largest(self.num)
+
+        return list(self._sorted)
+
+
+class RollingBottomN(RollingTopN):
+    """Running bottom num items, as computed by bottom_values.
+
+    :param num: the num in the bottom num items.
+
+    Examples:
+    >>> stat = RollingBottomN(3, 2)
+    >>> stat.extend([34, 30, 29, 34, 38, 25, 35])
+    [[34], [30, 34], [29, 30], [29, 30], [29, 34], [25, 34], [25, 35]]
+    """
+
+    def _select(self):
+        return self._sorted.smallest(self.num)
+
+
+class RollingMedian(_RollingSorted):
+    """Running median, as computed by median_values.
+
+    Examples:
+    >>> stat = RollingMedian(3)
+    >>> stat.extend([34, 30, 29, 34, 38, 25, 35])
+    [34, 32.0, 30, 30, 34, 34, 35]
+    """
+
+    def _select(self):
+        window = self._sorted
+        mid = len(window) >> 1
+        if len(window) & 1:
+            return window[mid]
+
+        return (window[mid - 1] + window[mid]) / 2.0
+
+
+class RollingQuantile(_RollingSorted):
+    """Running quantile, as computed by quantile_values.
+
+    :param q: quantile or list of quantiles.
+        * valid values: between 0 - 1.
+        * list - each stat is a list with one item per quantile.
+
+    Examples:
+    >>> stat = RollingQuantile(3, 0.25)
+    >>> stat.extend([34, 30, 29, 34, 38, 25, 35])
+    [34, 31.0, 29.5, 29.5, 31.5, 29.5, 30.0]
+    """
+
+    def __init__(self, period=None, q=0.5):
+        _RollingSorted.__init__(self, period)
+        self._qs = _quantiles(q)
+        self.q = q
+
+    def _select(self):
+        if not isinstance(self.q, (list, tuple)):
+            return _quantile(self._sorted, self._qs[0])
+
+        return [_quantile(self._sorted, x) for x in self._qs]
+
+
+def rolling_stat(name, period=None, smoothing=None):
+    """Returns a new Rolling object for the stat name.
+
+    :param name: one of the describe_values stat names: sum, sma, ema,
+        wwma, psa, varp, var, stdp, std, max or min.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param smoothing: (optional) ema smoothing factor.
+    :rtype: Rolling object.
+
+    Examples:
+    >>> stat = rolling_stat('stdp', 3)
+    >>> "%.2f" % stat.extend([34, 30, 29, 34, 38, 25, 35])[-1]
+    '5.56'
+    """
+    if name == 'ema':
+        return RollingEMA(period, smoothing)
+
+    if name == 'varp':
+        return RollingVar(period, population=True)
+
+    if name == 'stdp':
+        return RollingStd(period, population=True)
+
+    try:
+        cls = _STATS[name]
+    except KeyError:
+        raise ValueError(''.join(("unknown stat: ", str(name))))
+
+    return cls(period)
+
+
+_STATS = {'sum': RollingSum, 'sma': RollingSMA, 'wwma': RollingWWMA,
+          'psa': RollingPSA, 'var': RollingVar, 'std': RollingStd,
+          'max': RollingMax, 'min': RollingMin}
+
+
+def _istream(stat, values):
+    """Returns generator pushing each item of values through stat.
+
+    Only the window of stat is kept, so any iterator can be consumed in
+    O(period) memory.
+    """
+    values = iter(values)
+    _push = stat.push
+
+    def _results():
+        for newx in values:
+            yield _push(newx)
+
+    return _results()
+
+
+def isum_values(values, period=None):
+    """Yields running sums.
+
+    :param values: iterable of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: generator of windowed sums.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> list(isum_values(values, 3))
+    [34, 64, 93, 93, 101, 97, 98]
+    """
+    return _istream(RollingSum(period), values)
+
+
+def isma_values(values, period=None):
+    """Yields running simple moving averages.
+
+    :param values: iterable of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: generator of windowed simple moving averages.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = isma_values(values, 3)
+    >>> ["%.2f" % x for x in results]
+    ['34.00', '32.00', '31.00', '31.00', '33.67', '32.33', '32.67']
+    """
+    return _istream(RollingSMA(period), values)
+
+
+def iema_values(values, period=None, smoothing=None):
+    """Yields running exponential moving averages.
+
+    :param values: iterable of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param smoothing: (optional) smoothing factor.
+        * valid values: between 0 - 1.
+        * None - (default) use formula = 2.0 / (period + 1.0).
+    :rtype: generator of windowed exponential moving averages.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = iema_values(values, 3)
+    >>> ["%.2f" % x for x in results]
+    ['34.00', '32.00', '31.00', '32.50', '35.25', '30.12', '32.56']
+    """
+    return _istream(RollingEMA(period, smoothing), values)
+
+
+def iwwma_values(values, period=None):
+    """Yields running Welles Wilder moving averages.
+
+    :param values: iterable of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: generator of windowed Welles Wilder moving averages.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = iwwma_values(values, 3)
+    >>> ["%.2f" % x for x in results]
+    ['34.00', '32.00', '31.00', '32.00', '34.00', '31.00', '32.33']
+    """
+    return _istream(RollingWWMA(period), values)
+
+
+def ipsa_values(values, period=None):
+    """Yields running Power Sum averages.
+
+    :param values: iterable of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: generator of windowed Power Sum averages.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = ipsa_values(values, 3)
+    >>> ["%.2f" % x for x in results]
+    ['1156.00', '1028.00', '965.67', '965.67', '1147.00', '1075.00', '1098.00']
+    """
+    return _istream(RollingPSA(period), values)
+
+
+def ivarp_values(values, period=None):
+    """Yields running population variances.
+
+    :param values: iterable of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: generator of windowed population variances.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = ivarp_values(values, 3)
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '4.00', '4.67', '4.67', '13.56', '29.56', '30.89']
+    """
+    return _istream(RollingVar(period, population=True), values)
+
+
+def ivar_values(values, period=None):
+    """Yields running sample variances.
+
+    :param values: iterable of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: generator of windowed sample variances.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = ivar_values(values, 3)
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '8.00', '7.00', '7.00', '20.33', '44.33', '46.33']
+    """
+    return _istream(RollingVar(period), values)
+
+
+def istdp_values(values, period=None):
+    """Yields running population standard deviations.
+
+    :param values: iterable of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: generator of windowed population standard deviations.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = istdp_values(values, 3)
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '2.00', '2.16', '2.16', '3.68', '5.44', '5.56']
+    """
+    return _istream(RollingStd(period, population=True), values)
+
+
+def istd_values(values, period=None):
+    """Yields running sample standard deviations.
+
+    :param values: iterable of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: generator of windowed sample standard deviations.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> results = istd_values(values, 3)
+    >>> ["%.2f" % x for x in results]
+    ['0.00', '2.83', '2.65', '2.65', '4.51', '6.66', '6.81']
+    """
+    return _istream(RollingStd(period), values)
+
+
+def imax_values(values, period=None):
+    """Yields running maximums.
+
+    :param values: iterable of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: generator of windowed maximums.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> list(imax_values(values, 3))
+    [34, 34, 34, 34, 38, 38, 38]
+    """
+    return _istream(RollingMax(period), values)
+
+
+def imin_values(values, period=None):
+    """Yields running minimums.
+
+    :param values: iterable of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :rtype: generator of windowed minimums.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> list(imin_values(values, 3))
+    [34, 30, 29, 29, 29, 25, 25]
+    """
+    return _istream(RollingMin(period), values)
+
+
+def itop_values(values, period=None, num=1):
+    """Yields top num items.
+
+    :param values: iterable of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param num: the num in the top num items.
+    :rtype: generator of windowed top num items.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> list(itop_values(values, 3, 2))
+    [[34], [30, 34], [30, 34], [30, 34], [34, 38], [34, 38], [35, 38]]
+    """
+    return _istream(RollingTopN(period, num), values)
+
+
+def ibottom_values(values, period=None, num=1):
+    """Yields bottom num items.
+
+    :param values: iterable of values to iterate and compute stat.
+    :param period: (optional) # of values included in computation.
+        * None - includes all values in computation.
+    :param num: the num in the bottom num items.
+    :rtype: generator of windowed bottom num items.
+
+    Examples:
+    >>> values = [34, 30, 29, 34, 38, 25, 35]
+    >>> list(ibottom_values(values, 3, 2))
+    [[34], [30, 34], [29, 30], [29, 30], [29, 34], [25, 34], [25, 35]]
+    """
+    return _istream(RollingBottomN(period, num), values)
+
+
+STATE_MAGIC = b'STRS'
+STATE_VERSION = 2
+
+_STATE_HEADER = struct.Struct('<4sBBBqqddddq')
+
+_NONE_VALUE = 1
+_NONE_SMOOTHING = 2
+_POPULATION = 4
+_NONE_VARIANCE = 8
+_QUANTILE_LIST = 16
+_INT_VALUE = 32
+_INT_WINDOW = 64
+_BIG_INTS = 128
+
+
+def _packed(typecode, items):
+    """Returns little-endian bytes of items packed as array typecode."""
+    data = array.array(typecode, items)
+    if sys.byteorder == 'big':
+        data.byteswap()
+
+    return data.tobytes()
+
+
+def _unpacked(typecode, data):
+    """Returns array typecode of little-endian bytes data."""
+    items = array.array(typecode)
+    items.frombytes(data)
+    if sys.byteorder == 'big':
+        items.byteswap()
+
+    return items
+
+
+def _packedints(items):
+    """Returns (flags, bytes) of ints items packed as int64.
+
+    Ints past int64 are written as comma separated decimal text after its
+    int64 length, flagged _BIG_INTS.
+    """
+    try:
+        return 0, _packed('q', items)
+
+    except OverflowError:
+        text = ','.join([str(x) for x in items]).encode('ascii')
+        return _BIG_INTS, b''.join((_packed('q', [len(text)]), text))
+
+
+def _unpackedints(data, pos, size, flags):
+    """Returns (list of size ints, end) read from data at pos."""
+    if flags & _BIG_INTS:
+        length = _unpacked('q', data[pos:pos + 8])
+        if not length:
+            raise ValueError("state checkpoint is truncated")
+
+        pos += 8
+        end = pos + length[0]
+        text = data[pos:end]
+        items = [int(x) for x in text.split(b',')] if text else []
+
+    else:
+        end = pos + size * 8
+        items = list(_unpacked('q', data[pos:end]))
+
+    if len(items) != size:
+        raise ValueError("state checkpoint is truncated")
+
+    return items, end
+
+
+def dump_state(stat):
+    """Returns compact bytes checkpoint of a Rolling object.
+
+    The checkpoint holds the period, count, last value and options of stat
+    and its window as float64 values.  A window of ints and an int value
+    are packed as int64, or as decimal text past that range, so integer
+    series resume exactly.
+
+    :param stat: Rolling object, any of the rolling_stat classes or the
+        top, bottom, median, quantile and recent or since extreme classes.
+    :rtype: bytes.
+
+    Examples:
+    >>> stat = RollingEMA(3)
+    >>> results = stat.extend([34, 30, 29, 34])
+    >>> resumed = load_state(dump_state(stat))
+    >>> resumed.push(38) == stat.push(38)
+    True
+    """
+    cls = type(stat)
+    if cls not in _STATE_CODES:
+        msg = "unsupported Rolling type: "
+        msg = ''.join((msg, cls.__name__))
+        raise TypeError(msg)
+
+    flags = 0
+    value = stat.value
+    aux = [0.0, 0.0, 0.0, 0.0]
+    bars = ()
+    extra = ()
+
+    if value is None:
+        flags |= _NONE_VALUE
+
+    if isinstance(stat, _RollingSorted):
+        value = None
+        if stat.period:
+            window = stat._values
+        else:
+            window = stat._sorted
+
+        if isinstance(stat, RollingTopN):
+            aux[0] = stat.num or 0
+
+        elif isinstance(stat, RollingQuantile):
+            if isinstance(stat.q, (list, tuple)):
+                flags |= _QUANTILE_LIST
+                extra = stat._qs
+                aux[1] = len(extra)
+            else:
+                aux[0] = stat.q
+
+    elif isinstance(stat, (_RollingExtreme, _RecentExtreme)):
+        window = [item[1] for item in stat._window]
+        bars = [item[0] for item in stat._window]
+
+        if isinstance(stat, _RecentExtreme):
+            value = None
+            if (not stat.period) and (stat._extreme is not None):
+                window = [stat._extreme]
+                bars = [stat._index]
+
+    elif isinstance(stat, RollingVar):
+        window = stat._window
+        aux[0] = stat.mean
+        aux[1] = stat.devsq
+        if stat.population:
+            flags |= _POPULATION
+        if isinstance(stat, RollingStd):
+            if stat.variance is None:
+                flags |= _NONE_VARIANCE
+            else:
+                aux[2] = stat.variance
+
+    elif isinstance(stat, RollingEMA):
+        window = ()
+        if stat.smoothing is None:
+            flags |= _NONE_SMOOTHING
+        else:
+            aux[0] = stat.smoothing
+
+    elif isinstance(stat, RollingWWMA):
+        window = ()
+
+    else:
+        window = stat._window
+
+    window = list(window)
+    ints = []
+    if type(value) is int:
+        flags |= _INT_VALUE
+        ints.append(value)
+        value = None
+
+    if window and all([type(x) is int for x in window]):
+        flags |= _INT_WINDOW
+        ints.extend(window)
+        window = ()
+
+    intflags, intdata = _packedints(ints)
+    flags |= intflags
+
+    header = _STATE_HEADER.pack(STATE_MAGIC, STATE_VERSION,
+                                _STATE_CODES[cls], flags, stat.period or 0,
+                                stat.count, value or 0.0, aux[0], aux[1],
+                                aux[2], len(ints) + len(window))
+
+    return b''.join((header, intdata, _packed('d', window),
+                     _packed('q', bars), _packed('d', extra)))
+
+
+def load_state(data):
+    """Returns the Rolling object of a dump_state checkpoint.
+
+    :param data: bytes from dump_state.
+    :rtype: Rolling object.
+    """
+    size = _STATE_HEADER.size
+    if len(data) < size:
+        raise ValueError("state checkpoint is truncated")
+
+    (magic, version, code, flags, period, count, value, aux0, aux1, aux2,
+     winlen) = _STATE_HEADER.unpack_from(data)
+
+    if magic != STATE_MAGIC:
+        raise ValueError("not a statio state checkpoint")
+
+    if not (1 <= version <= STATE_VERSION):
+        msg = "unsupported state checkpoint version: "
+        msg = ''.join((msg, str(version)))
+        raise ValueError(msg)
+
+    try:
+        cls = _STATE_CLASSES[code]
+    except KeyError:
+        raise ValueError(''.join(("unknown state code: ", str(code))))
+
+    period = period or None
+    population = bool(flags & _POPULATION)
+
+    nvalue = 0
+    if flags & _INT_VALUE:
+        nvalue = 1
+
+    nints = nvalue
+    if flags & _INT_WINDOW:
+        nints = winlen
+
+    ints, end = _unpackedints(data, size, nints, flags)
+    if nvalue:
+        value = ints[0]
+
+    if flags & _INT_WINDOW:
+        window = ints[nvalue:]
+    else:
+        beg = end
+        end = beg + (winlen - nvalue) * 8
+        window = _unpacked('d', data[beg:end])
+        if len(window) != winlen - nvalue:
+            raise ValueError("state checkpoint is truncated")
+
+    winlen = len(window)
+
+    if issubclass(cls, RollingTopN):
+        stat = cls(period, int(aux0))
+
+    elif cls is RollingQuantile:
+        q = aux0
+        if flags & _QUANTILE_LIST:
+            beg = end + int(aux1) * 8
+            q = list(_unpacked('d', data[end:beg]))
+            if len(q) != int(aux1):
+                raise ValueError("state checkpoint is truncated")
+        stat = cls(period, q)
+
+    elif issubclass(cls, RollingVar):
+        stat = cls(period, population)
+
+    elif cls is RollingEMA:
+        smoothing = aux0
+        if flags & _NONE_SMOOTHING:
+            smoothing = None
+        stat = cls(period, smoothing)
+
+    else:
+        stat = cls(period)
+
+    stat.count = count
+    if not (flags & _NONE_VALUE):
+        stat.value = value
+
+    if isinstance(stat, _RollingSorted):
+        if period:
+            stat._values.extend(window)
+        stat._sorted.update(window)
+        if count:
+            stat.value = stat._select()
+
+    elif isinstance(stat, (_RollingExtreme, _RecentExtreme)):
+        bars = _unpacked('q', data[end:end + winlen * 8])
+        if len(bars) != winlen:
+            raise ValueError("state checkpoint is truncated")
+
+        if isinstance(stat, _RollingExtreme) or period:
+            stat._window.extend(zip(bars, window))
+        elif winlen:
+            stat._index, stat._extreme = bars[0], window[0]
+
+        if isinstance(stat, _RecentExtreme) and winlen:
+            stat.value = bars[0]
+            if stat.since:
+                stat.value = count - 1 - bars[0]
+
+    elif isinstance(stat, RollingVar):
+        stat.mean = aux0
+        stat.devsq = aux1
+        stat._window.extend(window)
+        if isinstance(stat, RollingStd) and not (flags & _NONE_VARIANCE):
+            stat.variance = aux2
+
+    elif hasattr(stat, '_window'):
+        stat._window.extend(window)
+
+    return stat
+
+
+_STATE_CLASSES = {1: RollingSum, 2: RollingSMA, 3: RollingEMA,
+                  4: RollingWWMA, 5: RollingPSA, 6: RollingVar,
+                  7: RollingStd, 8: RollingMax, 9: RollingMin,
+                  10: RollingTopN, 11: RollingBottomN, 12: RollingMedian,
+                  13: RollingQuantile, 14: RollingRecentMax,
+                  15: RollingSinceMax, 16: RollingRecentMin,
+                  17: RollingSinceMin}
+
+_STATE_CODES = dict((cls, code) for code, cls in _STATE_CLASSES.items())
+
+
+def _testit(verbose=None):
+    import doctest
+    doctest.testmod(verbose=verbose)
+
+if __name__ == "__main__":
+    _testit()
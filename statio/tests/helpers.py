@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Fixtures and assertions shared by the statio tests.
+
+"""
+
+import unittest
+
+
+def random_prices(rand, size):
+    """Returns list of size prices from 10 to 60, rounded to cents.
+
+    :param rand: random.Random to draw from, so fixtures are repeatable.
+    :param size: # of prices.
+    """
+    return [round(rand.uniform(10, 60), 2) for x in range(size)]
+
+
+class StatTestCase(unittest.TestCase):
+    """TestCase comparing computed stats with a relative tolerance."""
+
+    def assertClose(self, rows, expected, tolerance=1e-9):
+        """Fails unless rows and expected match to tolerance.
+
+        Values of magnitude under 1 are compared absolutely.
+        """
+        self.assertEquals(len(rows), len(expected))
+        for row, exp in zip(rows, expected):
+            self.assertTrue(abs(row - exp) <= tolerance * max(1.0, abs(exp)),
+                            "%r != %r" % (row, exp))
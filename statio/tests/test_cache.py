@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Test the cache module.
+
+"""
+
+import sys
+import os
+import array
+import random
+import unittest
+
+#Forced to manipulate path - have yet to find alternative built-in method.
+libpath = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if not libpath in sys.path:
+    sys.path.insert(1, libpath)
+del libpath
+
+from helpers import random_prices
+import core
+import cache
+from cache import StatCache, fingerprint
+
+rand = random.Random(23)
+SERIES = random_prices(rand, 200)
+
+
+class Stat_Cache_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.stats = StatCache(maxsize=8)
+
+    def test_matches_core(self):
+        for name in cache.FUNCTIONS:
+            for period in (None, 1, 20):
+                expected = getattr(core, name)(SERIES, period)
+                self.assertEquals(self.stats.values(name, SERIES, period),
+                                  expected)
+                self.assertEquals(self.stats.values(name, SERIES, period),
+                                  expected)
+
+    def test_hits_and_misses(self):
+        self.stats.values(core.sma_values, SERIES, 5)
+        self.stats.values(core.sma_values, SERIES, 5)
+        self.stats.values(core.sma_values, SERIES, 6)
+        self.assertEquals((self.stats.hits, self.stats.misses), (1, 2))
+
+    def test_shared_variance_intermediate(self):
+        self.stats.values('var_values', SERIES, 10)
+        self.assertEquals((self.stats.hits, self.stats.misses), (0, 1))
+        self.assertEquals(len(self.stats), 2)
+        for name in ('varp_values', 'stdp_values', 'std_values'):
+            self.stats.values(name, SERIES, 10)
+        self.assertEquals((self.stats.hits, self.stats.misses), (0, 4))
+        self.assertEquals(len(self.stats), 5)
+
+    def test_lru_eviction(self):
+        stats = StatCache(maxsize=2)
+        stats.values('sum_values', SERIES, 1)
+        stats.values('sum_values', SERIES, 2)
+        stats.values('sum_values', SERIES, 1)
+        stats.values('sum_values', SERIES, 3)
+        self.assertEquals(len(stats), 2)
+        stats.values('sum_values', SERIES, 1)
+        self.assertEquals(stats.hits, 2)
+        stats.values('sum_values', SERIES, 2)
+        self.assertEquals(stats.hits, 2)
+
+    def test_returns_copies(self):
+        results = self.stats.values('max_values', SERIES, 3)
+        results[0] = -1
+        self.assertEquals(self.stats.values('max_values', SERIES, 3),
+                          core.max_values(SERIES, 3))
+
+    def test_fingerprint(self):
+        data = array.array('d', SERIES)
+        self.assertEquals(fingerprint(SERIES), fingerprint(list(SERIES)))
+        self.assertEquals(fingerprint(data), fingerprint(data[:]))
+        changed = data[:]
+        changed[-1] += 1.0
+        self.assertNotEqual(fingerprint(data), fingerprint(changed))
+
+    def test_fingerprint_collisions(self):
+        # hash(-1) == hash(-2), and [1, 2] == [1.0, 2.0]
+        self.assertNotEqual(fingerprint([-1]), fingerprint([-2]))
+        self.assertEquals(self.stats.values('sum_values', [-1], 3), [-1])
+        self.assertEquals(self.stats.values('sum_values', [-2], 3), [-2])
+        self.assertNotEqual(fingerprint([1, 2]), fingerprint([1.0, 2.0]))
+        results = self.stats.values('max_values', [1.0, 2.0], 3)
+        self.assertEquals(self.stats.values('max_values', [1, 2], 3), [1, 2])
+        self.assertEquals([type(x) for x in results], [float, float])
+        self.assertNotEqual(fingerprint(array.array('d', [1.0])),
+                            fingerprint(array.array('q', [0x3ff0 << 48])))
+
+    def test_fingerprint_kinds(self):
+        self.assertNotEqual(fingerprint([1, 2.0]), fingerprint([1.0, 2]))
+        self.assertNotEqual(fingerprint([2 ** 70]), fingerprint([2 ** 70 + 1]))
+        self.assertNotEqual(fingerprint([2 ** 60]), fingerprint([2 ** 60 + 1]))
+        self.assertEquals(fingerprint([]), fingerprint([]))
+
+    def test_fingerprint_is_compact(self):
+        key = fingerprint(SERIES)
+        self.assertEquals(len(key), 4)
+        self.assertTrue(all(isinstance(item, (str, int)) for item in key))
+
+    def test_ema_smoothing(self):
+        self.assertEquals(self.stats.values('ema_values', SERIES, 5, 0.5),
+                          core.ema_values(SERIES, 5, 0.5))
+        self.assertEquals(self.stats.values('ema_values', SERIES, 5),
+                          core.ema_values(SERIES, 5))
+
+    def test_keyword_arguments(self):
+        self.assertEquals(cache.ema_values(SERIES, 5, smoothing=0.5),
+                          core.ema_values(SERIES, 5, 0.5))
+        stats = self.stats
+        stats.values('ema_values', SERIES, 5)
+        stats.values('ema_values', SERIES, 5, None)
+        stats.values('ema_values', SERIES, period=5, smoothing=None)
+        self.assertEquals((stats.hits, stats.misses), (2, 1))
+
+    def test_uncached_arguments(self):
+        output = array.array('d', [0.0] * len(SERIES))
+        self.assertRaises(ValueError, cache.sum_values, SERIES, 3,
+                          output=output)
+        self.assertRaises(ValueError, self.stats.values, 'sum_values',
+                          SERIES, 3, output)
+        self.assertRaises(ValueError, cache.sma_values, SERIES, 3,
+                          state=object())
+        self.assertRaises(TypeError, cache.sma_values, SERIES, 3, bogus=1)
+
+    def test_clear(self):
+        self.stats.values('sum_values', SERIES, 3)
+        self.stats.clear()
+        self.assertEquals(self.stats.info(),
+                          {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 8})
+
+    def test_module_functions(self):
+        self.assertEquals(cache.std_values(SERIES, 7),
+                          core.std_values(SERIES, 7))
+
+    def test_unsupported_function(self):
+        self.assertRaises(ValueError, self.stats.values, 'top_values', SERIES)
+
+    def test_maxsize_too_small(self):
+        self.assertRaises(ValueError, StatCache, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
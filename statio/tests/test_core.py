@@ -13,6 +13,9 @@ Test the core module.
 
 import sys
 import os
+import math
+import array
+import random
 import unittest
 
 #Forced to manipulate path - have yet to find alternative built-in method.
@@ -21,6 +24,8 @@ if not libpath in sys.path:
     sys.path.insert(1, libpath)
 del libpath
 
+from helpers import StatTestCase, random_prices
+import rolling
 from core import *
 
 
@@ -311,6 +316,19 @@ class Varp_Values_TestCase(unittest.TestCase):
         rows = ['%.2f' % x for x in rows]
         self.assertEquals(rows, ['0.00', '4.52', '20.51'])
 
+    def test_price_level_stability(self):
+        rand = random.Random(3)
+        series = [round(30000 + rand.gauss(0, 0.5), 2) for x in range(20000)]
+        rows = varp_values(series, 20)
+        for bar in range(len(series) - 200, len(series)):
+            expected = varp_value(series[:bar + 1], 20)
+            self.assertTrue(abs(rows[bar] - expected) <= 1e-9 * expected)
+
+    def test_period_one(self):
+        series = [21.25, 25.5, 32.25]
+        self.assertEquals(varp_values(series, 1), [0.0, 0.0, 0.0])
+        self.assertEquals(var_values(series, 1), [0.0, 0.0, 0.0])
+
 
 class Varp_Value_TestCase(unittest.TestCase):
     def setUp(self):
@@ -390,6 +408,20 @@ class Var_Values_TestCase(unittest.TestCase):
         rows = ['%.2f' % x for x in rows]
         self.assertEquals(rows, ['0.00', '9.03', '30.77'])
 
+    def test_long_walk(self):
+        rand = random.Random(3)
+        series = [1000.0]
+        for x in range(300000):
+            series.append(series[-1] + rand.gauss(0, 1))
+
+        rows = var_values(series, 20)
+        for bar in range(len(series) - 20000, len(series), 97):
+            window = series[bar - 19:bar + 1]
+            mean = math.fsum(window) / 20
+            expected = math.fsum((x - mean) ** 2 for x in window) / 19
+            self.assertTrue(abs(rows[bar] - expected) <= 1e-9 * expected,
+                            "%r != %r" % (rows[bar], expected))
+
 
 class Var_Value_TestCase(unittest.TestCase):
     def setUp(self):
@@ -624,6 +656,23 @@ class Max_Values_TestCase(unittest.TestCase):
         rows = ['%.2f' % x for x in rows]
         self.assertEquals(rows, ['21.25', '25.50', '32.25'])
 
+    def test_matches_window_scan(self):
+        series = [5, 3, 8, 8, 1, 9, 2, 2, 7, 4, 6, 0, 9, 3]
+        for period in (1, 2, 3, 5, 20):
+            rows = max_values(series, period)
+            expected = [max(series[max(0, i - period + 1):i + 1])
+                        for i in range(len(series))]
+            self.assertEquals(rows, expected)
+
+    def test_descending_series(self):
+        series = [9, 8, 7, 6, 5, 4]
+        self.assertEquals(max_values(series, 2), [9, 9, 8, 7, 6, 5])
+        self.assertEquals(max_values(series), [9, 9, 9, 9, 9, 9])
+
+    def test_period_too_small(self):
+        series = [21, 25, 32, 55, 22]
+        self.assertRaises(ValueError, max_values, series, -1)
+
 
 class Top_Values_TestCase(unittest.TestCase):
     def setUp(self):
@@ -664,11 +713,35 @@ class Top_Values_TestCase(unittest.TestCase):
         rows = top_values(series, 2, 2)
         self.assertEquals(rows, [[21], [21, 25], [25, 32], [32, 55], [22, 55]])
 
+    def test_nan(self):
+        series = [1, float('nan'), 3, 4, 5]
+        self.assertRaises(ValueError, top_values, series, 2)
+        self.assertRaises(ValueError, bottom_values, series, 2)
+        self.assertRaises(ValueError, median_values, series, 2)
+        self.assertRaises(ValueError, quantile_values, series, 2, 0.25)
+
+    def test_large_window(self):
+        rand = random.Random(11)
+        series = [rand.randint(0, 1000) for x in range(12000)]
+        rows = top_values(series, 9000, 3)
+        self.assertEquals(rows[-1], sorted(series[-9000:])[-3:])
+        self.assertEquals(rows[8999], sorted(series[:9000])[-3:])
+
     def test_calc_no_num(self):
         series = [21, 25, 32, 55, 22]
         rows = top_values(series, 2)
         self.assertEquals(rows, [[21], [25], [32], [55], [55]])
 
+    def test_matches_sorted_window(self):
+        series = [5, 3, 8, 8, 1, 9, 2, 2, 7, 4, 6, 0, 9, 3]
+        for period in (1, 3, 5, None):
+            rows = top_values(series, period, 3)
+            for bar, row in enumerate(rows):
+                beg = 0
+                if period:
+                    beg = max(0, bar - period + 1)
+                self.assertEquals(row, sorted(series[beg:bar + 1])[-3:])
+
 
 class Min_Values_TestCase(unittest.TestCase):
     def setUp(self):
@@ -710,6 +783,19 @@ class Min_Values_TestCase(unittest.TestCase):
         rows = ['%.2f' % x for x in rows]
         self.assertEquals(rows, ['21.25', '21.25', '21.25'])
 
+    def test_matches_window_scan(self):
+        series = [5, 3, 8, 8, 1, 9, 2, 2, 7, 4, 6, 0, 9, 3]
+        for period in (1, 2, 3, 5, 20):
+            rows = min_values(series, period)
+            expected = [min(series[max(0, i - period + 1):i + 1])
+                        for i in range(len(series))]
+            self.assertEquals(rows, expected)
+
+    def test_ascending_series(self):
+        series = [1, 2, 3, 4, 5, 6]
+        self.assertEquals(min_values(series, 2), [1, 1, 2, 3, 4, 5])
+        self.assertEquals(min_values(series), [1, 1, 1, 1, 1, 1])
+
 
 class Bottom_Values_TestCase(unittest.TestCase):
     def setUp(self):
@@ -755,6 +841,671 @@ class Bottom_Values_TestCase(unittest.TestCase):
         rows = bottom_values(series, 2)
         self.assertEquals(rows, [[21], [21], [25], [32], [22]])
 
+    def test_matches_sorted_window(self):
+        series = [5, 3, 8, 8, 1, 9, 2, 2, 7, 4, 6, 0, 9, 3]
+        for period in (1, 3, 5, None):
+            rows = bottom_values(series, period, 3)
+            for bar, row in enumerate(rows):
+                beg = 0
+                if period:
+                    beg = max(0, bar - period + 1)
+                self.assertEquals(row, sorted(series[beg:bar + 1])[:3])
+
+
+class Recent_Values_TestCase(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_empty_series(self):
+        """
+        Should return [] if empty series.
+        """
+        for func in (recentmax_values, sincemax_values, recentmin_values,
+                     sincemin_values):
+            self.assertEquals(func([], 3), [])
+
+    def test_no_series(self):
+        """
+        Must pass series of values to calculate.
+        """
+        self.assertRaises(TypeError, recentmax_values, None)
+        self.assertRaises(TypeError, sincemin_values, None)
+
+    def test_period_too_small(self):
+        series = [21, 25, 32, 55, 22]
+        self.assertRaises(ValueError, sincemax_values, series, -1)
+
+    def test_calc_nowindow(self):
+        series = [21, 25, 32, 55, 22]
+        self.assertEquals(recentmax_values(series), [0, 1, 2, 3, 3])
+        self.assertEquals(sincemax_values(series), [0, 0, 0, 0, 1])
+        self.assertEquals(recentmin_values(series), [0, 0, 0, 0, 0])
+        self.assertEquals(sincemin_values(series), [0, 1, 2, 3, 4])
+
+    def test_calc_window(self):
+        series = [21, 25, 32, 55, 22]
+        self.assertEquals(recentmax_values(series, 2), [0, 1, 2, 3, 3])
+        self.assertEquals(sincemax_values(series, 2), [0, 0, 0, 0, 1])
+        self.assertEquals(recentmin_values(series, 2), [0, 0, 1, 2, 4])
+        self.assertEquals(sincemin_values(series, 2), [0, 1, 1, 1, 0])
+
+    def test_ties_most_recent(self):
+        series = [3, 3, 1, 3, 1]
+        self.assertEquals(recentmax_values(series), [0, 1, 1, 3, 3])
+        self.assertEquals(recentmin_values(series, 3), [0, 1, 2, 2, 4])
+
+    def test_matches_brute_force(self):
+        series = [5, 3, 8, 8, 1, 9, 2, 2, 7, 4, 6, 0, 9, 3]
+        for period in (1, 3, 5, None):
+            recentmax = recentmax_values(series, period)
+            sincemax = sincemax_values(series, period)
+            recentmin = recentmin_values(series, period)
+            sincemin = sincemin_values(series, period)
+            for bar in range(len(series)):
+                beg = 0
+                if period:
+                    beg = max(0, bar - period + 1)
+                window = series[beg:bar + 1]
+                idx = beg + len(window) - 1 - window[::-1].index(max(window))
+                self.assertEquals(recentmax[bar], idx)
+                self.assertEquals(sincemax[bar], bar - idx)
+                idx = beg + len(window) - 1 - window[::-1].index(min(window))
+                self.assertEquals(recentmin[bar], idx)
+                self.assertEquals(sincemin[bar], bar - idx)
+
+
+class Covariance_Values_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.xseries = [21.25, 25.5, 32.25, 55, 22, 31.5, 30, 29.75, 41, 18]
+        self.yseries = [34, 30.5, 29, 34.25, 38, 25, 35, 36.5, 31, 33]
+
+    def brute(self, xs, ys, stat):
+        n = len(xs)
+        meanx = sum(xs) / float(n)
+        meany = sum(ys) / float(n)
+        codev = sum((x - meanx) * (y - meany) for x, y in zip(xs, ys))
+        devsqx = sum((x - meanx) ** 2 for x in xs)
+        devsqy = sum((y - meany) ** 2 for y in ys)
+        if stat == 'cov':
+            return codev / (n - 1) if n > 1 else 0.0
+        if stat == 'covp':
+            return codev / n
+        if stat == 'corr':
+            return codev / math.sqrt(devsqx * devsqy) if n > 1 else 0.0
+        beta = codev / devsqx if n > 1 else 0.0
+        if stat == 'beta':
+            return beta
+        return meany - beta * meanx
+
+    def test_empty_series(self):
+        """
+        Should return [] if empty series.
+        """
+        for func in (cov_values, covp_values, corr_values, beta_values,
+                     alpha_values):
+            self.assertEquals(func([], [], 3), [])
+
+    def test_no_series(self):
+        """
+        Must pass series of values to calculate.
+        """
+        self.assertRaises(TypeError, cov_values, None, None)
+
+    def test_length_mismatch(self):
+        self.assertRaises(ValueError, cov_values, [1, 2, 3], [1, 2], 2)
+        self.assertRaises(ValueError, beta_value, [1, 2, 3], [1, 2], 2)
+
+    def test_period_too_small(self):
+        self.assertRaises(ValueError, corr_values, self.xseries,
+                          self.yseries, -1)
+
+    def test_matches_brute_force(self):
+        funcs = {'cov': (cov_values, cov_value),
+                 'covp': (covp_values, covp_value),
+                 'corr': (corr_values, corr_value)}
+        for stat, (func, final) in funcs.items():
+            for period in (None, 1, 2, 3, 20):
+                rows = func(self.xseries, self.yseries, period)
+                for bar, row in enumerate(rows):
+                    beg = 0
+                    if period:
+                        beg = max(0, bar - period + 1)
+                    expected = self.brute(self.xseries[beg:bar + 1],
+                                          self.yseries[beg:bar + 1], stat)
+                    self.assertAlmostEqual(row, expected, 9)
+                last = final(self.xseries, self.yseries, period)
+                self.assertAlmostEqual(last, rows[-1], 9)
+
+    def test_beta_alpha_brute_force(self):
+        funcs = {'beta': (beta_values, beta_value),
+                 'alpha': (alpha_values, alpha_value)}
+        for stat, (func, final) in funcs.items():
+            for period in (None, 2, 3, 20):
+                rows = func(self.yseries, self.xseries, period)
+                for bar, row in enumerate(rows):
+                    beg = 0
+                    if period:
+                        beg = max(0, bar - period + 1)
+                    expected = self.brute(self.xseries[beg:bar + 1],
+                                          self.yseries[beg:bar + 1], stat)
+                    self.assertAlmostEqual(row, expected, 9)
+                last = final(self.yseries, self.xseries, period)
+                self.assertAlmostEqual(last, rows[-1], 9)
+
+    def test_flat_series(self):
+        series = [5.0] * 6
+        self.assertEquals(corr_values(series, self.yseries[:6], 3),
+                          [0.0] * 6)
+        self.assertEquals(beta_values(self.yseries[:6], series, 3),
+                          [0.0] * 6)
+
+    def test_price_level_stability(self):
+        rand = random.Random(11)
+        xseries = [100000.0 + rand.uniform(-1, 1) for x in range(2000)]
+        yseries = [2 * x + rand.uniform(-0.1, 0.1) for x in xseries]
+        rows = corr_values(xseries, yseries, 50)
+        expected = self.brute(xseries[-50:], yseries[-50:], 'corr')
+        self.assertAlmostEqual(rows[-1], expected, 6)
+        rows = beta_values(yseries, xseries, 50)
+        expected = self.brute(xseries[-50:], yseries[-50:], 'beta')
+        self.assertAlmostEqual(rows[-1], expected, 6)
+
+    def test_long_walk(self):
+        rand = random.Random(3)
+        xseries = [1000.0]
+        yseries = [500.0]
+        for x in range(200000):
+            xseries.append(xseries[-1] + rand.gauss(0, 1))
+            yseries.append(yseries[-1] + rand.gauss(0, 1))
+
+        rows = cov_values(xseries, yseries, 20)
+        for bar in range(len(xseries) - 20000, len(xseries), 97):
+            xs = xseries[bar - 19:bar + 1]
+            ys = yseries[bar - 19:bar + 1]
+            meanx = math.fsum(xs) / 20
+            meany = math.fsum(ys) / 20
+            expected = math.fsum((x - meanx) * (y - meany)
+                                 for x, y in zip(xs, ys)) / 19
+            devs = math.sqrt(math.fsum((x - meanx) ** 2 for x in xs) *
+                             math.fsum((y - meany) ** 2 for y in ys)) / 19
+            self.assertTrue(abs(rows[bar] - expected) <= 1e-9 * devs,
+                            "%r != %r" % (rows[bar], expected))
+
+    def test_output_buffer(self):
+        output = array.array('d', [0.0] * len(self.xseries))
+        rows = corr_values(self.xseries, self.yseries, 3, output=output)
+        self.assertTrue(rows is output)
+        self.assertEquals(list(rows),
+                          corr_values(self.xseries, self.yseries, 3))
+
+
+class Median_Values_TestCase(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_empty_series(self):
+        """
+        Should return [] if empty series.
+        """
+        series = []
+        rows = median_values(series, 3)
+        self.assertEquals(rows, [])
+
+    def test_no_series(self):
+        """
+        Must pass series of values to calculate.
+        """
+        series = None
+        self.assertRaises(TypeError, median_values, series)
+
+    def test_period_float(self):
+        series = [21, 25, 32, 55, 22]
+        rows = median_values(series, 2.0)
+        self.assertEquals(rows, [21, 23.0, 28.5, 43.5, 38.5])
+
+    def test_period_too_small(self):
+        series = [21, 25, 32, 55, 22]
+        self.assertRaises(ValueError, median_values, series, -1)
+
+    def test_calc_nowindow(self):
+        series = [21, 25, 32, 55, 22]
+        rows = median_values(series)
+        self.assertEquals(rows, [21, 23.0, 25, 28.5, 25])
+
+    def test_calc_window(self):
+        series = [21, 25, 32, 55, 22]
+        rows = median_values(series, 3)
+        self.assertEquals(rows, [21, 23.0, 25, 32, 32])
+
+    def test_matches_sorted_window(self):
+        series = [5, 3, 8, 8, 1, 9, 2, 2, 7, 4, 6, 0, 9, 3]
+        for period in (1, 2, 4, 5, None):
+            rows = median_values(series, period)
+            for bar, row in enumerate(rows):
+                self.assertEquals(row, median_value(series[:bar + 1],
+                                                    period))
+
+
+class Median_Value_TestCase(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_empty_series(self):
+        self.assertEquals(median_value([], 3), None)
+
+    def test_period_too_small(self):
+        series = [21, 25, 32, 55, 22]
+        self.assertRaises(ValueError, median_value, series, -1)
+
+    def test_calc_nowindow(self):
+        series = [21, 25, 32, 55, 22]
+        self.assertEquals(median_value(series), 25)
+
+    def test_calc_window(self):
+        series = [21, 25, 32, 55, 22]
+        self.assertEquals(median_value(series, 2), 38.5)
+
+
+class Quantile_Values_TestCase(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_empty_series(self):
+        """
+        Should return [] if empty series.
+        """
+        series = []
+        rows = quantile_values(series, 3, 0.05)
+        self.assertEquals(rows, [])
+
+    def test_no_series(self):
+        """
+        Must pass series of values to calculate.
+        """
+        series = None
+        self.assertRaises(TypeError, quantile_values, series)
+
+    def test_q_out_of_range(self):
+        series = [21, 25, 32, 55, 22]
+        self.assertRaises(ValueError, quantile_values, series, 3, 1.5)
+        self.assertRaises(ValueError, quantile_values, series, 3, [0.5, -0.1])
+
+    def test_period_too_small(self):
+        series = [21, 25, 32, 55, 22]
+        self.assertRaises(ValueError, quantile_values, series, -1)
+
+    def test_calc_window(self):
+        series = [21, 25, 32, 55, 22]
+        rows = quantile_values(series, 3, 0.75)
+        self.assertEquals(rows, [21, 24.0, 28.5, 43.5, 43.5])
+
+    def test_calc_list(self):
+        series = [21, 25, 32, 55, 22]
+        rows = quantile_values(series, None, [0, 0.5, 1])
+        self.assertEquals(rows, [[21, 21, 21], [21, 23.0, 25], [21, 25, 32],
+                                 [21, 28.5, 55], [21, 25, 55]])
+
+    def test_median_matches(self):
+        series = [5, 3, 8, 8, 1, 9, 2, 2, 7, 4, 6, 0, 9, 3]
+        for period in (1, 2, 5, None):
+            rows = quantile_values(series, period, 0.5)
+            self.assertEquals(rows, median_values(series, period))
+
+    def test_matches_value(self):
+        series = [5, 3, 8, 8, 1, 9, 2, 2, 7, 4, 6, 0, 9, 3]
+        qs = [0.01, 0.05, 0.95, 0.99]
+        for period in (1, 3, 6, None):
+            rows = quantile_values(series, period, qs)
+            for bar, row in enumerate(rows):
+                self.assertEquals(row, quantile_value(series[:bar + 1],
+                                                      period, qs))
+
+
+class Describe_Values_TestCase(StatTestCase):
+    def setUp(self):
+        pass
+
+    def test_empty_series(self):
+        rows = describe_values([], 3, ['sma', 'max'])
+        self.assertEquals(rows, {'sma': [], 'max': []})
+
+    def test_no_series(self):
+        self.assertRaises(TypeError, describe_values, None)
+
+    def test_unknown_stat(self):
+        series = [21, 25, 32, 55, 22]
+        self.assertRaises(ValueError, describe_values, series, 3, ['median'])
+
+    def test_period_too_small(self):
+        series = [21, 25, 32, 55, 22]
+        self.assertRaises(ValueError, describe_values, series, -1)
+
+    def test_matches_values_functions(self):
+        series = [21.25, 25.5, 32.25, 55, 22, 31.5, 30, 29.75, 41, 18]
+        funcs = {'sum': sum_values, 'sma': sma_values, 'ema': ema_values,
+                 'wwma': wwma_values, 'psa': psa_values,
+                 'varp': varp_values, 'var': var_values,
+                 'stdp': stdp_values, 'std': std_values,
+                 'max': max_values, 'min': min_values}
+        for period in (None, 2, 3, 3.0, 20):
+            rows = describe_values(series, period)
+            self.assertEquals(sorted(rows), sorted(funcs))
+            for name, func in funcs.items():
+                self.assertEquals(rows[name], func(series, period))
+
+    def test_long_series(self):
+        # long enough for the moments pass to re-anchor the means
+        series = random_prices(random.Random(11), 2000)
+        rows = describe_values(series, 5, ['sma', 'std', 'max'])
+        self.assertClose(rows['sma'], sma_values(series, 5))
+        self.assertEquals(rows['std'], std_values(series, 5))
+        self.assertEquals(rows['max'], max_values(series, 5))
+
+    def test_smoothing(self):
+        series = [21.25, 25.5, 32.25, 55, 22, 31.5, 30, 29.75, 41, 18]
+        for period in (None, 3):
+            rows = describe_values(series, period, ['ema'], 0.25)
+            self.assertEquals(rows['ema'], ema_values(series, period, 0.25))
+
+        self.assertRaises(ValueError, describe_values, series, 3, ['ema'], 2)
+
+    def test_subset(self):
+        series = [21, 25, 32, 55, 22]
+        rows = describe_values(series, 1, ['varp', 'min'])
+        self.assertEquals(rows, {'varp': [0.0] * 5, 'min': series})
+
+
+class Output_Buffer_TestCase(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_array_output(self):
+        series = [21, 25, 32, 55, 22]
+        funcs = [sum_values, sma_values, ema_values, wwma_values, psa_values,
+                 varp_values, var_values, stdp_values, std_values,
+                 max_values, min_values]
+        for func in funcs:
+            for period in (None, 3):
+                output = array.array('d', [0.0] * len(series))
+                rows = func(series, period, output=output)
+                self.assertTrue(rows is output)
+                self.assertEquals(list(rows), func(series, period))
+
+    def test_buffer_output(self):
+        series = [21.25, 25.5, 32.25]
+        output = bytearray(8 * len(series))
+        rows = sma_values(series, 2, output=output)
+        self.assertTrue(rows is output)
+        view = memoryview(output).cast('d')
+        self.assertEquals(view.tolist(), sma_values(series, 2))
+
+    def test_larger_output(self):
+        series = [21, 25, 32]
+        output = array.array('d', [-1.0] * 5)
+        sum_values(series, 2, output=output)
+        self.assertEquals(list(output), [21.0, 46.0, 57.0, -1.0, -1.0])
+
+    def test_output_too_small(self):
+        series = [21, 25, 32, 55, 22]
+        output = array.array('d', [0.0] * 3)
+        self.assertRaises(ValueError, sum_values, series, 3, output)
+
+    def test_readonly_output(self):
+        series = [21, 25, 32, 55, 22]
+        self.assertRaises(TypeError, sum_values, series, 3, bytes(40))
+
+    def test_wrong_item_format(self):
+        series = [21, 25, 32, 55, 22]
+        for typecode in ('f', 'q'):
+            output = array.array(typecode, [0] * len(series))
+            self.assertRaises(TypeError, sum_values, series, 3, output)
+
+
+class Sweep_TestCase(StatTestCase):
+    def setUp(self):
+        rand = random.Random(13)
+        self.series = random_prices(rand, 200)
+        self.periods = [1, 2, 3, 3.0, 20, 250, None]
+
+    def test_sum_sweep(self):
+        results = sum_sweep(self.series, self.periods)
+        self.assertEquals(len(results), len(self.periods))
+        for row, period in zip(results, self.periods):
+            self.assertClose(row, sum_values(self.series, period))
+
+    def test_sum_sweep_ints(self):
+        series = [21, 25, 32, 55, 22]
+        results = sum_sweep(series, [3, None])
+        self.assertEquals(results, [sum_values(series, 3), sum_values(series)])
+
+    def test_sma_sweep(self):
+        results = sma_sweep(self.series, self.periods)
+        for row, period in zip(results, self.periods):
+            self.assertClose(row, sma_values(self.series, period))
+
+    def test_ema_sweep(self):
+        results = ema_sweep(self.series, self.periods)
+        for row, period in zip(results, self.periods):
+            self.assertEquals(row, ema_values(self.series, period))
+
+        results = ema_sweep(self.series, self.periods, 0.25)
+        for row, period in zip(results, self.periods):
+            self.assertEquals(row, ema_values(self.series, period, 0.25))
+
+    def test_wwma_sweep(self):
+        results = wwma_sweep(self.series, self.periods)
+        for row, period in zip(results, self.periods):
+            self.assertEquals(row, wwma_values(self.series, period))
+
+    def test_empty_series(self):
+        self.assertEquals(sma_sweep([], [2, 3]), [[], []])
+        self.assertEquals(ema_sweep([], [2, 3]), [[], []])
+
+    def test_period_too_small(self):
+        self.assertRaises(ValueError, sma_sweep, self.series, [3, -1])
+        self.assertRaises(ValueError, ema_sweep, self.series, [3], 1.5)
+
+
+class Bollinger_Values_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.series = [21.25, 25.5, 32.25, 55, 22, 31.5, 30, 29.75, 41, 18]
+
+    def test_empty_series(self):
+        """
+        Should return ([], [], []) if empty series.
+        """
+        self.assertEquals(bollinger_values([], 3), ([], [], []))
+
+    def test_no_series(self):
+        """
+        Must pass series of values to calculate.
+        """
+        self.assertRaises(TypeError, bollinger_values, None)
+
+    def test_period_too_small(self):
+        self.assertRaises(ValueError, bollinger_values, self.series, -1)
+
+    def test_matches_composed(self):
+        for period in (None, 1, 2, 3, 20):
+            for k, population, func in ((2, True, stdp_values),
+                                        (1.5, False, std_values)):
+                upper, middle, lower = bollinger_values(self.series, period,
+                                                        k, population)
+                means = sma_values(self.series, period)
+                stds = func(self.series, period)
+                for bar in range(len(self.series)):
+                    self.assertAlmostEqual(middle[bar], means[bar], 9)
+                    self.assertAlmostEqual(upper[bar],
+                                           means[bar] + k * stds[bar], 9)
+                    self.assertAlmostEqual(lower[bar],
+                                           means[bar] - k * stds[bar], 9)
+
+    def test_output_buffers(self):
+        output = tuple(array.array('d', [0.0] * len(self.series))
+                       for band in range(3))
+        bands = bollinger_values(self.series, 3, output=output)
+        self.assertTrue(all(band is buf for band, buf in zip(bands, output)))
+        self.assertEquals([list(band) for band in bands],
+                          list(bollinger_values(self.series, 3)))
+
+
+class Zscore_Values_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.series = [21.25, 25.5, 32.25, 55, 22, 31.5, 30, 29.75, 41, 18]
+
+    def test_empty_series(self):
+        """
+        Should return [] if empty series.
+        """
+        self.assertEquals(zscore_values([], 3), [])
+
+    def test_no_series(self):
+        """
+        Must pass series of values to calculate.
+        """
+        self.assertRaises(TypeError, zscore_values, None)
+
+    def test_period_too_small(self):
+        self.assertRaises(ValueError, zscore_values, self.series, -1)
+
+    def test_matches_composed(self):
+        for period in (None, 1, 2, 3, 20):
+            for population, func in ((False, std_values),
+                                     (True, stdp_values)):
+                rows = zscore_values(self.series, period, population)
+                means = sma_values(self.series, period)
+                stds = func(self.series, period)
+                for x, row, mean, std in zip(self.series, rows, means, stds):
+                    expected = 0.0
+                    if std:
+                        expected = (x - mean) / std
+                    self.assertAlmostEqual(row, expected, 9)
+
+    def test_flat_window(self):
+        self.assertEquals(zscore_values([5, 5, 5, 5], 2), [0.0] * 4)
+
+    def test_output_buffer(self):
+        output = array.array('d', [0.0] * len(self.series))
+        rows = zscore_values(self.series, 3, output=output)
+        self.assertTrue(rows is output)
+        self.assertEquals(list(rows), zscore_values(self.series, 3))
+
+
+class Resume_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.series = [21.25, 25.5, 32.25, 55, 22, 31.5, 30, 29.75, 41, 18,
+                       33, 35.5, 28.25, 40, 39.5]
+        self.funcs = [(sum_values, rolling.RollingSum, ()),
+                      (sma_values, rolling.RollingSMA, ()),
+                      (ema_values, rolling.RollingEMA, ()),
+                      (wwma_values, rolling.RollingWWMA, ()),
+                      (psa_values, rolling.RollingPSA, ()),
+                      (varp_values, rolling.RollingVar, (True,)),
+                      (var_values, rolling.RollingVar, ()),
+                      (stdp_values, rolling.RollingStd, (True,)),
+                      (std_values, rolling.RollingStd, ()),
+                      (max_values, rolling.RollingMax, ()),
+                      (min_values, rolling.RollingMin, ()),
+                      (top_values, rolling.RollingTopN, (2,)),
+                      (bottom_values, rolling.RollingBottomN, (2,)),
+                      (median_values, rolling.RollingMedian, ()),
+                      (recentmax_values, rolling.RollingRecentMax, ()),
+                      (sincemax_values, rolling.RollingSinceMax, ()),
+                      (recentmin_values, rolling.RollingRecentMin, ()),
+                      (sincemin_values, rolling.RollingSinceMin, ())]
+
+    def test_matches_full_history(self):
+        for func, cls, args in self.funcs:
+            for period in (None, 1, 3, 20):
+                expected = func(self.series, period)
+                for split in (0, 1, 2, 7, 15):
+                    if func in (top_values, bottom_values):
+                        state = cls(period, *args)
+                        rows = func(self.series[:split], period, 2,
+                                    state=state)
+                        rows += func(self.series[split:], period, 2,
+                                     state=state)
+                        expected = func(self.series, period, 2)
+                    else:
+                        state = cls(period, *args)
+                        rows = func(self.series[:split], period, state=state)
+                        rows += func(self.series[split:], period,
+                                     state=state)
+                    self.assertEquals(rows, expected)
+                    self.assertEquals(state.count, len(self.series))
+
+    def test_quantile(self):
+        for q in (0.25, [0.1, 0.5, 0.9]):
+            for period in (None, 3, 20):
+                state = rolling.RollingQuantile(period, q)
+                rows = quantile_values(self.series[:6], period, q,
+                                       state=state)
+                rows += quantile_values(self.series[6:], period, q,
+                                        state=state)
+                self.assertEquals(rows,
+                                  quantile_values(self.series, period, q))
+
+    def test_bollinger_zscore(self):
+        for population in (True, False):
+            for period in (None, 3, 20):
+                state = rolling.RollingVar(period, population)
+                bands = bollinger_values(self.series[:6], period, 2,
+                                         population, state=state)
+                resumed = bollinger_values(self.series[6:], period, 2,
+                                           population, state=state)
+                expected = bollinger_values(self.series, period, 2,
+                                            population)
+                for head, tail, band in zip(bands, resumed, expected):
+                    self.assertEquals(head + tail, band)
+
+                state = rolling.RollingVar(period, population)
+                rows = zscore_values(self.series[:6], period, population,
+                                     state=state)
+                rows += zscore_values(self.series[6:], period, population,
+                                      state=state)
+                self.assertEquals(rows, zscore_values(self.series, period,
+                                                      population))
+
+    def test_one_bar_at_a_time(self):
+        state = rolling.RollingEMA(5)
+        rows = []
+        for newx in self.series:
+            rows += ema_values([newx], 5, state=state)
+        self.assertEquals(rows, ema_values(self.series, 5))
+
+    def test_output_buffer(self):
+        state = rolling.RollingSMA(3)
+        sma_values(self.series[:10], 3, state=state)
+        output = array.array('d', [0.0] * 5)
+        rows = sma_values(self.series[10:], 3, output=output, state=state)
+        self.assertTrue(rows is output)
+        self.assertEquals(list(rows), sma_values(self.series, 3)[10:])
+
+    def test_state_mismatch(self):
+        self.assertRaises(ValueError, sma_values, self.series, 3,
+                          state=rolling.RollingSMA(4))
+        self.assertRaises(ValueError, sma_values, self.series, 3,
+                          state=rolling.RollingEMA(3))
+        self.assertRaises(ValueError, var_values, self.series, 3,
+                          state=rolling.RollingVar(3, True))
+        self.assertRaises(ValueError, ema_values, self.series, 3, 0.25,
+                          state=rolling.RollingEMA(3))
+        self.assertRaises(ValueError, top_values, self.series, 3, 2,
+                          state=rolling.RollingTopN(3, 1))
+        self.assertRaises(ValueError, quantile_values, self.series, 3, 0.25,
+                          state=rolling.RollingQuantile(3, 0.75))
+        self.assertRaises(ValueError, recentmax_values, self.series, 3,
+                          state=rolling.RollingSinceMax(3))
+        self.assertRaises(ValueError, zscore_values, self.series, 3,
+                          state=rolling.RollingVar(3, True))
+        self.assertRaises(ValueError, bollinger_values, self.series, 3,
+                          state=rolling.RollingStd(3, True))
+
+    def test_period_float(self):
+        state = rolling.RollingMax(3)
+        rows = max_values(self.series, 3.0, state=state)
+        self.assertEquals(rows, max_values(self.series, 3))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Test the expr module against the core module.
+
+"""
+
+import sys
+import os
+import random
+import unittest
+
+#Forced to manipulate path - have yet to find alternative built-in method.
+libpath = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if not libpath in sys.path:
+    sys.path.insert(1, libpath)
+del libpath
+
+from helpers import StatTestCase, random_prices
+from core import *
+from expr import *
+from expr import _Plan
+
+rand = random.Random(9)
+SERIES = random_prices(rand, 300)
+OTHERS = random_prices(rand, 300)
+
+
+class Expr_TestCase(StatTestCase):
+    def setUp(self):
+        self.x = series('x')
+
+    def test_matches_core(self):
+        funcs = {'sum': sum_values, 'sma': sma_values, 'ema': ema_values,
+                 'wwma': wwma_values, 'psa': psa_values,
+                 'varp': varp_values, 'var': var_values,
+                 'stdp': stdp_values, 'std': std_values,
+                 'max': max_values, 'min': min_values}
+        for name, func in funcs.items():
+            for period in (None, 1, 3, 20):
+                node = getattr(self.x, name)(period)
+                self.assertClose(evaluate(node, x=SERIES),
+                                 func(SERIES, period))
+
+    def test_composed(self):
+        node = self.x.sma(10).std(20)
+        self.assertClose(evaluate(node, x=SERIES),
+                         std_values(sma_values(SERIES, 10), 20))
+
+    def test_zscore(self):
+        node = (self.x - self.x.sma(20)) / self.x.std(20)
+        means = sma_values(SERIES, 20)
+        stds = std_values(SERIES, 20)
+        expected = [(x - m) / s if s else 0.0
+                    for x, m, s in zip(SERIES, means, stds)]
+        self.assertClose(evaluate(node, x=SERIES), expected)
+
+    def test_common_subexpressions(self):
+        x = self.x
+        first = (x - x.sma(20)) / x.std(20)
+        second = x.sma(20) + 2 * x.std(20)
+        third = (x - x.sma(20)) / x.std(20)
+        plan = _Plan([first, second, third], ['x'])
+        kinds = [step[0] for step in plan.steps]
+        self.assertEquals(kinds.count('series'), 1)
+        self.assertEquals(kinds.count('moments'), 1)
+        self.assertEquals(kinds.count('moment'), 2)
+        self.assertEquals(plan.outputs[0], plan.outputs[2])
+
+    def test_two_series(self):
+        y = series('y')
+        node = self.x.sma(5) - y.sma(5)
+        expected = [a - b for a, b in zip(sma_values(SERIES, 5),
+                                          sma_values(OTHERS, 5))]
+        self.assertClose(evaluate(node, x=SERIES, y=OTHERS), expected)
+
+    def test_stream_iterators(self):
+        node = self.x.max(3) - self.x.min(3)
+        rows = stream([node, self.x.ema(3)], x=iter(SERIES))
+        self.assertEquals(next(rows), [0.0, SERIES[0]])
+        self.assertEquals(len(list(rows)), len(SERIES) - 1)
+
+    def test_operators(self):
+        x = self.x
+        results = evaluate([x + 1, 1 + x, x - 1, 1 - x, x * 2, 2 * x,
+                            x / 2, 2 / x, -x], x=[4.0])
+        self.assertEquals([row[0] for row in results],
+                          [5.0, 5.0, 3.0, -3.0, 8.0, 8.0, 2.0, 0.5, -4.0])
+
+    def test_divide_by_zero(self):
+        node = self.x / self.x.std(3)
+        self.assertEquals(evaluate(node, x=[5, 5, 5]), [0.0, 0.0, 0.0])
+
+    def test_missing_input(self):
+        self.assertRaises(ValueError, evaluate, self.x.sma(3), y=SERIES)
+
+    def test_length_mismatch(self):
+        node = self.x.sma(3) - series('y')
+        self.assertRaises(ValueError, evaluate, node, x=[1, 2, 3], y=[1, 2])
+        rows = stream(node, x=iter([1, 2, 3]), y=iter([1, 2]))
+        self.assertRaises(ValueError, list, rows)
+
+    def test_period_too_small(self):
+        self.assertRaises(ValueError, self.x.sma, -1)
+        self.assertRaises(ValueError, self.x.ema, 3, 1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Test the matrix module.
+
+"""
+
+import sys
+import os
+import array
+import random
+import shutil
+import tempfile
+import unittest
+
+#Forced to manipulate path - have yet to find alternative built-in method.
+libpath = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if not libpath in sys.path:
+    sys.path.insert(1, libpath)
+del libpath
+
+from helpers import random_prices, StatTestCase
+import matrix
+from core import *
+from matrix import *
+
+rand = random.Random(5)
+UNIVERSE = [random_prices(rand, 40)
+            for size in range(4)]
+UNIVERSE.append([25.0] * 40)
+
+
+class Corr_Matrix_TestCase(StatTestCase):
+    def setUp(self):
+        pass
+
+    def assertMatches(self, results, period):
+        for bar, corr in enumerate(results):
+            for idx, xseries in enumerate(UNIVERSE):
+                for jdx, yseries in enumerate(UNIVERSE):
+                    expected = corr_values(xseries[:bar + 1],
+                                           yseries[:bar + 1], period)[-1]
+                    self.assertAlmostEqual(corr[idx][jdx], expected, 9)
+
+    def test_matches_corr_values(self):
+        for period in (None, 1, 3, 10):
+            results = corr_matrix_values(UNIVERSE, period)
+            self.assertEquals(len(results), 40)
+            self.assertMatches(results, period)
+
+    def test_pure_python(self):
+        saved = matrix.HAS_NUMPY
+        matrix.HAS_NUMPY = False
+        try:
+            for period in (None, 3):
+                results = corr_matrix_values(UNIVERSE, period)
+                self.assertTrue(isinstance(results[-1], list))
+                self.assertMatches(results, period)
+        finally:
+            matrix.HAS_NUMPY = saved
+
+    def test_covariance(self):
+        stat = RollingCorrMatrix(len(UNIVERSE), 10)
+        stat.extend(zip(*UNIVERSE))
+        for population, func in ((False, cov_values), (True, covp_values)):
+            cov = stat.covariance(population)
+            for idx, xseries in enumerate(UNIVERSE):
+                for jdx, yseries in enumerate(UNIVERSE):
+                    self.assertAlmostEqual(cov[idx][jdx],
+                                           func(xseries, yseries, 10)[-1], 9)
+
+    def test_long_walk(self):
+        # 10000 low volatility bars, enough slides to drift without the
+        # re-anchoring shared with cov_values.
+        walk = random.Random(3)
+        xseries = [100000 + walk.uniform(-0.01, 0.01) for x in range(10000)]
+        yseries = [50000 + walk.uniform(-0.01, 0.01) for x in range(10000)]
+        for flag in (True, False):
+            saved = matrix.HAS_NUMPY
+            matrix.HAS_NUMPY = flag and saved
+            try:
+                stat = RollingCorrMatrix(2, 10)
+                stat.extend(zip(xseries, yseries))
+                cov = stat.covariance()[0][1]
+            finally:
+                matrix.HAS_NUMPY = saved
+
+            # The covariance is about 3e-5, so compare relative to it.
+            expected = cov_values(xseries, yseries, 10)[-1]
+            self.assertClose([cov / expected], [1.0])
+
+    def test_expanding_keeps_no_window(self):
+        stat = RollingCorrMatrix(len(UNIVERSE))
+        stat.extend(zip(*UNIVERSE))
+        self.assertEquals(len(stat._window), 0)
+        self.assertEquals(stat.count, 40)
+        cov = stat.covariance()
+        for idx, xseries in enumerate(UNIVERSE):
+            for jdx, yseries in enumerate(UNIVERSE):
+                self.assertAlmostEqual(cov[idx][jdx],
+                                       cov_values(xseries, yseries)[-1], 9)
+
+    def test_stream(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'corr.f8')
+            stat = RollingCorrMatrix(len(UNIVERSE), 5)
+            self.assertEquals(stat.stream(zip(*UNIVERSE), path), 40)
+
+            data = array.array('d')
+            with open(path, 'rb') as infile:
+                data.frombytes(infile.read())
+
+            size = len(UNIVERSE) ** 2
+            self.assertEquals(len(data), 40 * size)
+            expected = corr_matrix_values(UNIVERSE, 5)[-1]
+            for idx, line in enumerate(expected):
+                beg = 39 * size + idx * len(UNIVERSE)
+                self.assertEquals(list(data[beg:beg + len(UNIVERSE)]),
+                                  list(line))
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_row_size_mismatch(self):
+        stat = RollingCorrMatrix(3, 5)
+        self.assertRaises(ValueError, stat.push, [1.0, 2.0])
+
+    def test_series_length_mismatch(self):
+        self.assertRaises(ValueError, corr_matrix_values, [[1, 2], [1]], 2)
+
+    def test_period_too_small(self):
+        self.assertRaises(ValueError, RollingCorrMatrix, 3, -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Test the mmapio module.
+
+"""
+
+import sys
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+#Forced to manipulate path - have yet to find alternative built-in method.
+libpath = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if not libpath in sys.path:
+    sys.path.insert(1, libpath)
+del libpath
+
+from helpers import random_prices
+from core import *
+from mmapio import *
+import mmapio
+
+
+class Compute_File_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.inpath = os.path.join(self.tmpdir, 'series.f8')
+
+        rand = random.Random(9)
+        self.series = random_prices(rand, 257)
+        write_series(self.inpath, self.series)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def outpath(self, name):
+        return os.path.join(self.tmpdir, name + '.f8')
+
+    def test_matches_core(self):
+        funcs = {'sum': sum_values, 'sma': sma_values, 'ema': ema_values,
+                 'wwma': wwma_values, 'psa': psa_values,
+                 'varp': varp_values, 'var': var_values,
+                 'stdp': stdp_values, 'std': std_values,
+                 'max': max_values, 'min': min_values}
+        outputs = dict((name, self.outpath(name)) for name in funcs)
+        for period in (None, 5, 20):
+            for chunksize in (1, 7, 20, 1000):
+                count = compute_file(self.inpath, outputs, period,
+                                     chunksize=chunksize)
+                self.assertEquals(count, len(self.series))
+
+                for name, func in funcs.items():
+                    rows = read_series(outputs[name]).tolist()
+                    self.assertEquals(rows, func(self.series, period))
+
+    def test_empty_series(self):
+        write_series(self.inpath, [])
+        outpath = self.outpath('sma')
+        self.assertEquals(compute_file(self.inpath, {'sma': outpath}, 3), 0)
+        self.assertEquals(read_series(outpath).tolist(), [])
+
+    def test_unknown_stat(self):
+        outputs = {'median': self.outpath('median')}
+        self.assertRaises(ValueError, compute_file, self.inpath, outputs, 3)
+
+    def test_bad_file_size(self):
+        infile = open(self.inpath, 'ab')
+        infile.write(b'\0')
+        infile.close()
+        outputs = {'sma': self.outpath('sma')}
+        self.assertRaises(ValueError, compute_file, self.inpath, outputs, 3)
+
+    def test_push_error(self):
+        class Failing(object):
+            def push(self, value):
+                raise ZeroDivisionError("push failed")
+
+        original = mmapio.rolling_stat
+        mmapio.rolling_stat = lambda name, period, smoothing: Failing()
+        try:
+            outputs = {'sma': self.outpath('sma'), 'max': self.outpath('max')}
+            self.assertRaises(ZeroDivisionError, compute_file, self.inpath,
+                              outputs, 3)
+
+        finally:
+            mmapio.rolling_stat = original
+
+        self.assertEquals(compute_file(self.inpath, outputs, 3),
+                          len(self.series))
+
+    def test_bad_chunksize(self):
+        outputs = {'sma': self.outpath('sma')}
+        self.assertRaises(ValueError, compute_file, self.inpath, outputs, 3,
+                          None, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Test the npcore module against the pure Python core module.
+
+"""
+
+import sys
+import os
+import math
+import random
+import unittest
+
+#Forced to manipulate path - have yet to find alternative built-in method.
+libpath = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if not libpath in sys.path:
+    sys.path.insert(1, libpath)
+del libpath
+
+from helpers import StatTestCase
+import core
+import npcore
+
+SERIES = [21, 25, 32, 55, 22]
+
+rand = random.Random(11)
+LONG_SERIES = [30000.0 + rand.gauss(0, 25) for x in range(1500)]
+
+
+@unittest.skipIf(not npcore.HAS_NUMPY, "numpy is not installed")
+class NpCore_TestCase(StatTestCase):
+    def setUp(self):
+        pass
+
+    def check(self, name, *args):
+        for series in (SERIES, LONG_SERIES):
+            for period in (None, 1, 3, 20, 5000):
+                rows = getattr(npcore, name)(series, period, *args)
+                expected = getattr(core, name)(series, period, *args)
+                self.assertClose(rows, expected)
+
+    def test_sum_values(self):
+        self.check('sum_values')
+
+    def test_sma_values(self):
+        self.check('sma_values')
+
+    def test_psa_values(self):
+        self.check('psa_values')
+
+    def test_ema_values(self):
+        self.check('ema_values')
+        self.check('ema_values', 0.0)
+        self.check('ema_values', 1.0)
+
+    def test_wwma_values(self):
+        self.check('wwma_values')
+
+    def test_var_values(self):
+        for series in (SERIES, LONG_SERIES):
+            for period in (None, 3, 20, 5000):
+                for name in ('var_values', 'varp_values',
+                             'std_values', 'stdp_values'):
+                    rows = getattr(npcore, name)(series, period)
+                    expected = [getattr(core, name[:-1])(series[:bar + 1],
+                                                         period)
+                                for bar in range(len(series))]
+                    expected[0] = 0.0
+                    self.assertClose(rows, expected, 1e-9)
+
+    def test_var_long_walk(self):
+        rng = npcore.np.random.RandomState(5)
+        walk = 1000.0 + npcore.np.cumsum(rng.standard_normal(2000000))
+        for period in (20, 1000):
+            rows = npcore.var_values(walk, period)
+            for bar in range(period, len(walk), 9973):
+                window = walk[bar - period + 1:bar + 1].tolist()
+                mean = math.fsum(window) / period
+                expected = math.fsum((x - mean) ** 2 for x in window)
+                expected /= period - 1
+                self.assertTrue(abs(rows[bar] - expected) <= 1e-9 * expected,
+                                "%r != %r" % (rows[bar], expected))
+
+    def test_max_values(self):
+        self.check('max_values')
+
+    def test_min_values(self):
+        self.check('min_values')
+
+    def test_top_values(self):
+        self.assertEquals(npcore.top_values(SERIES, 2, 2),
+                          core.top_values(SERIES, 2, 2))
+        self.assertEquals(npcore.bottom_values(SERIES, 2, 2),
+                          core.bottom_values(SERIES, 2, 2))
+
+    def test_empty_series(self):
+        self.assertEquals(npcore.sma_values([], 3).tolist(), [])
+        self.assertEquals(npcore.ema_values([], 3).tolist(), [])
+        self.assertEquals(npcore.max_values([], 3).tolist(), [])
+
+    def test_no_series(self):
+        self.assertRaises(TypeError, npcore.sma_values, None)
+
+    def test_period_too_small(self):
+        self.assertRaises(ValueError, npcore.sma_values, SERIES, -1)
+        self.assertRaises(ValueError, npcore.ema_values, SERIES, 3, 2.0)
+
+
+@unittest.skipIf(not npcore.HAS_NUMPY, "numpy is not installed")
+class Batch_TestCase(StatTestCase):
+    def setUp(self):
+        self.universe = [LONG_SERIES[beg:beg + 300]
+                         for beg in range(0, 1200, 100)]
+
+    def test_matrix(self):
+        matrix = npcore.np.array(self.universe)
+        names = ('sum', 'sma', 'ema', 'wwma', 'psa', 'varp', 'var',
+                 'stdp', 'std', 'max', 'min')
+        for name in names:
+            for period in (None, 3, 20):
+                results = getattr(npcore, name + '_batch')(matrix, period)
+                self.assertEquals(results.shape, matrix.shape)
+                func = getattr(npcore, name + '_values')
+                for row, series in zip(results, self.universe):
+                    self.assertClose(row, func(series, period))
+
+    def test_ragged(self):
+        universe = [series[:size] for series, size in
+                    zip(self.universe, (0, 1, 2, 5, 50, 300))]
+        names = ('sum', 'sma', 'ema', 'wwma', 'psa', 'varp', 'var',
+                 'stdp', 'std', 'max', 'min')
+        for name in names:
+            for period in (None, 3, 20):
+                results = getattr(npcore, name + '_batch')(universe, period)
+                self.assertEquals(len(results), len(universe))
+                func = getattr(npcore, name + '_values')
+                for row, series in zip(results, universe):
+                    self.assertClose(row, func(series, period), 1e-9)
+
+    def test_ema_smoothing(self):
+        results = npcore.ema_batch(self.universe, 10, 0.5)
+        for row, series in zip(results, self.universe):
+            self.assertClose(row, core.ema_values(series, 10, 0.5))
+
+    def test_empty(self):
+        self.assertEquals(npcore.sma_batch([], 3), [])
+
+    def test_bad_shape(self):
+        matrix = npcore.np.zeros((2, 3, 4))
+        self.assertRaises(ValueError, npcore.sma_batch, matrix, 3)
+
+
+@unittest.skipIf(not npcore.HAS_NUMPY, "numpy is not installed")
+class Sweep_TestCase(StatTestCase):
+    def setUp(self):
+        self.periods = [1, 2, 3, 20, 2000, None]
+
+    def check(self, name, *args):
+        results = getattr(npcore, name + '_sweep')(LONG_SERIES, self.periods,
+                                                   *args)
+        self.assertEquals(results.shape, (len(self.periods), len(LONG_SERIES)))
+        for row, period in zip(results, self.periods):
+            expected = getattr(core, name + '_values')(LONG_SERIES, period,
+                                                       *args)
+            self.assertClose(row, expected)
+
+    def test_sum_sweep(self):
+        self.check('sum')
+
+    def test_sma_sweep(self):
+        self.check('sma')
+
+    def test_ema_sweep(self):
+        self.check('ema')
+        self.check('ema', 0.25)
+
+    def test_wwma_sweep(self):
+        self.check('wwma')
+
+
+if __name__ == "__main__":
+    unittest.main()
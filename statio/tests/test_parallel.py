@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Test the parallel module.
+
+"""
+
+import sys
+import os
+import random
+import subprocess
+import multiprocessing
+import unittest
+
+#Forced to manipulate path - have yet to find alternative built-in method.
+libpath = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if not libpath in sys.path:
+    sys.path.insert(1, libpath)
+
+from helpers import StatTestCase, random_prices
+import parallel
+from core import *
+from parallel import *
+from rolling import RollingEMA, RollingWWMA
+
+rand = random.Random(17)
+UNIVERSE = [random_prices(rand, size)
+            for size in (0, 1, 5, 50, 300)]
+
+
+class Map_Values_TestCase(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_matches_core(self):
+        funcs = [sum_values, sma_values, ema_values, wwma_values, psa_values,
+                 varp_values, var_values, stdp_values, std_values,
+                 max_values, min_values]
+        for func in funcs:
+            results = map_values(func, UNIVERSE, 20, processes=2)
+            self.assertEquals(len(results), len(UNIVERSE))
+            for row, series in zip(results, UNIVERSE):
+                self.assertEquals(list(row), func(series, 20))
+
+    def test_shared_pool(self):
+        pool = multiprocessing.Pool(2)
+        try:
+            for period in (None, 3):
+                results = map_values('ema_values', UNIVERSE, period, (0.25,),
+                                     pool=pool)
+                for row, series in zip(results, UNIVERSE):
+                    self.assertEquals(list(row),
+                                      ema_values(series, period, 0.25))
+        finally:
+            pool.close()
+            pool.join()
+
+    def test_reused_pool_exits_cleanly(self):
+        # blocks left tracked by spawned workers are reported at exit
+        script = '; '.join((
+            "import sys, multiprocessing",
+            "sys.path.insert(0, %r)" % libpath,
+            "from parallel import map_values",
+            "pool = multiprocessing.get_context('spawn').Pool(2)",
+            "[map_values('sma_values', [[1, 2, 3], [4, 5]], 2, pool=pool) "
+            "for x in range(2)]",
+            "pool.close()",
+            "pool.join()"))
+        proc = subprocess.Popen([sys.executable, '-c', script],
+                                stderr=subprocess.PIPE)
+        stderr = proc.communicate()[1]
+        self.assertEquals(proc.returncode, 0)
+        self.assertEquals(stderr.decode('utf-8', 'replace'), '')
+
+    def test_empty_universe(self):
+        self.assertEquals(map_values(sma_values, [], 3, processes=1), [])
+
+    def test_unsupported_function(self):
+        self.assertRaises(ValueError, map_values, top_values, UNIVERSE, 3)
+
+    def test_period_too_small(self):
+        self.assertRaises(ValueError, map_values, sma_values, UNIVERSE, -1,
+                          (), 1)
+
+
+SERIES = random_prices(rand, 500)
+
+
+class Chunk_Values_TestCase(StatTestCase):
+    def setUp(self):
+        pass
+
+    def test_matches_core(self):
+        funcs = [sum_values, sma_values, ema_values, wwma_values, psa_values,
+                 varp_values, var_values, stdp_values, std_values,
+                 max_values, min_values]
+        for func in funcs:
+            for period in (None, 1, 20, 150):
+                results = chunk_values(func, SERIES, period, chunks=7,
+                                       processes=2)
+                # the root of a 1e-14 variance residue of a 1 bar window
+                tolerance = 1e-9
+                if (period == 1) and (func in (stdp_values, std_values)):
+                    tolerance = 1e-6
+                self.assertClose(results, func(SERIES, period), tolerance)
+
+    def test_smoothing(self):
+        for period in (None, 3):
+            results = chunk_values('ema_values', SERIES, period, (0.25,),
+                                   chunks=4, processes=2)
+            self.assertClose(results, ema_values(SERIES, period, 0.25))
+
+    def test_recurrence_scale(self):
+        # the scale is the change in the chunk's last average per unit
+        # change in the average before it
+        for cls, args in ((RollingEMA, ()), (RollingEMA, (0.25,)),
+                          (RollingWWMA, ())):
+            for period in (None, 1, 20):
+                for beg, end in ((0, 30), (5, 12), (5, 40), (25, 60)):
+                    lastvals = []
+                    for lastval in (0.0, 1.0):
+                        stat = cls(period, *args)
+                        if beg:
+                            stat.count = beg
+                            stat.value = lastval
+                        stat.extend(SERIES[beg:end])
+                        lastvals.append(stat.value)
+                    self.assertClose([parallel._scale(stat, beg, end)],
+                                     [lastvals[1] - lastvals[0]])
+
+    def test_more_chunks_than_values(self):
+        results = chunk_values(sma_values, SERIES[:5], 3, chunks=10,
+                               processes=2)
+        self.assertClose(results, sma_values(SERIES[:5], 3))
+
+    def test_empty_series(self):
+        self.assertEquals(list(chunk_values(sma_values, [], 3, processes=1)),
+                          [])
+
+    def test_unsupported_function(self):
+        self.assertRaises(ValueError, chunk_values, top_values, SERIES, 3)
+
+    def test_period_too_small(self):
+        self.assertRaises(ValueError, chunk_values, sma_values, SERIES, -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Test the profiling module.
+
+"""
+
+import sys
+import os
+import subprocess
+import unittest
+
+#Forced to manipulate path - have yet to find alternative built-in method.
+libpath = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if not libpath in sys.path:
+    sys.path.insert(1, libpath)
+del libpath
+
+import core
+import profiling
+
+SERIES = [21, 25, 32, 55, 22]
+
+
+class Profiling_TestCase(unittest.TestCase):
+    def setUp(self):
+        profiling.reset()
+
+    def tearDown(self):
+        profiling.disable()
+        profiling.reset()
+
+    def test_disabled_is_untouched(self):
+        original = core.sma_values
+        with profiling.profiled():
+            self.assertTrue(core.sma_values is not original)
+        self.assertTrue(core.sma_values is original)
+        self.assertFalse(profiling.is_enabled())
+        core.sma_values(SERIES, 3)
+        self.assertEquals(profiling.snapshot(), {})
+
+    def test_records(self):
+        with profiling.profiled() as snapshot:
+            core.sma_values(SERIES, 3)
+            core.sma_values(SERIES * 2, period=2)
+            core.corr_values(SERIES, SERIES, 3)
+            core.sum_value(SERIES)
+        records = snapshot()
+        self.assertEquals(records['sma_values']['calls'], 2)
+        self.assertEquals(records['sma_values']['values'], 15)
+        self.assertEquals(records['sma_values']['periods'], {3: 1, 2: 1})
+        self.assertEquals(records['corr_values']['periods'], {3: 1})
+        self.assertEquals(records['sum_value']['periods'], {None: 1})
+        self.assertTrue(records['sma_values']['seconds'] >= 0.0)
+
+    def test_results_unchanged(self):
+        expected = core.std_values(SERIES, 3)
+        with profiling.profiled():
+            self.assertEquals(core.std_values(SERIES, 3), expected)
+
+    def test_memory(self):
+        with profiling.profiled(memory=True) as snapshot:
+            core.sum_values(list(range(1000)), 3)
+        self.assertTrue(snapshot()['sum_values']['bytes'] > 0)
+
+    def test_memory_nested(self):
+        big = profiling._wrap('big', lambda values: len([0.0] * 100000))
+        small = profiling._wrap('small', lambda values: len(values))
+        outer = profiling._wrap('outer',
+                                lambda values: big(values) + small(values))
+        with profiling.profiled(memory=True) as snapshot:
+            outer(SERIES)
+        records = snapshot()
+        self.assertTrue(records['big']['bytes'] >= 800000)
+        self.assertTrue(records['outer']['bytes'] >= records['big']['bytes'])
+        self.assertTrue(records['small']['bytes'] < records['big']['bytes'])
+
+    def test_hooks(self):
+        calls = []
+        hook = lambda *args: calls.append(args[:3])
+        profiling.add_hook(hook)
+        try:
+            with profiling.profiled():
+                core.max_values(SERIES, 2)
+        finally:
+            profiling.remove_hook(hook)
+        self.assertEquals(calls, [('max_values', 5, 2)])
+
+    def test_nested_block_keeps_enabled(self):
+        profiling.enable()
+        with profiling.profiled():
+            pass
+        self.assertTrue(profiling.is_enabled())
+
+    def test_environ(self):
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        script = ("import sys; sys.path[:0] = [%r, %r]; import statio; "
+                  "statio.sma_values([1, 2, 3], 2); "
+                  "print(statio.profiling.snapshot()['sma_values']['calls'])"
+                  % (root, os.path.dirname(root)))
+        env = dict(os.environ)
+        env['STATIO_PROFILE'] = '1'
+        output = subprocess.check_output([sys.executable, '-c', script],
+                                         env=env)
+        self.assertEquals(output.strip(), b'1')
+
+
+if __name__ == "__main__":
+    unittest.main()
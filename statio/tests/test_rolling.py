@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Test the rolling module against the core module.
+
+"""
+
+import sys
+import os
+import random
+import unittest
+
+#Forced to manipulate path - have yet to find alternative built-in method.
+libpath = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if not libpath in sys.path:
+    sys.path.insert(1, libpath)
+del libpath
+
+from helpers import random_prices
+from core import *
+from rolling import *
+
+SERIES = [21, 25, 32, 55, 22]
+
+rand = random.Random(5)
+LONG_SERIES = random_prices(rand, 500)
+
+
+class Rolling_TestCase(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def check(self, cls, func, *args, **kwargs):
+        periods = kwargs.get('periods', (None, 1, 3, 3.0, 20))
+        for series in (SERIES, LONG_SERIES):
+            for period in periods:
+                stat = cls(period, *args)
+                rows = [stat.push(x) for x in series]
+                self.assertEquals(rows, func(series, period, *args))
+                self.assertEquals(stat.count, len(series))
+                self.assertEquals(stat.value, rows[-1])
+
+    def test_sum(self):
+        self.check(RollingSum, sum_values)
+
+    def test_sma(self):
+        self.check(RollingSMA, sma_values)
+
+    def test_ema(self):
+        self.check(RollingEMA, ema_values)
+        self.check(RollingEMA, ema_values, 0.5)
+
+    def test_wwma(self):
+        self.check(RollingWWMA, wwma_values)
+
+    def test_psa(self):
+        self.check(RollingPSA, psa_values)
+
+    def test_var(self):
+        self.check(RollingVar, var_values)
+        self.check(RollingVar, lambda v, p, pop: varp_values(v, p), True)
+
+    def test_std(self):
+        self.check(RollingStd, std_values)
+        self.check(RollingStd, lambda v, p, pop: stdp_values(v, p), True)
+
+    def test_max(self):
+        self.check(RollingMax, max_values)
+
+    def test_min(self):
+        self.check(RollingMin, min_values)
+
+    def test_top(self):
+        self.check(RollingTopN, top_values, 3)
+        self.check(RollingTopN, top_values, 0)
+
+    def test_bottom(self):
+        self.check(RollingBottomN, bottom_values, 3)
+
+    def test_empty(self):
+        stat = RollingSMA(3)
+        self.assertEquals(stat.value, None)
+        self.assertEquals(stat.extend([]), [])
+
+    def test_period_too_small(self):
+        self.assertRaises(ValueError, RollingSum, -1)
+        self.assertRaises(ValueError, RollingEMA, 3, 1.5)
+
+
+class Istream_TestCase(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def check(self, gen, func, *args):
+        for period in (None, 3, 20):
+            rows = gen(iter(LONG_SERIES), period, *args)
+            self.assertEquals(list(rows), func(LONG_SERIES, period, *args))
+
+    def test_matches_core(self):
+        self.check(isum_values, sum_values)
+        self.check(isma_values, sma_values)
+        self.check(iema_values, ema_values)
+        self.check(iwwma_values, wwma_values)
+        self.check(ipsa_values, psa_values)
+        self.check(ivarp_values, varp_values)
+        self.check(ivar_values, var_values)
+        self.check(istdp_values, stdp_values)
+        self.check(istd_values, std_values)
+        self.check(imax_values, max_values)
+        self.check(imin_values, min_values)
+        self.check(itop_values, top_values, 2)
+        self.check(ibottom_values, bottom_values, 2)
+
+    def test_lazy(self):
+        def ticks():
+            bar = 0
+            while True:
+                bar += 1
+                yield bar
+
+        rows = isum_values(ticks(), 3)
+        self.assertEquals([next(rows) for x in range(5)], [1, 3, 6, 9, 12])
+
+    def test_empty_series(self):
+        self.assertEquals(list(isma_values([], 3)), [])
+
+    def test_no_series(self):
+        self.assertRaises(TypeError, isma_values, None)
+
+    def test_period_too_small(self):
+        self.assertRaises(ValueError, isma_values, SERIES, -1)
+
+
+class State_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.makers = [lambda period: RollingSum(period),
+                       lambda period: RollingSMA(period),
+                       lambda period: RollingEMA(period),
+                       lambda period: RollingEMA(period, 0.25),
+                       lambda period: RollingWWMA(period),
+                       lambda period: RollingPSA(period),
+                       lambda period: RollingVar(period),
+                       lambda period: RollingVar(period, True),
+                       lambda period: RollingStd(period),
+                       lambda period: RollingStd(period, True),
+                       lambda period: RollingMax(period),
+                       lambda period: RollingMin(period),
+                       lambda period: RollingTopN(period, 3),
+                       lambda period: RollingTopN(period, 0),
+                       lambda period: RollingBottomN(period, 2),
+                       lambda period: RollingMedian(period),
+                       lambda period: RollingQuantile(period, 0.25),
+                       lambda period: RollingQuantile(period, [0.1, 0.9]),
+                       lambda period: RollingRecentMax(period),
+                       lambda period: RollingSinceMax(period),
+                       lambda period: RollingRecentMin(period),
+                       lambda period: RollingSinceMin(period)]
+
+    def test_round_trip(self):
+        for make in self.makers:
+            for period in (None, 1, 3, 20):
+                for split in (0, 1, 2, 50):
+                    stat = make(period)
+                    stat.extend(LONG_SERIES[:split])
+                    resumed = load_state(dump_state(stat))
+                    self.assertEquals(type(resumed), type(stat))
+                    self.assertEquals(resumed.period, stat.period)
+                    self.assertEquals(resumed.count, stat.count)
+                    self.assertEquals(resumed.value, stat.value)
+                    self.assertEquals(resumed.extend(LONG_SERIES[split:]),
+                                      stat.extend(LONG_SERIES[split:]))
+
+    def test_int_round_trip(self):
+        for big in (2 ** 60, 2 ** 70):
+            for make in self.makers:
+                for period in (None, 3):
+                    series = [big, 1, 1, 2, big, 3]
+                    stat = make(period)
+                    stat.extend(series[:3])
+                    resumed = load_state(dump_state(stat))
+                    self.assertEquals(resumed.value, stat.value)
+                    self.assertEquals(type(resumed.value), type(stat.value))
+                    self.assertEquals(resumed.extend(series[3:]),
+                                      stat.extend(series[3:]))
+
+        stat = RollingSum(3)
+        stat.extend([2 ** 60, 1, 1])
+        self.assertEquals(load_state(dump_state(stat)).push(1), 3)
+
+    def test_compact(self):
+        stat = RollingEMA(20)
+        stat.extend(LONG_SERIES)
+        self.assertTrue(len(dump_state(stat)) <= 64)
+        stat = RollingMax(20)
+        stat.extend(LONG_SERIES)
+        self.assertTrue(len(dump_state(stat)) <= 64 + 20 * 16)
+
+    def test_unsupported_type(self):
+        self.assertRaises(TypeError, dump_state, object())
+
+    def test_bad_checkpoint(self):
+        stat = RollingSMA(3)
+        stat.extend(SERIES)
+        data = dump_state(stat)
+        self.assertRaises(ValueError, load_state, b'XXXX' + data[4:])
+        self.assertRaises(ValueError, load_state, data[:10])
+        self.assertRaises(ValueError, load_state, data[:-8])
+
+
+if __name__ == "__main__":
+    unittest.main()
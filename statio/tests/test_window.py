@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Test the window module.
+
+"""
+
+import sys
+import os
+import random
+import unittest
+
+#Forced to manipulate path - have yet to find alternative built-in method.
+libpath = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if not libpath in sys.path:
+    sys.path.insert(1, libpath)
+del libpath
+
+from window import *
+
+
+class SortedWindow_TestCase(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_empty(self):
+        window = SortedWindow()
+        self.assertEquals(len(window), 0)
+        self.assertEquals(list(window), [])
+        self.assertEquals(window.largest(3), [])
+        self.assertRaises(IndexError, window.__getitem__, 0)
+
+    def test_add_remove(self):
+        window = SortedWindow([21, 25, 32])
+        window.add(22)
+        window.remove(25)
+        self.assertEquals(list(window), [21, 22, 32])
+        self.assertEquals(len(window), 3)
+
+    def test_remove_missing(self):
+        window = SortedWindow([21, 25, 32])
+        self.assertRaises(ValueError, window.remove, 22)
+        self.assertRaises(ValueError, window.remove, 55)
+
+    def test_duplicates(self):
+        window = SortedWindow([3, 3, 1, 3])
+        window.remove(3)
+        self.assertEquals(list(window), [1, 3, 3])
+        self.assertTrue(3 in window)
+        self.assertFalse(2 in window)
+
+    def test_small_load(self):
+        window = SortedWindow(load=2, flat=0)
+        for x in [5, 1, 4, 2, 3, 9, 0, 7]:
+            window.add(x)
+
+        self.assertEquals(list(window), [0, 1, 2, 3, 4, 5, 7, 9])
+        self.assertEquals([window[i] for i in range(8)],
+                          [0, 1, 2, 3, 4, 5, 7, 9])
+        self.assertEquals(window[-2], 7)
+        self.assertEquals(window.smallest(3), [0, 1, 2])
+        self.assertEquals(window.largest(3), [5, 7, 9])
+
+    def test_sliding_matches_sorted(self):
+        rand = random.Random(7)
+        series = [rand.randint(0, 50) for x in range(2000)]
+        period = 37
+        window = SortedWindow(load=4, flat=0)
+        for bar, newx in enumerate(series):
+            if bar >= period:
+                window.remove(series[bar - period])
+
+            window.add(newx)
+
+            expected = sorted(series[max(0, bar - period + 1):bar + 1])
+            self.assertEquals(list(window), expected)
+            self.assertEquals(window[len(expected) // 2],
+                              expected[len(expected) // 2])
+            self.assertEquals(window.largest(5), expected[-5:])
+            self.assertEquals(window.smallest(5), expected[:5])
+
+    def test_bad_load(self):
+        self.assertRaises(ValueError, SortedWindow, (), 1)
+
+    def test_nan_rejected(self):
+        window = SortedWindow([1.0, 3.0])
+        self.assertRaises(ValueError, window.add, float('nan'))
+        self.assertRaises(ValueError, window.update, [2.0, float('nan')])
+        self.assertEquals(list(window), [1.0, 3.0])
+
+    def test_flat_switch(self):
+        window = SortedWindow(load=4, flat=16)
+        for x in range(40, 0, -1):
+            window.add(x)
+
+        self.assertEquals(window._flat, None)
+        self.assertEquals(window[:3], [1, 2, 3])
+        self.assertEquals(window[-3:], [38, 39, 40])
+        self.assertEquals(window[5:8], [6, 7, 8])
+        self.assertEquals(window[::10], [1, 11, 21, 31])
+
+        for x in range(1, 35):
+            window.remove(x)
+
+        self.assertEquals(window._flat, [35, 36, 37, 38, 39, 40])
+        self.assertEquals(window[2], 37)
+
+
+class Sorted_Windows_TestCase(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_matches_sorted(self):
+        rand = random.Random(3)
+        series = [rand.randint(0, 50) for x in range(300)]
+        for period in (None, 1, 7, DEFAULT_FLAT + 1):
+            for bar, window in enumerate(sorted_windows(series, period)):
+                beg = 0
+                if period:
+                    beg = max(0, bar - period + 1)
+
+                expected = sorted(series[beg:bar + 1])
+                self.assertEquals(len(window), len(expected))
+                self.assertEquals(window[-3:], expected[-3:])
+                self.assertEquals(window[len(expected) // 2],
+                                  expected[len(expected) // 2])
+
+    def test_nan(self):
+        series = [1.0, float('nan'), 3.0]
+        for period in (None, 2):
+            self.assertRaises(ValueError, list, sorted_windows(series, period))
+
+    def test_period_too_small(self):
+        self.assertRaises(ValueError, list, sorted_windows([1, 2], -1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,521 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2012, Mike Taylor
+#
+# This file is part of statio released under MIT license.
+# See the LICENSE for more information.
+"""
+
+Containers used to keep the contents of a sliding window in order.
+
+"""
+
+import bisect
+
+
+DEFAULT_LOAD = 500
+DEFAULT_FLAT = 8192
+
+
+def _checkvalue(value):
+    """Raises ValueError if value is NaN, which has no place in an order."""
+    if value != value:
+        raise ValueError("NaN cannot be ordered in a SortedWindow")
+
+
+class SortedWindow(object):
+    """Sorted container for the values of a sliding window.
+
+    Windows of up to flat values are one plain sorted list updated with
+    insort and del, whose memmove is cheaper than any bookkeeping at that
+    size.  Larger windows switch to a blocked sorted list: values live in
+    sorted sublists holding at most 2 * load items and a Fenwick tree over
+    the sublist lengths answers positional lookups, so add(), remove() and
+    window[i] cost O(log w) plus a memmove bounded by the load.  A window
+    shrinking to half of flat goes back to the plain list.
+
+    NaN compares false to everything, so it cannot be ordered; adding
+    one raises ValueError.
+
+    :param iterable: (optional) initial values.
+    :param load: (optional) target sublist size.
+    :param flat: (optional) largest # of values kept in one plain list.
+        * 0 - always uses the blocked list.
+
+    Examples:
+    >>> window = SortedWindow([34, 30, 29])
+    >>> window.add(38)
+    >>> window.remove(30)
+    >>> list(window)
+    [29, 34, 38]
+    >>> window[1], window[-1]
+    (34, 38)
+    >>> window.largest(2), window.smallest(2)
+    ([34, 38], [29, 34])
+    """
+
+    def __init__(self, iterable=(), load=DEFAULT_LOAD, flat=DEFAULT_FLAT):
+        if load < 2:
+            raise ValueError("load must be 2 or greater")
+
+        if flat < 0:
+            raise ValueError("flat must be 0 or greater")
+
+        self._load = int(load)
+        self._flatmax = int(flat)
+        self._flat = None
+        self._lists = []
+        self._maxes = []
+        self._index = [0]
+        self._len = 0
+
+        if self._flatmax:
+            self._flat = []
+
+        self.update(iterable)
+
+    def __len__(self):
+        if self._flat is not None:
+            return len(self._flat)
+
+        return self._len
+
+    def __iter__(self):
+        if self._flat is not None:
+            return iter(self._flat)
+
+        return self._iterblocks()
+
+    def __reversed__(self):
+        if self._flat is not None:
+            return reversed(self._flat)
+
+        return self._reversedblocks()
+
+    def __contains__(self, value):
+        _flat = self._flat
+        if _flat is not None:
+            idx = bisect.bisect_left(_flat, value)
+            return (idx < len(_flat)) and (_flat[idx] == value)
+
+        pos = bisect.bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return False
+
+        sub = self._lists[pos]
+        idx = bisect.bisect_left(sub, value)
+
+        return sub[idx] == value
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return self._slice(idx)
+
+        if self._flat is not None:
+            try:
+                return self._flat[idx]
+
+            except IndexError:
+                raise IndexError("SortedWindow index out of range")
+
+        if idx < 0:
+            idx += self._len
+
+        if (idx < 0) or (idx >= self._len):
+            raise IndexError("SortedWindow index out of range")
+
+        pos, offset = self._locate(idx)
+
+        return self._lists[pos][offset]
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, list(self))
+
+    def _slice(self, idx):
+        """Returns list of the values in slice idx.
+
+        Head and tail slices only walk the sublists they need.
+        """
+        if self._flat is not None:
+            return self._flat[idx]
+
+        beg, end, step = idx.indices(self._len)
+        if step == 1:
+            if end <= beg:
+                return []
+
+            if end == self._len:
+                return self.largest(end - beg)
+
+            if beg == 0:
+                return self.smallest(end)
+
+        return list(self)[idx]
+
+    def _iterblocks(self):
+        for sub in self._lists:
+            for item in sub:
+                yield item
+
+    def _reversedblocks(self):
+        for sub in reversed(self._lists):
+            for item in reversed(sub):
+                yield item
+
+    def clear(self):
+        """Removes all values."""
+        self._flat = None
+        if self._flatmax:
+            self._flat = []
+
+        self._lists = []
+        self._maxes = []
+        self._index = [0]
+        self._len = 0
+
+    def update(self, iterable):
+        """Adds every value from iterable, rebuilding the order once.
+
+        Raises ValueError if iterable holds a NaN.
+        """
+        items = list(iterable)
+        if not items:
+            return
+
+        for value in items:
+            _checkvalue(value)
+
+        items.extend(self)
+        items.sort()
+
+        self._rebuild(items)
+
+    def _rebuild(self, items):
+        """Stores sorted items as a plain list if small enough or blocks."""
+        if self._flatmax and (len(items) <= self._flatmax):
+            self._flat = items
+            self._lists = []
+            self._maxes = []
+            self._index = [0]
+            self._len = 0
+            return
+
+        load = self._load
+        self._flat = None
+        self._lists = [items[idx:idx + load]
+                       for idx in range(0, len(items), load)]
+        self._maxes = [sub[-1] for sub in self._lists]
+        self._len = len(items)
+        self._reindex()
+
+    def add(self, value):
+        """Adds value to the window.
+
+        Raises ValueError if value is NaN.
+        """
+        if value != value:
+            _checkvalue(value)
+
+        _flat = self._flat
+        if _flat is not None:
+            bisect.insort(_flat, value)
+            if len(_flat) > self._flatmax:
+                self._rebuild(_flat)
+
+            return
+
+        _lists = self._lists
+        _maxes = self._maxes
+
+        if not _maxes:
+            _lists.append([value])
+            _maxes.append(value)
+            self._len = 1
+            self._reindex()
+            return
+
+        pos = bisect.bisect_right(_maxes, value)
+        if pos == len(_maxes):
+            pos -= 1
+            _lists[pos].append(value)
+            _maxes[pos] = value
+
+        else:
+            bisect.insort(_lists[pos], value)
+
+        self._len += 1
+
+        if len(_lists[pos]) > (self._load << 1):
+            self._split(pos)
+
+        else:
+            self._adjust(pos, 1)
+
+    def remove(self, value):
+        """Removes one occurrence of value.
+
+        Raises ValueError if value is not in the window.
+        """
+        _flat = self._flat
+        if _flat is not None:
+            idx = bisect.bisect_left(_flat, value)
+            if (idx == len(_flat)) or (_flat[idx] != value):
+                raise ValueError("value not in SortedWindow")
+
+            del _flat[idx]
+            return
+
+        _lists = self._lists
+        _maxes = self._maxes
+
+        pos = bisect.bisect_left(_maxes, value)
+        if pos == len(_maxes):
+            raise ValueError("value not in SortedWindow")
+
+        sub = _lists[pos]
+        idx = bisect.bisect_left(sub, value)
+        if sub[idx] != value:
+            raise ValueError("value not in SortedWindow")
+
+        del sub[idx]
+        self._len -= 1
+
+        if self._flatmax and (self._len <= (self._flatmax >> 1)):
+            self._rebuild(list(self._iterblocks()))
+
+        elif len(sub) < (self._load >> 1):
+            self._merge(pos)
+
+        else:
+            _maxes[pos] = sub[-1]
+            self._adjust(pos, -1)
+
+    def smallest(self, num):
+        """Returns list of the num smallest values in ascending order."""
+        if self._flat is not None:
+            return self._flat[:num]
+
+        if num >= self._len:
+            return list(self)
+
+        results = []
+        for sub in self._lists:
+            need = num - len(results)
+            if need <= 0:
+                break
+
+            results.extend(sub[:need])
+
+        return results
+
+    def largest(self, num):
+        """Returns list of the num largest values in ascending order."""
+        if self._flat is not None:
+            if num < 1:
+                return []
+
+            return self._flat[-num:]
+
+        if num >= self._len:
+            return list(self)
+
+        chunks = []
+        need = num
+        for sub in reversed(self._lists):
+            if need <= 0:
+                break
+
+            if len(sub) > need:
+                chunks.append(sub[-need:])
+
+            else:
+                chunks.append(sub)
+
+            need -= len(chunks[-1])
+
+        results = []
+        for chunk in reversed(chunks):
+            results.extend(chunk)
+
+        return results
+
+    def _split(self, pos):
+        sub = self._lists[pos]
+        half = sub[self._load:]
+        del sub[self._load:]
+
+        self._lists.insert(pos + 1, half)
+        self._maxes[pos] = sub[-1]
+        self._maxes.insert(pos + 1, half[-1])
+        self._reindex()
+
+    def _merge(self, pos):
+        _lists = self._lists
+        _maxes = self._maxes
+
+        if len(_lists) > 1:
+            if pos == 0:
+                nbr = 1
+            else:
+                nbr = pos - 1
+                pos, nbr = nbr, pos
+
+            _lists[pos].extend(_lists[nbr])
+            del _lists[nbr]
+            del _maxes[nbr]
+
+            if len(_lists[pos]) > (self._load << 1):
+                sub = _lists[pos]
+                half = sub[self._load:]
+                del sub[self._load:]
+                _lists.insert(pos + 1, half)
+                _maxes.insert(pos + 1, half[-1])
+
+            _maxes[pos] = _lists[pos][-1]
+
+        elif _lists[pos]:
+            _maxes[pos] = _lists[pos][-1]
+
+        else:
+            del _lists[pos]
+            del _maxes[pos]
+
+        self._reindex()
+
+    def _reindex(self):
+        """Rebuilds the Fenwick tree over the sublist lengths."""
+        _index = [0]
+        _index.extend(len(sub) for sub in self._lists)
+
+        size = len(_index)
+        for idx in range(1, size):
+            parent = idx + (idx & -idx)
+            if parent < size:
+                _index[parent] += _index[idx]
+
+        self._index = _index
+
+    def _adjust(self, pos, delta):
+        _index = self._index
+        size = len(_index)
+        idx = pos + 1
+        while idx < size:
+            _index[idx] += delta
+            idx += idx & -idx
+
+    def _locate(self, idx):
+        """Returns (sublist position, offset) of the idx-th value."""
+        _index = self._index
+        size = len(_index) - 1
+
+        pos = 0
+        mask = 1
+        while (mask << 1) <= size:
+            mask <<= 1
+
+        while mask:
+            nxt = pos + mask
+            if (nxt <= size) and (_index[nxt] <= idx):
+                idx -= _index[nxt]
+                pos = nxt
+
+            mask >>= 1
+
+        return pos, idx
+
+
+def _quantiles(q):
+    """Returns list of quantiles in q, a single quantile or a list.
+
+    Raises ValueError if a quantile is outside the 0 to 1 range.
+    """
+    if isinstance(q, (list, tuple)):
+        qs = list(q)
+    else:
+        qs = [q]
+
+    for x in qs:
+        if (x < 0) or (x > 1):
+            msg = "q outside of 0 to 1 range: "
+            msg = ''.join((msg, str(x)))
+            raise ValueError(msg)
+
+    return qs
+
+
+def _quantile(window, q):
+    """Returns the q quantile of a sorted window, linearly interpolated."""
+    pos = (len(window) - 1) * q
+    idx = int(pos)
+    frac = pos - idx
+
+    lastval = window[idx]
+    if frac:
+        lastval = lastval + frac * (window[idx + 1] - lastval)
+
+    return lastval
+
+
+def sorted_windows(values, period=None):
+    """Yields the sorted window of values after each bar.
+
+    The same object is yielded every bar, updated in place, so copy it to
+    keep one.  A period of up to DEFAULT_FLAT values is kept in a plain
+    sorted list, skipping the method calls of SortedWindow, and larger or
+    expanding windows in a SortedWindow.  Both support len(), indexing
+    and slicing.
+
+    Raises ValueError if values holds a NaN.
+
+    :param values: list of values to iterate.
+    :param period: (optional) # of values in the window.
+        * None - includes all values in the window.
+
+    Examples:
+    >>> [window[-2:] for window in sorted_windows([34, 30, 29, 34], 3)]
+    [[34], [30, 34], [30, 34], [30, 34]]
+    """
+    if period:
+        if period < 1:
+            raise ValueError("period must be 1 or greater")
+
+        period = int(period)
+
+    if period and (period <= DEFAULT_FLAT):
+        window = []
+        _additem = bisect.insort
+        _search = bisect.bisect_left
+
+        for bar, newx in enumerate(values):
+            if bar >= period:
+                del window[_search(window, values[bar - period])]
+
+            if newx != newx:
+                _checkvalue(newx)
+
+            _additem(window, newx)
+
+            yield window
+
+        return
+
+    window = SortedWindow()
+    _additem = window.add
+    _delitem = window.remove
+
+    for bar, newx in enumerate(values):
+        if period and (bar >= period):
+            _delitem(values[bar - period])
+
+        _additem(newx)
+
+        yield window
+
+
+def _testit(verbose=None):
+    import doctest
+    doctest.testmod(verbose=verbose)
+
+if __name__ == "__main__":
+    _testit()